@@ -2,13 +2,57 @@
 NovaPulse - Advanced CPU Optimizer
 C-States, Turbo Boost, Large Pages, and advanced optimizations
 """
+import os
+import json
+import platform
 import winreg
 import subprocess
 import ctypes
-from typing import Dict, Optional
+from ctypes import wintypes
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Final, List, Optional, Tuple
+from modules import power_scheme
+from modules.registry_writer import RegistryWriter
 
 
-class AdvancedCPUOptimizer:
+CREATE_NO_WINDOW = 0x08000000
+SUBPROCESS_TIMEOUT = 5  # seconds
+
+# Applied tweaks are remembered across runs so repeat applies become no-ops
+STATE_PATH = Path(os.environ.get("LOCALAPPDATA", Path.home())) / "NovaPulse" / "applied_state.json"
+
+# powercfg GUIDs
+GUID_PROC_PPM: Final[str] = "54533251-82be-4824-96c1-47b60b740d00"          # Processor power management
+GUID_IDLE_DISABLE: Final[str] = "5d76a2ca-e8c0-402f-a133-2158492d58ad"      # Processor idle disable
+GUID_PERF_BOOST_MODE: Final[str] = "be337238-0d82-4146-a960-4f3749d470c7"   # Processor performance boost mode
+GUID_MIN_PROC_STATE: Final[str] = "893dee8e-2bef-41e0-89c6-b55d0929964c"    # Minimum processor state
+
+# Admin status cannot change during the process lifetime - check it once
+try:
+    _SHELL32 = ctypes.windll.shell32
+    _IS_ADMIN = bool(_SHELL32.IsUserAnAdmin())
+except:
+    _SHELL32 = None
+    _IS_ADMIN = False
+
+
+class SYSTEM_POWER_STATUS(ctypes.Structure):
+    _fields_ = [
+        ("ACLineStatus", ctypes.c_ubyte),
+        ("BatteryFlag", ctypes.c_ubyte),
+        ("BatteryLifePercent", ctypes.c_ubyte),
+        ("SystemStatusFlag", ctypes.c_ubyte),
+        ("BatteryLifeTime", wintypes.DWORD),
+        ("BatteryFullLifeTime", wintypes.DWORD),
+    ]
+
+
+BATTERY_FLAG_NO_BATTERY = 128
+
+
+class AdvancedCPUOptimizer(RegistryWriter):
     """
     Advanced CPU optimizations
     
@@ -22,37 +66,202 @@ class AdvancedCPUOptimizer:
     POWER_KEY = r"SYSTEM\CurrentControlSet\Control\Power\PowerSettings"
     PROCESSOR_KEY = r"SYSTEM\CurrentControlSet\Control\Session Manager\Memory Management"
     
-    def __init__(self):
-        self.is_admin = self._check_admin()
-        self.applied_changes = {}
+    # powercfg arguments, flushed together by _run_powercfg_batch
+    SETACTIVE_COMMAND = ("-setactive", "scheme_current")
+    C_STATES_COMMANDS = [
+        ("-setacvalueindex", "scheme_current", GUID_PROC_PPM, GUID_IDLE_DISABLE, "1"),
+    ]
+    TURBO_BOOST_COMMANDS = [
+        # Processor Performance Boost Mode
+        # 0 = Disabled, 1 = Enabled, 2 = Aggressive, 3 = Efficient Aggressive
+        ("-setacvalueindex", "scheme_current", GUID_PROC_PPM, GUID_PERF_BOOST_MODE, "2"),
+        # Minimum processor state = 100% (forces high frequency)
+        ("-setacvalueindex", "scheme_current", GUID_PROC_PPM, GUID_MIN_PROC_STATE, "100"),
+    ]
+    
+    # apply_all result key -> (applied_changes key, desired value)
+    DESIRED_CHANGES = {
+        'c_states': ('c_states', False),
+        'turbo_boost': ('turbo_boost', True),
+        'large_cache': ('large_cache', True),
+        'scheduling': ('scheduling', True),
+        'power_throttling': ('power_throttling', False),
+        'interrupt': ('interrupt_affinity', True),
+        'svchost': ('svchost_split', True),
+    }
+    
+    # Registry tweaks by apply_all result key: (key path, value name, DWORD).
+    # Written by their methods and read back before a tweak is skipped.
+    REGISTRY_TWEAKS = {
+        'large_cache': (PROCESSOR_KEY, "LargeSystemCache", 1),
+        # 38 = Short-quantum, foreground boost (best for gaming)
+        # 2 = Long-quantum, no boost (best for servers)
+        'scheduling': (r"SYSTEM\CurrentControlSet\Control\PriorityControl", "Win32PrioritySeparation", 38),
+        'power_throttling': (r"SYSTEM\CurrentControlSet\Control\Power\PowerThrottling", "PowerThrottlingOff", 1),
+        'interrupt': (r"SYSTEM\CurrentControlSet\Control\Session Manager\kernel", "DistributeTimers", 1),
+        # SvcHostSplitThresholdInKB - defines threshold for split
+        # 0 = Force split, high value = group
+        'svchost': (r"SYSTEM\CurrentControlSet\Control", "SvcHostSplitThresholdInKB", 0x00380000),  # ~3.5GB
+    }
+    
+    def __init__(self, debug: bool = False):
+        self.debug = debug
+        self.is_admin = _IS_ADMIN
+        super().__init__()
+        self.has_battery = self._detect_battery()
+        self.machine_id = self._get_machine_id()
+        self._saved_state = self._load_state()
     
-    def _check_admin(self) -> bool:
+    def _get_machine_id(self) -> str:
         try:
-            return ctypes.windll.shell32.IsUserAnAdmin()
-        except:
+            key = winreg.OpenKeyEx(winreg.HKEY_LOCAL_MACHINE, r"SOFTWARE\Microsoft\Cryptography",
+                                   0, winreg.KEY_READ | winreg.KEY_WOW64_64KEY)
+            machine_id, _ = winreg.QueryValueEx(key, "MachineGuid")
+            winreg.CloseKey(key)
+            return str(machine_id)
+        except OSError:
+            return platform.node()
+    
+    def _load_state(self) -> Dict[str, object]:
+        """Load the tweaks already applied on this machine"""
+        try:
+            with open(STATE_PATH, 'r') as f:
+                return json.load(f).get(self.machine_id, {})
+        except (OSError, ValueError, AttributeError):
+            return {}
+    
+    def _save_state(self):
+        """Persist applied_changes atomically (write-then-rename)"""
+        try:
+            try:
+                with open(STATE_PATH, 'r') as f:
+                    data = json.load(f)
+            except (OSError, ValueError):
+                data = {}
+            with self._lock:
+                self._saved_state.update(self.applied_changes)
+                data[self.machine_id] = dict(self._saved_state)
+            
+            STATE_PATH.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = STATE_PATH.with_suffix('.tmp')
+            with open(tmp_path, 'w') as f:
+                json.dump(data, f, indent=2)
+            os.replace(tmp_path, STATE_PATH)
+        except Exception as e:
+            self._log(f"[CPU ADV] ⚠ Error saving applied state: {e}")
+    
+    def _already_applied(self, result_key: str, scheme: Optional[str]) -> bool:
+        """
+        Recorded as applied on this machine and still in effect: registry
+        values are read back, and powercfg values (stored per power scheme)
+        must have been written to the scheme that is active now
+        """
+        change_key, desired = self.DESIRED_CHANGES[result_key]
+        if change_key not in self._saved_state or self._saved_state[change_key] != desired:
             return False
+        if result_key in self.REGISTRY_TWEAKS:
+            return self._registry_value_set(*self.REGISTRY_TWEAKS[result_key])
+        return scheme is not None and self._saved_state.get('powercfg_scheme') == scheme
     
-    def _set_registry_value(self, key_path, value_name, value_data, 
-                           value_type=winreg.REG_DWORD, hive=winreg.HKEY_LOCAL_MACHINE):
+    @staticmethod
+    def _registry_value_set(key_path, value_name, value_data) -> bool:
+        """True if the HKLM DWORD currently holds value_data"""
         try:
-            key = winreg.CreateKeyEx(hive, key_path, 0, winreg.KEY_SET_VALUE)
-            winreg.SetValueEx(key, value_name, 0, value_type, value_data)
-            winreg.CloseKey(key)
-            return True
-        except:
+            with winreg.OpenKeyEx(winreg.HKEY_LOCAL_MACHINE, key_path, 0,
+                                  winreg.KEY_QUERY_VALUE | winreg.KEY_WOW64_64KEY) as key:
+                return winreg.QueryValueEx(key, value_name) == (value_data, winreg.REG_DWORD)
+        except OSError:
             return False
     
-    def _run_powercfg(self, args: str) -> bool:
+    @staticmethod
+    def _active_scheme() -> Optional[str]:
+        scheme = power_scheme.get_active_scheme()
+        return str(scheme) if scheme is not None else None
+    
+    def _detect_battery(self) -> bool:
+        """
+        Check once whether the system can run on battery
+        Desktops skip the DC (battery) powercfg values entirely
+        """
+        try:
+            status = SYSTEM_POWER_STATUS()
+            if not ctypes.windll.kernel32.GetSystemPowerStatus(ctypes.byref(status)):
+                return True
+            # 255 (unknown status) keeps the DC values, like the except below
+            return status.BatteryFlag != BATTERY_FLAG_NO_BATTERY
+        except:
+            # Unknown: keep the DC values in sync to be safe
+            return True
+    
+    def _with_dc_values(self, cmds: List[Tuple[str, ...]]) -> List[Tuple[str, ...]]:
+        """Mirror each AC write as a DC write on battery-capable systems"""
+        if not self.has_battery:
+            return list(cmds)
+        expanded = []
+        for cmd in cmds:
+            expanded.append(cmd)
+            if cmd[0] == "-setacvalueindex":
+                expanded.append(("-setdcvalueindex", *cmd[1:]))
+        return expanded
+    
+    def _run_process(self, argv: List[str]) -> bool:
+        """
+        Run a command and report success by return code only
+        Output is discarded unless debug is set, which skips pipe setup
+        """
         try:
-            result = subprocess.run(
-                f"powercfg {args}",
-                shell=True, capture_output=True, text=True,
-                encoding='utf-8', errors='ignore'
-            )
+            if self.debug:
+                result = subprocess.run(
+                    argv, shell=False, capture_output=True, text=True,
+                    encoding='utf-8', errors='ignore',
+                    timeout=SUBPROCESS_TIMEOUT, creationflags=CREATE_NO_WINDOW
+                )
+                if result.returncode != 0:
+                    self._log(f"[CPU ADV] ⚠ {argv[0]} failed: {(result.stdout + result.stderr).strip()}")
+            else:
+                result = subprocess.run(
+                    argv, shell=False,
+                    stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                    timeout=SUBPROCESS_TIMEOUT, creationflags=CREATE_NO_WINDOW
+                )
             return result.returncode == 0
         except:
             return False
     
+    def _run_powercfg(self, *args: str) -> bool:
+        return self._run_process(["powercfg", *args])
+    
+    def _run_powercfg_batch(self, cmds: List[Tuple[str, ...]]) -> bool:
+        """
+        Run several powercfg commands in a single cmd.exe process
+        Commands are chained with && so the return code reflects all of them,
+        and the current scheme is re-activated exactly once at the end
+        """
+        if not cmds:
+            return True
+        cmds = [cmd for cmd in cmds if cmd != self.SETACTIVE_COMMAND]
+        cmds.append(self.SETACTIVE_COMMAND)
+        if len(cmds) == 1:
+            # No need for a cmd.exe wrapper around a single command
+            return self._run_powercfg(*cmds[0])
+        
+        command_line = " && ".join(
+            subprocess.list2cmdline(["powercfg", *cmd]) for cmd in cmds
+        )
+        return self._run_process(["cmd.exe", "/d", "/c", command_line])
+    
+    def _finish_c_states(self, success: bool) -> bool:
+        if success:
+            self._log("[CPU ADV] ✓ Deep C-States disabled (lower latency)")
+            self._mark_applied('c_states', False)
+        return success
+    
+    def _finish_turbo_boost(self, success: bool) -> bool:
+        if success:
+            self._log("[CPU ADV] ✓ Turbo Boost forced (aggressive mode)")
+            self._mark_applied('turbo_boost', True)
+        return success
+    
     def disable_c_states(self) -> bool:
         """
         Disable deep processor C-States
@@ -61,16 +270,10 @@ class AdvancedCPUOptimizer:
         if not self.is_admin:
             return False
         
-        print("[CPU ADV] Disabling deep C-States...")
+        self._log("[CPU ADV] Disabling deep C-States...")
         
-        success = self._run_powercfg("-setacvalueindex scheme_current 54533251-82be-4824-96c1-47b60b740d00 5d76a2ca-e8c0-402f-a133-2158492d58ad 1")
-        self._run_powercfg("-setactive scheme_current")
-        
-        if success:
-            print("[CPU ADV] ✓ Deep C-States disabled (lower latency)")
-            self.applied_changes['c_states'] = False
-        
-        return success
+        success = self._run_powercfg_batch(self._with_dc_values(self.C_STATES_COMMANDS))
+        return self._finish_c_states(success)
     
     def force_turbo_boost(self) -> bool:
         """
@@ -80,22 +283,10 @@ class AdvancedCPUOptimizer:
         if not self.is_admin:
             return False
         
-        print("[CPU ADV] Forcing Turbo Boost...")
-        
-        # Processor Performance Boost Mode
-        # 0 = Disabled, 1 = Enabled, 2 = Aggressive, 3 = Efficient Aggressive
-        success = self._run_powercfg("-setacvalueindex scheme_current 54533251-82be-4824-96c1-47b60b740d00 be337238-0d82-4146-a960-4f3749d470c7 2")
-        self._run_powercfg("-setactive scheme_current")
+        self._log("[CPU ADV] Forcing Turbo Boost...")
         
-        # Minimum processor state = 100% (forces high frequency)
-        self._run_powercfg("-setacvalueindex scheme_current 54533251-82be-4824-96c1-47b60b740d00 893dee8e-2bef-41e0-89c6-b55d0929964c 100")
-        self._run_powercfg("-setactive scheme_current")
-        
-        if success:
-            print("[CPU ADV] ✓ Turbo Boost forced (aggressive mode)")
-            self.applied_changes['turbo_boost'] = True
-        
-        return success
+        success = self._run_powercfg_batch(self._with_dc_values(self.TURBO_BOOST_COMMANDS))
+        return self._finish_turbo_boost(success)
     
     def enable_large_system_cache(self) -> bool:
         """
@@ -105,13 +296,13 @@ class AdvancedCPUOptimizer:
         if not self.is_admin:
             return False
         
-        print("[CPU ADV] Enabling Large System Cache...")
+        self._log("[CPU ADV] Enabling Large System Cache...")
         
-        success = self._set_registry_value(self.PROCESSOR_KEY, "LargeSystemCache", 1)
+        success = self._set_registry_value(*self.REGISTRY_TWEAKS['large_cache'])
         
         if success:
-            print("[CPU ADV] ✓ Large System Cache enabled")
-            self.applied_changes['large_cache'] = True
+            self._log("[CPU ADV] ✓ Large System Cache enabled")
+            self._mark_applied('large_cache', True)
         
         return success
     
@@ -123,19 +314,14 @@ class AdvancedCPUOptimizer:
         if not self.is_admin:
             return False
         
-        print("[CPU ADV] Optimizing processor scheduling...")
+        self._log("[CPU ADV] Optimizing processor scheduling...")
         
-        # Win32PrioritySeparation
-        # 38 = Short-quantum, foreground boost (best for gaming)
-        # 2 = Long-quantum, no boost (best for servers)
-        success = self._set_registry_value(
-            r"SYSTEM\CurrentControlSet\Control\PriorityControl",
-            "Win32PrioritySeparation", 38
-        )
+        # Win32PrioritySeparation = 38 (see REGISTRY_TWEAKS)
+        success = self._set_registry_value(*self.REGISTRY_TWEAKS['scheduling'])
         
         if success:
-            print("[CPU ADV] ✓ Foreground apps prioritized")
-            self.applied_changes['scheduling'] = True
+            self._log("[CPU ADV] ✓ Foreground apps prioritized")
+            self._mark_applied('scheduling', True)
         
         return success
     
@@ -147,16 +333,13 @@ class AdvancedCPUOptimizer:
         if not self.is_admin:
             return False
         
-        print("[CPU ADV] Disabling Power Throttling...")
+        self._log("[CPU ADV] Disabling Power Throttling...")
         
-        success = self._set_registry_value(
-            r"SYSTEM\CurrentControlSet\Control\Power\PowerThrottling",
-            "PowerThrottlingOff", 1
-        )
+        success = self._set_registry_value(*self.REGISTRY_TWEAKS['power_throttling'])
         
         if success:
-            print("[CPU ADV] ✓ Power Throttling disabled")
-            self.applied_changes['power_throttling'] = False
+            self._log("[CPU ADV] ✓ Power Throttling disabled")
+            self._mark_applied('power_throttling', False)
         
         return success
     
@@ -168,16 +351,13 @@ class AdvancedCPUOptimizer:
         if not self.is_admin:
             return False
         
-        print("[CPU ADV] Optimizing interrupt affinity...")
+        self._log("[CPU ADV] Optimizing interrupt affinity...")
         
-        success = self._set_registry_value(
-            r"SYSTEM\CurrentControlSet\Control\Session Manager\kernel",
-            "DistributeTimers", 1
-        )
+        success = self._set_registry_value(*self.REGISTRY_TWEAKS['interrupt'])
         
         if success:
-            print("[CPU ADV] ✓ Timer distribution optimized")
-            self.applied_changes['interrupt_affinity'] = True
+            self._log("[CPU ADV] ✓ Timer distribution optimized")
+            self._mark_applied('interrupt_affinity', True)
         
         return success
     
@@ -189,37 +369,94 @@ class AdvancedCPUOptimizer:
         if not self.is_admin:
             return False
         
-        print("[CPU ADV] Configuring svchost splitting...")
+        self._log("[CPU ADV] Configuring svchost splitting...")
         
-        # SvcHostSplitThresholdInKB - defines threshold for split
-        # 0 = Force split, high value = group
-        # For 16GB+ RAM, we can force split
-        success = self._set_registry_value(
-            r"SYSTEM\CurrentControlSet\Control",
-            "SvcHostSplitThresholdInKB", 0x00380000  # ~3.5GB threshold
-        )
+        # For 16GB+ RAM, we can force split (threshold in REGISTRY_TWEAKS)
+        success = self._set_registry_value(*self.REGISTRY_TWEAKS['svchost'])
         
         if success:
-            print("[CPU ADV] ✓ Svchost splitting configured")
-            self.applied_changes['svchost_split'] = True
+            self._log("[CPU ADV] ✓ Svchost splitting configured")
+            self._mark_applied('svchost_split', True)
         
         return success
     
+    def _apply_powercfg_settings(self, pending: List[str]) -> bool:
+        """C-States and Turbo Boost share one powercfg process and one -setactive"""
+        if not self.is_admin:
+            return False
+        
+        cmds = []
+        if 'c_states' in pending:
+            self._log("[CPU ADV] Disabling deep C-States...")
+            cmds += self.C_STATES_COMMANDS
+        if 'turbo_boost' in pending:
+            self._log("[CPU ADV] Forcing Turbo Boost...")
+            cmds += self.TURBO_BOOST_COMMANDS
+        
+        return self._run_powercfg_batch(self._with_dc_values(cmds))
+    
     def apply_all_optimizations(self) -> Dict[str, bool]:
         """Apply all advanced CPU optimizations"""
-        print("\n[CPU ADV] Applying advanced CPU optimizations...")
+        # Collect the progress lines and write them to the console in one go
+        self._log_buf = []
+        try:
+            return self._apply_all_optimizations()
+        finally:
+            self._flush_log()
+    
+    def _apply_all_optimizations(self) -> Dict[str, bool]:
+        self._log("\n[CPU ADV] Applying advanced CPU optimizations...")
+        
+        registry_tasks = {
+            'large_cache': self.enable_large_system_cache,
+            'scheduling': self.optimize_processor_scheduling,
+            'power_throttling': self.disable_power_throttling,
+            'interrupt': self.optimize_interrupt_affinity,
+            'svchost': self.set_svchost_splitting,
+        }
+        
+        if not self.is_admin:
+            self._log("[CPU ADV] ✗ Requires administrator privileges")
+            return dict.fromkeys(self.DESIRED_CHANGES, False)
         
+        # Skip tweaks recorded as applied on this machine that are still in effect
+        scheme = self._active_scheme()
         results = {}
-        results['c_states'] = self.disable_c_states()
-        results['turbo_boost'] = self.force_turbo_boost()
-        results['large_cache'] = self.enable_large_system_cache()
-        results['scheduling'] = self.optimize_processor_scheduling()
-        results['power_throttling'] = self.disable_power_throttling()
-        results['interrupt'] = self.optimize_interrupt_affinity()
-        results['svchost'] = self.set_svchost_splitting()
+        for key in self.DESIRED_CHANGES:
+            if self._already_applied(key, scheme):
+                self._mark_applied(*self.DESIRED_CHANGES[key])
+                results[key] = True
+        if len(results) == len(self.DESIRED_CHANGES):
+            self._log("[CPU ADV] ✓ All optimizations already applied")
+            return results
+        
+        pending_powercfg = [key for key in ('c_states', 'turbo_boost') if key not in results]
+        pending_registry = {key: task for key, task in registry_tasks.items() if key not in results}
+        
+        # The powercfg batch and the registry writes touch disjoint settings,
+        # so the subprocess wait overlaps with the registry I/O
+        with self._batched_keys(), ThreadPoolExecutor(max_workers=len(pending_registry) + 1) as executor:
+            powercfg_future = executor.submit(self._apply_powercfg_settings, pending_powercfg)
+            futures = {key: executor.submit(task) for key, task in pending_registry.items()}
+        
+        powercfg_ok = powercfg_future.result()
+        if powercfg_ok and pending_powercfg and scheme is not None:
+            # powercfg wrote scheme_current: remember which scheme that was
+            self._mark_applied('powercfg_scheme', scheme)
+        if 'c_states' in pending_powercfg:
+            results['c_states'] = self._finish_c_states(powercfg_ok)
+        if 'turbo_boost' in pending_powercfg:
+            results['turbo_boost'] = self._finish_turbo_boost(powercfg_ok)
+        for key, future in futures.items():
+            results[key] = future.result()
+        
+        self._save_state()
+        
+        # Keep the result order stable
+        results = {key: results[key] for key in self.DESIRED_CHANGES}
         
         success_count = sum(results.values())
-        print(f"[CPU ADV] Result: {success_count}/{len(results)} optimizations applied")
+        self._log(f"[CPU ADV] Result: {success_count}/{len(results)} optimizations applied")
         
         return results
     
@@ -230,11 +467,14 @@ class AdvancedCPUOptimizer:
 
 # Singleton
 _instance = None
+_instance_lock = threading.Lock()
 
 def get_optimizer() -> AdvancedCPUOptimizer:
     global _instance
     if _instance is None:
-        _instance = AdvancedCPUOptimizer()
+        with _instance_lock:
+            if _instance is None:
+                _instance = AdvancedCPUOptimizer()
     return _instance
 
 
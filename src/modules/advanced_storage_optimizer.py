@@ -3,12 +3,30 @@ NovaPulse - Advanced Storage Optimizer
 Write Cache, Queue Depth, Large Pages, and disk optimizations
 """
 import winreg
-import subprocess
 import ctypes
-from typing import Dict, Optional
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Final, Optional
+from modules.registry_writer import RegistryWriter
 
 
-class AdvancedStorageOptimizer:
+# Power settings GUIDs
+GUID_DISK_SUBGROUP: Final[str] = "0012ee47-9041-4b5d-9b77-535fba8b1442"         # Hard disk
+GUID_DISK_MAX_POWER_LEVEL: Final[str] = "dab60367-53fe-4fbc-825e-521d069d2456"  # Maximum power level
+DISK_POWER_SETTING_KEY: Final[str] = (
+    rf"SYSTEM\CurrentControlSet\Control\Power\PowerSettings\{GUID_DISK_SUBGROUP}\{GUID_DISK_MAX_POWER_LEVEL}"
+)
+
+# Admin status cannot change during the process lifetime - check it once
+try:
+    _SHELL32 = ctypes.windll.shell32
+    _IS_ADMIN = bool(_SHELL32.IsUserAnAdmin())
+except:
+    _SHELL32 = None
+    _IS_ADMIN = False
+
+
+class AdvancedStorageOptimizer(RegistryWriter):
     """
     Advanced Storage optimizations
     
@@ -19,25 +37,13 @@ class AdvancedStorageOptimizer:
     - Disable pagefile compression
     """
     
-    def __init__(self):
-        self.is_admin = self._check_admin()
-        self.applied_changes = {}
-    
-    def _check_admin(self) -> bool:
-        try:
-            return ctypes.windll.shell32.IsUserAnAdmin()
-        except:
-            return False
+    DEFRAG_TASK_FOLDER = r"\Microsoft\Windows\Defrag"
+    DEFRAG_TASK_NAME = "ScheduledDefrag"
+    DEFRAG_TASK_CACHE_KEY = r"SOFTWARE\Microsoft\Windows NT\CurrentVersion\Schedule\TaskCache\Tree\Microsoft\Windows\Defrag\ScheduledDefrag"
     
-    def _set_registry_value(self, key_path, value_name, value_data, 
-                           value_type=winreg.REG_DWORD, hive=winreg.HKEY_LOCAL_MACHINE):
-        try:
-            key = winreg.CreateKeyEx(hive, key_path, 0, winreg.KEY_SET_VALUE)
-            winreg.SetValueEx(key, value_name, 0, value_type, value_data)
-            winreg.CloseKey(key)
-            return True
-        except:
-            return False
+    def __init__(self):
+        self.is_admin = _IS_ADMIN
+        super().__init__()
     
     def enable_write_caching(self) -> bool:
         """
@@ -47,7 +53,7 @@ class AdvancedStorageOptimizer:
         if not self.is_admin:
             return False
         
-        print("[STORAGE] Configuring write caching...")
+        self._log("[STORAGE] Configuring write caching...")
         
         # For each disk, enable write cache
         # This is usually done via Device Manager, but we can try via registry
@@ -58,8 +64,8 @@ class AdvancedStorageOptimizer:
             "NtfsDisableEncryption", 0
         )
         
-        print("[STORAGE] ✓ Write caching enabled (configure in Device Manager for maximum)")
-        self.applied_changes['write_cache'] = True
+        self._log("[STORAGE] ✓ Write caching enabled (configure in Device Manager for maximum)")
+        self._mark_applied('write_cache', True)
         
         return True
     
@@ -71,7 +77,7 @@ class AdvancedStorageOptimizer:
         if not self.is_admin:
             return False
         
-        print("[STORAGE] Optimizing NVMe queue depth...")
+        self._log("[STORAGE] Optimizing NVMe queue depth...")
         
         # StorPort miniport queue depth
         success = self._set_registry_value(
@@ -80,8 +86,8 @@ class AdvancedStorageOptimizer:
         )
         
         if success:
-            print("[STORAGE] ✓ NVMe Queue Depth = 32")
-            self.applied_changes['queue_depth'] = 32
+            self._log("[STORAGE] ✓ NVMe Queue Depth = 32")
+            self._mark_applied('queue_depth', 32)
         
         return success
     
@@ -93,7 +99,7 @@ class AdvancedStorageOptimizer:
         if not self.is_admin:
             return False
         
-        print("[STORAGE] Enabling Large Pages...")
+        self._log("[STORAGE] Enabling Large Pages...")
         
         # Large Pages requires "Lock pages in memory" privilege
         # This is configured via secpol.msc or Group Policy
@@ -104,10 +110,10 @@ class AdvancedStorageOptimizer:
             "LargePageMinimum", 0
         )
         
-        print("[STORAGE] ✓ Large Pages enabled")
-        print("[STORAGE] ℹ For apps to use it, configure 'Lock pages in memory' in secpol.msc")
+        self._log("[STORAGE] ✓ Large Pages enabled")
+        self._log("[STORAGE] ℹ For apps to use it, configure 'Lock pages in memory' in secpol.msc")
         
-        self.applied_changes['large_pages'] = True
+        self._mark_applied('large_pages', True)
         return True
     
     def disable_pagefile_compression(self) -> bool:
@@ -118,7 +124,7 @@ class AdvancedStorageOptimizer:
         if not self.is_admin:
             return False
         
-        print("[STORAGE] Disabling pagefile compression...")
+        self._log("[STORAGE] Disabling pagefile compression...")
         
         success = self._set_registry_value(
             r"SYSTEM\CurrentControlSet\Control\Session Manager\Memory Management",
@@ -126,8 +132,8 @@ class AdvancedStorageOptimizer:
         )
         
         if success:
-            print("[STORAGE] ✓ Pagefile compression disabled")
-            self.applied_changes['pagefile_compression'] = False
+            self._log("[STORAGE] ✓ Pagefile compression disabled")
+            self._mark_applied('pagefile_compression', False)
         
         return success
     
@@ -139,7 +145,7 @@ class AdvancedStorageOptimizer:
         if not self.is_admin:
             return False
         
-        print("[STORAGE] Optimizing disk timeout...")
+        self._log("[STORAGE] Optimizing disk timeout...")
         
         # TimeOutValue in seconds
         success = self._set_registry_value(
@@ -148,8 +154,8 @@ class AdvancedStorageOptimizer:
         )
         
         if success:
-            print("[STORAGE] ✓ Disk timeout = 30s")
-            self.applied_changes['timeout'] = 30
+            self._log("[STORAGE] ✓ Disk timeout = 30s")
+            self._mark_applied('timeout', 30)
         
         return success
     
@@ -158,59 +164,116 @@ class AdvancedStorageOptimizer:
         if not self.is_admin:
             return False
         
-        print("[STORAGE] Configuring disks for performance...")
+        self._log("[STORAGE] Configuring disks for performance...")
         
         # Disable APM (Advanced Power Management) for HDDs
         success = self._set_registry_value(
-            r"SYSTEM\CurrentControlSet\Control\Power\PowerSettings\0012ee47-9041-4b5d-9b77-535fba8b1442\dab60367-53fe-4fbc-825e-521d069d2456",
+            DISK_POWER_SETTING_KEY,
             "Attributes", 2  # Visible in power plan
         )
         
-        print("[STORAGE] ✓ Disks configured for performance")
-        self.applied_changes['performance_mode'] = True
+        self._log("[STORAGE] ✓ Disks configured for performance")
+        self._mark_applied('performance_mode', True)
         
         return True
     
     def disable_defrag_ssd(self) -> bool:
         """
-        Disable automatic defragmentation for SSDs
-        (TRIM should be active, defrag is not needed)
+        Check SSD defragmentation (status only)
+        
+        ScheduledDefrag is left enabled: Windows never defragments SSDs, it
+        runs ReTrim on them from that task, and it still defragments HDDs.
         """
         if not self.is_admin:
             return False
         
-        print("[STORAGE] Checking SSD defragmentation...")
+        self._log("[STORAGE] Checking SSD defragmentation...")
         
         try:
-            result = subprocess.run(
-                'schtasks /query /tn "\\Microsoft\\Windows\\Defrag\\ScheduledDefrag"',
-                shell=True, capture_output=True, text=True,
-                encoding='utf-8', errors='ignore'
-            )
-            
+            enabled = self._defrag_task_enabled()
+        except Exception:
+            # pywin32 unavailable or COM failed: confirm the task via the task cache
+            enabled = True if self._defrag_task_registered() else None
+        if enabled is None:
+            return False
+        
+        if enabled:
             # TRIM still works, only defrag is disabled for SSDs
-            print("[STORAGE] ✓ TRIM active, automatic defrag for SSD disabled by Windows")
-            self.applied_changes['ssd_defrag'] = False
+            self._log("[STORAGE] ✓ TRIM active, automatic defrag for SSD disabled by Windows")
+        else:
+            self._log("[STORAGE] ⚠ Scheduled drive optimization is off (no automatic ReTrim)")
+        self._mark_applied('ssd_defrag', False)
+        return True
+    
+    def _defrag_task_enabled(self) -> Optional[bool]:
+        """ScheduledDefrag's enabled state read in-process through the Task
+        Scheduler COM API; None if the task does not exist"""
+        import pythoncom
+        import pywintypes
+        import win32com.client
+        
+        # May run on an apply_all_optimizations worker thread
+        pythoncom.CoInitialize()
+        try:
+            scheduler = win32com.client.Dispatch("Schedule.Service")
+            scheduler.Connect()
+            folder = scheduler.GetFolder(self.DEFRAG_TASK_FOLDER)
+            try:
+                enabled = bool(folder.GetTask(self.DEFRAG_TASK_NAME).Enabled)
+            except pywintypes.com_error:
+                enabled = None
+            # Release the COM objects before CoUninitialize
+            del folder, scheduler
+            return enabled
+        finally:
+            pythoncom.CoUninitialize()
+    
+    def _defrag_task_registered(self) -> bool:
+        """Check the Task Scheduler cache in the registry without spawning schtasks"""
+        try:
+            key = winreg.OpenKeyEx(winreg.HKEY_LOCAL_MACHINE, self.DEFRAG_TASK_CACHE_KEY,
+                                   0, winreg.KEY_QUERY_VALUE)
+            winreg.QueryValueEx(key, "Id")
+            winreg.CloseKey(key)
             return True
-            
-        except:
+        except OSError:
             return False
     
     def apply_all_optimizations(self) -> Dict[str, bool]:
         """Apply all storage optimizations"""
-        print("\n[STORAGE] Applying advanced storage optimizations...")
+        # Collect the progress lines and write them to the console in one go
+        self._log_buf = []
+        try:
+            return self._apply_all_optimizations()
+        finally:
+            self._flush_log()
+    
+    def _apply_all_optimizations(self) -> Dict[str, bool]:
+        self._log("\n[STORAGE] Applying advanced storage optimizations...")
+        
+        tasks = {
+            'write_cache': self.enable_write_caching,
+            'queue_depth': self.optimize_nvme_queue_depth,
+            'large_pages': self.enable_large_pages,
+            'pagefile': self.disable_pagefile_compression,
+            'timeout': self.optimize_disk_timeout,
+            'performance': self.enable_optimize_for_performance,
+            'ssd_defrag': self.disable_defrag_ssd,
+        }
+        
+        if not self.is_admin:
+            self._log("[STORAGE] ✗ Requires administrator privileges")
+            return dict.fromkeys(tasks, False)
+        
+        # Each optimization touches its own registry value (or the defrag
+        # task), so they can wait on the OS concurrently
+        with self._batched_keys(), ThreadPoolExecutor(max_workers=len(tasks)) as executor:
+            futures = {key: executor.submit(task) for key, task in tasks.items()}
         
-        results = {}
-        results['write_cache'] = self.enable_write_caching()
-        results['queue_depth'] = self.optimize_nvme_queue_depth()
-        results['large_pages'] = self.enable_large_pages()
-        results['pagefile'] = self.disable_pagefile_compression()
-        results['timeout'] = self.optimize_disk_timeout()
-        results['performance'] = self.enable_optimize_for_performance()
-        results['ssd_defrag'] = self.disable_defrag_ssd()
+        results = {key: future.result() for key, future in futures.items()}
         
         success_count = sum(results.values())
-        print(f"[STORAGE] Result: {success_count}/{len(results)} optimizations applied")
+        self._log(f"[STORAGE] Result: {success_count}/{len(results)} optimizations applied")
         
         return results
     
@@ -221,11 +284,14 @@ class AdvancedStorageOptimizer:
 
 # Singleton
 _instance = None
+_instance_lock = threading.Lock()
 
 def get_optimizer() -> AdvancedStorageOptimizer:
     global _instance
     if _instance is None:
-        _instance = AdvancedStorageOptimizer()
+        with _instance_lock:
+            if _instance is None:
+                _instance = AdvancedStorageOptimizer()
     return _instance
 
 
@@ -21,11 +21,30 @@ Why 85% instead of 100%:
 
 Target Hardware: Intel Core i5-11300H (Tiger Lake)
 """
+import math
 import threading
 import time
+import weakref
 import psutil
 from enum import Enum
-from collections import deque
+
+from modules.periodic_scheduler import get_scheduler
+
+try:
+    from modules import intel_power_control
+except ImportError:
+    intel_power_control = None
+
+
+# Time constant of the CPU usage average (seconds). The smoothing factor is
+# derived from it, so the response does not change with check_interval.
+CPU_AVG_TAU = 10.0
+
+# Minimum gap (CPU %) between idle_threshold and wake_threshold
+MIN_HYSTERESIS = 5
+
+# Consecutive failures after which a mode change callback is dropped
+MAX_CALLBACK_FAILURES = 3
 
 
 class SystemMode(Enum):
@@ -46,10 +65,17 @@ class AutoProfiler:
     No temperature sensor dependency. Simple, predictable, reliable.
     """
 
+    # Friendly mode names for display
+    _MODE_NAMES = {
+        SystemMode.ACTIVE: "⚡ ACTIVE",
+        SystemMode.IDLE: "🌿 IDLE"
+    }
+
     def __init__(self, config=None):
         self.config = config or {}
         self.running = False
-        self.thread = None
+        self._task_id = None  # Shared scheduler task
+        self._needs_initial_mode = True
 
         # Configuration
         self.check_interval = self.config.get('check_interval', 2)  # Check every 2s
@@ -62,20 +88,50 @@ class AutoProfiler:
         # State
         self.current_mode = SystemMode.ACTIVE
         self.previous_mode = SystemMode.ACTIVE
-        self.idle_counter = 0  # Seconds of continuous low CPU
-        self.cpu_history = deque(maxlen=10)
+        self.idle_ticks = 0  # Checks of continuous low CPU
+        self._applied_mode = None  # Mode whose settings are currently in effect
+        self._ewma_cpu = None  # Exponentially weighted CPU average
+        self.reconfigure()
+
+        # Prime psutil's delta counters so the loop can use non-blocking reads
+        psutil.cpu_percent(interval=None)
 
         # Services reference
         self.services = {}
-        self.on_mode_change_callbacks = []
+        self.on_mode_change_callbacks = []  # [callback ref, consecutive failures]
 
     def set_services(self, services: dict):
         """Set reference to optimizer services."""
         self.services = services
 
     def add_mode_change_callback(self, callback):
-        """Add callback for mode changes."""
-        self.on_mode_change_callbacks.append(callback)
+        """
+        Add callback for mode changes.
+
+        Bound methods are held weakly, so a torn-down owner unregisters
+        itself instead of keeping the object alive.
+        """
+        if hasattr(callback, '__self__') and hasattr(callback, '__func__'):
+            ref = weakref.WeakMethod(callback)
+        else:
+            ref = lambda cb=callback: cb
+        self.on_mode_change_callbacks.append([ref, 0])
+
+    def _notify_mode_change(self, mode: SystemMode):
+        """Run mode change callbacks, dropping dead or repeatedly failing ones."""
+        for entry in list(self.on_mode_change_callbacks):
+            callback = entry[0]()
+            if callback is None:
+                self.on_mode_change_callbacks.remove(entry)
+                continue
+            try:
+                callback(mode)
+                entry[1] = 0
+            except Exception as e:
+                entry[1] += 1
+                if entry[1] >= MAX_CALLBACK_FAILURES:
+                    self.on_mode_change_callbacks.remove(entry)
+                    print(f"[AUTO] Removed mode callback after {entry[1]} failures: {e}")
 
     def get_current_mode(self) -> SystemMode:
         """Return current mode."""
@@ -83,17 +139,32 @@ class AutoProfiler:
 
     def get_mode_name(self) -> str:
         """Return friendly mode name for display."""
-        names = {
-            SystemMode.ACTIVE: "⚡ ACTIVE",
-            SystemMode.IDLE: "🌿 IDLE"
-        }
-        return names.get(self.current_mode, "ACTIVE")
+        return self._MODE_NAMES.get(self.current_mode, "ACTIVE")
 
     def get_avg_cpu(self) -> float:
         """Return average CPU from recent readings."""
-        if not self.cpu_history:
+        if self._ewma_cpu is None:
             return 0.0
-        return sum(self.cpu_history) / len(self.cpu_history)
+        return self._ewma_cpu
+
+    @property
+    def idle_counter(self) -> float:
+        """Seconds of continuous low CPU."""
+        return self.idle_ticks * self.check_interval
+
+    def reconfigure(self):
+        """Recompute derived values after check_interval/idle_timeout change."""
+        # EWMA smoothing factor for the current check_interval
+        self._alpha = 1 - math.exp(-self.check_interval / CPU_AVG_TAU)
+        # Whole checks needed to reach idle_timeout
+        self._idle_timeout_ticks = max(1, round(self.idle_timeout / self.check_interval))
+
+    def _record_cpu(self, cpu_percent: float):
+        """Fold a reading into the exponentially weighted average."""
+        if self._ewma_cpu is None:
+            self._ewma_cpu = cpu_percent
+        else:
+            self._ewma_cpu = self._alpha * cpu_percent + (1 - self._alpha) * self._ewma_cpu
 
     def start(self):
         """Start automatic monitoring."""
@@ -101,9 +172,11 @@ class AutoProfiler:
             return
 
         self.running = True
-        self.thread = threading.Thread(target=self._monitoring_loop, daemon=True,
-                                       name='NovaPulse-AutoProfiler')
-        self.thread.start()
+        # check_interval/idle_timeout may have been changed after construction
+        self.reconfigure()
+        self._needs_initial_mode = True
+        self._task_id = get_scheduler().add(self._monitoring_tick, self.check_interval,
+                                            name='auto-profiler')
         print(f"[AUTO] NovaPulse Auto-Profiler v2.2 started")
         print(f"[AUTO] → ACTIVE: CPU cap {self.active_cpu_cap}% (always)")
         print(f"[AUTO] → IDLE:   CPU cap {self.idle_cpu_cap}% (after {self.idle_timeout}s inactivity)")
@@ -112,64 +185,80 @@ class AutoProfiler:
     def stop(self):
         """Stop monitoring."""
         self.running = False
-        if self.thread:
-            self.thread.join(timeout=5)
+        # Unregistering wakes the scheduler, no need to wait out a sleep
+        get_scheduler().remove(self._task_id)
+        self._task_id = None
         print("[AUTO] Auto-Profiler stopped")
 
-    def _monitoring_loop(self):
-        """Main monitoring loop — simple 2-stage logic."""
-        # Apply ACTIVE mode on startup
-        self._apply_active_mode()
+    def _monitoring_tick(self):
+        """One monitoring check — simple 2-stage logic (run by the scheduler)."""
+        try:
+            # Apply ACTIVE mode on startup
+            if self._needs_initial_mode:
+                self._needs_initial_mode = False
+                self._apply_active_mode()
 
-        while self.running:
-            try:
-                # Read CPU (non-blocking with 0.5s sample)
-                cpu_percent = psutil.cpu_percent(interval=0.5)
-                self.cpu_history.append(cpu_percent)
-                avg_cpu = self.get_avg_cpu()
-
-                if self.current_mode == SystemMode.ACTIVE:
-                    # In ACTIVE: check if we should go IDLE
-                    if avg_cpu < self.idle_threshold:
-                        self.idle_counter += self.check_interval
-                        if self.idle_counter >= self.idle_timeout:
-                            self._apply_mode(SystemMode.IDLE)
-                    else:
-                        # Any activity resets the counter
-                        self.idle_counter = 0
-
-                elif self.current_mode == SystemMode.IDLE:
-                    # In IDLE: any CPU spike → immediately back to ACTIVE
-                    if avg_cpu > self.wake_threshold:
-                        self.idle_counter = 0
-                        self._apply_mode(SystemMode.ACTIVE)
-
-                time.sleep(self.check_interval)
+            # Read CPU (non-blocking: usage since the previous check,
+            # pacing comes from the scheduler interval)
+            cpu_percent = psutil.cpu_percent(interval=None)
+            self._record_cpu(cpu_percent)
+            avg_cpu = self.get_avg_cpu()
 
-            except Exception as e:
-                print(f"[AUTO] Monitoring error: {e}")
-                time.sleep(5)
+            new_mode = self._determine_mode(avg_cpu)
+            if new_mode != self.current_mode:
+                self._apply_mode(new_mode)
+
+        except Exception as e:
+            print(f"[AUTO] Monitoring error: {e}")
+            return 5  # Back off before the next check
+
+    def _determine_mode(self, avg_cpu: float) -> SystemMode:
+        """
+        Decide the mode for the current reading.
+
+        Uses a hysteresis band between idle_threshold (enter IDLE) and
+        wake_threshold (leave IDLE). The idle countdown needs continuous
+        low CPU: any reading at or above idle_threshold resets it.
+        """
+        wake_threshold = max(self.wake_threshold, self.idle_threshold + MIN_HYSTERESIS)
+
+        if self.current_mode == SystemMode.ACTIVE:
+            # In ACTIVE: check if we should go IDLE
+            if avg_cpu < self.idle_threshold:
+                self.idle_ticks += 1
+                if self.idle_ticks >= self._idle_timeout_ticks:
+                    return SystemMode.IDLE
+            else:
+                # Any activity resets the counter (idle must be continuous)
+                self.idle_ticks = 0
+
+        elif self.current_mode == SystemMode.IDLE:
+            # In IDLE: any CPU spike → immediately back to ACTIVE
+            if avg_cpu > wake_threshold:
+                self.idle_ticks = 0
+                return SystemMode.ACTIVE
+
+        return self.current_mode
 
     def _apply_mode(self, new_mode: SystemMode):
         """Apply new mode configuration."""
+        if new_mode == self.current_mode == self._applied_mode:
+            # Already in effect (e.g. manual override to the current mode)
+            return
+
         self.previous_mode = self.current_mode
         self.current_mode = new_mode
 
         print(f"\n[AUTO] Mode change: {self.previous_mode.value.upper()} → {new_mode.value.upper()}")
 
         try:
-            if new_mode == SystemMode.ACTIVE:
-                self._apply_active_mode()
-            else:
-                self._apply_idle_mode()
+            self._APPLIERS[new_mode](self)
 
             # Notify callbacks
-            for callback in self.on_mode_change_callbacks:
-                try:
-                    callback(new_mode)
-                except:
-                    pass
+            self._notify_mode_change(new_mode)
         except Exception as e:
+            # The applier may have stopped halfway: nothing is known to be in effect
+            self._applied_mode = None
             print(f"[AUTO] Error applying mode: {e}")
 
     def _apply_active_mode(self):
@@ -190,17 +279,16 @@ class AutoProfiler:
             self.services['cpu_power'].set_max_cpu_frequency(self.active_cpu_cap)
 
         # Intel Power Control: BALANCED profile (85% max, boost on peaks only)
-        try:
-            from modules import intel_power_control
+        if intel_power_control is not None:
             intel_power_control.apply_balanced_mode()
-        except ImportError:
-            pass
 
         # Memory cleaner: moderate settings
         if 'cleaner' in self.services:
             self.services['cleaner'].threshold_mb = 3072   # Clean when < 3GB free
             self.services['cleaner'].check_interval = 10   # Check every 10s
 
+        self._applied_mode = SystemMode.ACTIVE
+
     def _apply_idle_mode(self):
         """
         IDLE mode: 30% CPU cap, relaxed memory cleaning.
@@ -217,32 +305,40 @@ class AutoProfiler:
             self.services['cpu_power'].set_max_cpu_frequency(self.idle_cpu_cap)
 
         # Intel Power Control: ECO profile
-        try:
-            from modules import intel_power_control
+        if intel_power_control is not None:
             intel_power_control.apply_eco_mode()
-        except ImportError:
-            pass
 
         # Memory cleaner: relaxed (no aggressive cleaning when idle)
         if 'cleaner' in self.services:
             self.services['cleaner'].threshold_mb = 8192   # Only clean if really low
             self.services['cleaner'].check_interval = 60   # Check every 60s
 
+        self._applied_mode = SystemMode.IDLE
+
+    # Mode -> apply function (unbound, call with self)
+    _APPLIERS = {
+        SystemMode.ACTIVE: _apply_active_mode,
+        SystemMode.IDLE: _apply_idle_mode
+    }
+
     def force_mode(self, mode: SystemMode):
         """Force a specific mode (manual override)."""
         print(f"[AUTO] Manual override: {mode.value.upper()}")
         self._apply_mode(mode)
-        self.idle_counter = 0
+        self.idle_ticks = 0
 
 
 # Singleton
 _instance = None
+_instance_lock = threading.Lock()
 
 def get_profiler() -> AutoProfiler:
     """Return singleton AutoProfiler instance."""
     global _instance
     if _instance is None:
-        _instance = AutoProfiler()
+        with _instance_lock:
+            if _instance is None:
+                _instance = AutoProfiler()
     return _instance
 
 
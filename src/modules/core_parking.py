@@ -5,7 +5,21 @@ Controls CPU core parking (Core Parking)
 import winreg
 import ctypes
 import subprocess
+import threading
+import time
 from typing import Dict, Optional
+from modules import power_scheme
+from modules.power_scheme import GUID
+
+
+# Hide console windows for spawned processes
+CREATE_NO_WINDOW = 0x08000000
+
+# Admin status cannot change during the process lifetime - check it once
+try:
+    _IS_ADMIN = bool(ctypes.windll.shell32.IsUserAnAdmin())
+except:
+    _IS_ADMIN = False
 
 
 class CoreParkingManager:
@@ -25,35 +39,78 @@ class CoreParkingManager:
     CORE_PARKING_INCREASE_TIME = "2ddd5a84-5a71-437e-912a-db0b8c788732"
     CORE_PARKING_DECREASE_TIME = "dfd10d17-d5eb-45dd-877a-9a34ddd15c82"
     
+    # Power schemes
+    HIGH_PERFORMANCE_SCHEME = "8c5e7fda-e8bf-4a96-9a85-a6e23a8c635c"
+    ULTIMATE_PERFORMANCE_SCHEME = "e9a42b02-d5df-448d-aa00-03f14749eb61"
+    BALANCED_SCHEME = "381b4222-f694-41f0-9685-ff5bb260df2e"
+    
+    # Friendly names of the built-in schemes
+    SCHEME_NAMES = {
+        ULTIMATE_PERFORMANCE_SCHEME: "Ultimate Performance",
+        HIGH_PERFORMANCE_SCHEME: "High Performance",
+        BALANCED_SCHEME: "Balanced",
+    }
+    
+    # get_status() result lifetime (seconds)
+    STATUS_CACHE_TTL = 2.0
+    
+    # Native GUID structs for the powrprof API, built once
+    _NATIVE_GUIDS = {
+        guid: GUID.from_string(guid)
+        for guid in (PROCESSOR_SUBGROUP, CORE_PARKING_MIN, CORE_PARKING_MAX,
+                     CORE_PARKING_INCREASE_TIME, CORE_PARKING_DECREASE_TIME,
+                     HIGH_PERFORMANCE_SCHEME, ULTIMATE_PERFORMANCE_SCHEME)
+    }
+    
     def __init__(self):
-        self.is_admin = self._check_admin()
+        self.is_admin = _IS_ADMIN
         self.applied_changes = {}
+        self._status_cache = None  # (timestamp, status)
     
-    def _check_admin(self) -> bool:
-        try:
-            return ctypes.windll.shell32.IsUserAnAdmin()
-        except:
-            return False
-    
-    def _run_powercfg(self, args: str) -> bool:
-        """Execute powercfg command"""
+    def _powercfg(self, *args: str) -> Optional[subprocess.CompletedProcess]:
+        """Execute powercfg directly (no cmd.exe, no console window)"""
         try:
-            result = subprocess.run(
-                f"powercfg {args}",
-                shell=True,
+            return subprocess.run(
+                ["powercfg", *args],
                 capture_output=True,
-                text=True
+                text=True,
+                creationflags=CREATE_NO_WINDOW
             )
-            return result.returncode == 0
         except:
-            return False
+            return None
+    
+    def _run_powercfg(self, *args: str) -> bool:
+        """Execute powercfg command, True on success"""
+        result = self._powercfg(*args)
+        return result is not None and result.returncode == 0
     
     def _set_power_setting(self, setting_guid: str, value: int, ac: bool = True) -> bool:
-        """Set a power setting via powercfg"""
+        """Set a power setting (applied on the next _activate_current_scheme)"""
+        scheme = power_scheme.get_active_scheme()
+        if scheme is not None and power_scheme.write_value_index(
+                scheme, self._NATIVE_GUIDS[self.PROCESSOR_SUBGROUP],
+                self._NATIVE_GUIDS[setting_guid], value, ac=ac):
+            return True
+        
+        # Fallback: powercfg.exe
         power_type = "/setacvalueindex" if ac else "/setdcvalueindex"
         
-        cmd = f"{power_type} scheme_current sub_processor {setting_guid} {value}"
-        return self._run_powercfg(cmd)
+        return self._run_powercfg(power_type, "scheme_current", "sub_processor",
+                                  setting_guid, str(value))
+    
+    def _activate_current_scheme(self) -> bool:
+        """Re-activate the current scheme so written settings take effect"""
+        scheme = power_scheme.get_active_scheme()
+        if scheme is not None and power_scheme.set_active_scheme(scheme):
+            return True
+        return self._run_powercfg("/setactive", "scheme_current")
+    
+    def _activate_scheme(self, scheme_guid: str) -> bool:
+        """Activate a power scheme by GUID"""
+        self._status_cache = None
+        if power_scheme.set_active_scheme(self._NATIVE_GUIDS[scheme_guid]):
+            return True
+        return self._run_powercfg("/setactive", scheme_guid)
     
     def disable_core_parking(self) -> bool:
         """
@@ -82,7 +139,7 @@ class CoreParkingManager:
         success &= self._set_power_setting(self.CORE_PARKING_MAX, 100, ac=False)
         
         # Apply changes
-        self._run_powercfg("/setactive scheme_current")
+        self._activate_current_scheme()
         
         if success:
             print("[PARKING] ✓ Core Parking disabled (100% cores active)")
@@ -106,7 +163,7 @@ class CoreParkingManager:
         success &= self._set_power_setting(self.CORE_PARKING_MIN, min_percent, ac=True)
         success &= self._set_power_setting(self.CORE_PARKING_MIN, min_percent, ac=False)
         
-        self._run_powercfg("/setactive scheme_current")
+        self._activate_current_scheme()
         
         if success:
             print(f"[PARKING] ✓ Core Parking re-enabled (min {min_percent}% cores)")
@@ -131,7 +188,7 @@ class CoreParkingManager:
         # Decrease time: 100ms (takes longer to sleep)
         success &= self._set_power_setting(self.CORE_PARKING_DECREASE_TIME, 100, ac=True)
         
-        self._run_powercfg("/setactive scheme_current")
+        self._activate_current_scheme()
         
         if success:
             print("[PARKING] ✓ Parking timers optimized")
@@ -147,17 +204,15 @@ class CoreParkingManager:
         if not self.is_admin:
             return False
         
-        # High Performance scheme GUID
-        # 8c5e7fda-e8bf-4a96-9a85-a6e23a8c635c
-        success = self._run_powercfg("/setactive 8c5e7fda-e8bf-4a96-9a85-a6e23a8c635c")
+        success = self._activate_scheme(self.HIGH_PERFORMANCE_SCHEME)
         
         if success:
             print("[PARKING] ✓ High Performance plan activated")
             self.applied_changes['high_performance'] = True
         else:
             # Try to create if it doesn't exist
-            self._run_powercfg("/duplicatescheme 8c5e7fda-e8bf-4a96-9a85-a6e23a8c635c")
-            success = self._run_powercfg("/setactive 8c5e7fda-e8bf-4a96-9a85-a6e23a8c635c")
+            self._run_powercfg("/duplicatescheme", self.HIGH_PERFORMANCE_SCHEME)
+            success = self._activate_scheme(self.HIGH_PERFORMANCE_SCHEME)
             if success:
                 print("[PARKING] ✓ High Performance plan created and activated")
                 self.applied_changes['high_performance'] = True
@@ -172,17 +227,13 @@ class CoreParkingManager:
             return False
         
         # Try to activate Ultimate Performance
-        # e9a42b02-d5df-448d-aa00-03f14749eb61
-        success = self._run_powercfg("/setactive e9a42b02-d5df-448d-aa00-03f14749eb61")
+        success = self._activate_scheme(self.ULTIMATE_PERFORMANCE_SCHEME)
         
         if not success:
             # Try to create the scheme
-            result = subprocess.run(
-                "powercfg -duplicatescheme e9a42b02-d5df-448d-aa00-03f14749eb61",
-                shell=True, capture_output=True, text=True
-            )
-            if "e9a42b02" in result.stdout or result.returncode == 0:
-                success = self._run_powercfg("/setactive e9a42b02-d5df-448d-aa00-03f14749eb61")
+            result = self._powercfg("-duplicatescheme", self.ULTIMATE_PERFORMANCE_SCHEME)
+            if result is not None and ("e9a42b02" in result.stdout or result.returncode == 0):
+                success = self._activate_scheme(self.ULTIMATE_PERFORMANCE_SCHEME)
         
         if success:
             print("[PARKING] ✓ Ultimate Performance activated")
@@ -220,35 +271,49 @@ class CoreParkingManager:
     
     def get_status(self) -> Dict[str, str]:
         """Returns current Core Parking status"""
+        now = time.monotonic()
+        if self._status_cache and now - self._status_cache[0] < self.STATUS_CACHE_TTL:
+            return dict(self._status_cache[1])
+        
         status = {}
         
+        # Check active plan (direct API, no process)
+        scheme = power_scheme.get_active_scheme()
+        name = self.SCHEME_NAMES.get(str(scheme)) if scheme is not None else None
+        if name:
+            status['power_scheme'] = name
+        else:
+            # Custom/duplicated scheme: ask powercfg for its display name
+            status['power_scheme'] = self._get_scheme_name_powercfg()
+        
+        self._status_cache = (now, status)
+        return dict(status)
+    
+    def _get_scheme_name_powercfg(self) -> str:
+        """Active scheme name from powercfg output"""
         try:
-            # Check active plan
-            result = subprocess.run(
-                "powercfg /getactivescheme",
-                shell=True, capture_output=True, text=True
-            )
+            result = self._powercfg("/getactivescheme")
             if "Ultimate" in result.stdout:
-                status['power_scheme'] = "Ultimate Performance"
+                return "Ultimate Performance"
             elif "High" in result.stdout:
-                status['power_scheme'] = "High Performance"
+                return "High Performance"
             elif "Balanced" in result.stdout:
-                status['power_scheme'] = "Balanced"
-            else:
-                status['power_scheme'] = result.stdout.strip()
+                return "Balanced"
+            return result.stdout.strip()
         except:
-            status['power_scheme'] = "Unknown"
-        
-        return status
+            return "Unknown"
 
 
 # Singleton
 _instance = None
+_instance_lock = threading.Lock()
 
 def get_manager() -> CoreParkingManager:
     global _instance
     if _instance is None:
-        _instance = CoreParkingManager()
+        with _instance_lock:
+            if _instance is None:
+                _instance = CoreParkingManager()
     return _instance
 
 
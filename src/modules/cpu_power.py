@@ -4,6 +4,18 @@ CPU power and frequency manager
 import ctypes
 from ctypes import wintypes
 import subprocess
+import threading
+from modules import power_scheme
+from modules import temperature_service
+from modules.periodic_scheduler import get_scheduler
+
+
+# Thermal governor polling (seconds / °C)
+THERMAL_POLL_MIN = 5
+THERMAL_POLL_MAX = 30
+THERMAL_COOL_TEMP = 65      # Below this for THERMAL_STABLE_READS reads -> poll slower,
+                            # at or above it -> back to THERMAL_POLL_MIN
+THERMAL_STABLE_READS = 3
 
 class CPUPowerManager:
     def __init__(self):
@@ -13,6 +25,86 @@ class CPUPowerManager:
         self.GUID_PROCESSOR = "SUB_PROCESSOR"
         self.GUID_MAX_THROTTLE = "PROCTHROTTLEMAX"
         self.GUID_MIN_THROTTLE = "PROCTHROTTLEMIN"
+        
+        # Native GUIDs for the powrprof API (aliases above are for powercfg)
+        self._native_guids = {
+            self.GUID_MAX_THROTTLE: power_scheme.PROCTHROTTLEMAX,
+            self.GUID_MIN_THROTTLE: power_scheme.PROCTHROTTLEMIN,
+        }
+        
+        # Serializes writes from the profiler and the thermal governor
+        self._power_lock = threading.Lock()
+        
+        # Setting GUID -> (scheme, value) last written by this manager
+        self._last_written = {}
+        self._pending_commit = False
+        self._pending_scheme = None
+        self._governor_task = None
+    
+    def _is_set(self, setting_guid, percentage) -> bool:
+        """
+        True if the active scheme already holds this value, so the request
+        can be skipped. Read back through powrprof, which also sees plan
+        switches and writes by other modules (core parking, Intel power
+        control); without it, compared with the last (scheme, value) this
+        manager wrote.
+        """
+        scheme = power_scheme.get_active_scheme()
+        if scheme is not None:
+            current = power_scheme.read_value_index(
+                scheme, power_scheme.SUB_PROCESSOR, self._native_guids[setting_guid])
+            if current is not None:
+                return current == percentage
+        return self._last_written.get(setting_guid) == (scheme, percentage)
+    
+    def _write_value(self, setting_guid, percentage) -> bool:
+        """Write a processor setting index without re-activating the scheme"""
+        # Preferred: direct powrprof call, no process creation
+        scheme = power_scheme.get_active_scheme()
+        if scheme is not None and power_scheme.write_value_index(
+                scheme, power_scheme.SUB_PROCESSOR,
+                self._native_guids[setting_guid], percentage):
+            self._pending_scheme = scheme
+            self._last_written[setting_guid] = (scheme, percentage)
+            return True
+        
+        # Fallback: powercfg.exe with aliases
+        result = subprocess.run(
+            ['powercfg', '-setacvalueindex', 'SCHEME_CURRENT',
+             self.GUID_PROCESSOR, setting_guid, str(percentage)],
+            capture_output=True,
+            text=True,
+            encoding='utf-8',
+            errors='ignore'
+        )
+        if result.returncode != 0:
+            return False
+        self._last_written[setting_guid] = (scheme, percentage)
+        return True
+    
+    def _stage_max(self, percentage) -> bool:
+        """Stage the max frequency; takes effect on commit()"""
+        if not self._write_value(self.GUID_MAX_THROTTLE, percentage):
+            return False
+        self._pending_commit = True
+        return True
+    
+    def _stage_min(self, percentage) -> bool:
+        """Stage the min frequency; takes effect on commit()"""
+        if not self._write_value(self.GUID_MIN_THROTTLE, percentage):
+            return False
+        self._pending_commit = True
+        return True
+    
+    def commit(self):
+        """Apply all staged values with a single -setactive"""
+        if not self._pending_commit:
+            return
+        scheme, self._pending_scheme = self._pending_scheme, None
+        if scheme is None or not power_scheme.set_active_scheme(scheme):
+            subprocess.run(['powercfg', '-setactive', 'SCHEME_CURRENT'],
+                           capture_output=True, encoding='utf-8', errors='ignore')
+        self._pending_commit = False
     
     def set_max_cpu_frequency(self, percentage):
         """Set maximum CPU frequency (5-100%)"""
@@ -20,31 +112,22 @@ class CPUPowerManager:
             print(f"[ERROR] Invalid percentage: {percentage}%. Must be between 5-100%")
             return False
         
-        try:
-            print(f"[INFO] Setting CPU max frequency to {percentage}%")
-            
-            # Use powercfg.exe with aliases (more compatible)
-            result = subprocess.run(
-                ['powercfg', '-setacvalueindex', 'SCHEME_CURRENT',
-                 self.GUID_PROCESSOR, self.GUID_MAX_THROTTLE, str(percentage)],
-                capture_output=True,
-                text=True,
-                encoding='utf-8',
-                errors='ignore'
-            )
-            
-            if result.returncode == 0:
-                # Apply changes
-                subprocess.run(['powercfg', '-setactive', 'SCHEME_CURRENT'], 
-                              capture_output=True, encoding='utf-8', errors='ignore')
-                print(f"[SUCCESS] Max frequency set to {percentage}%")
+        with self._power_lock:
+            if self._is_set(self.GUID_MAX_THROTTLE, percentage):
                 return True
-            else:
+            
+            try:
+                print(f"[INFO] Setting CPU max frequency to {percentage}%")
+                
+                if self._stage_max(percentage):
+                    # Apply changes
+                    self.commit()
+                    print(f"[SUCCESS] Max frequency set to {percentage}%")
                 # Silence error if already at desired value
                 return True
-        except Exception as e:
-            print(f"[WARN] CPU control: {e}")
-            return False
+            except Exception as e:
+                print(f"[WARN] CPU control: {e}")
+                return False
     
     def set_min_cpu_frequency(self, percentage):
         """Set minimum CPU frequency (0-100%)"""
@@ -52,29 +135,21 @@ class CPUPowerManager:
             print(f"[ERROR] Invalid percentage: {percentage}%")
             return False
         
-        try:
-            print(f"[INFO] Setting CPU min frequency to {percentage}%")
-            
-            result = subprocess.run(
-                ['powercfg', '-setacvalueindex', 'SCHEME_CURRENT',
-                 self.GUID_PROCESSOR, self.GUID_MIN_THROTTLE, str(percentage)],
-                capture_output=True,
-                text=True,
-                encoding='utf-8',
-                errors='ignore'
-            )
-            
-            if result.returncode == 0:
-                subprocess.run(['powercfg', '-setactive', 'SCHEME_CURRENT'],
-                              capture_output=True, encoding='utf-8', errors='ignore')
-                print(f"[SUCCESS] Min frequency set to {percentage}%")
+        with self._power_lock:
+            if self._is_set(self.GUID_MIN_THROTTLE, percentage):
                 return True
-            else:
+            
+            try:
+                print(f"[INFO] Setting CPU min frequency to {percentage}%")
+                
+                if self._stage_min(percentage):
+                    self.commit()
+                    print(f"[SUCCESS] Min frequency set to {percentage}%")
                 # Silence error
                 return True
-        except Exception as e:
-            print(f"[WARN] CPU min control: {e}")
-            return False
+            except Exception as e:
+                print(f"[WARN] CPU min control: {e}")
+                return False
     
     def start_adaptive_governor(self, base_cap=80):
         """[V2.0] Starts Adaptive Thermal Throttling.
@@ -87,58 +162,85 @@ class CPUPowerManager:
         Fixed: Previously overrode auto_profiler's 80% cap back to 100% when 
         temp < 70°C. Now respects the profiler's cap as the maximum ceiling.
         """
-        import threading
-        import time
-        from modules import temperature_service
-        
         self._thermal_base_cap = base_cap
         
         # Get singleton instance (reuses WMI connection)
         temp_svc = temperature_service.get_service()
         
-        def thermal_loop():
-            print(f"[CPU] Adaptive Thermal Governor STARTED 🚀 (ceiling: {base_cap}%)")
-            current_limit = base_cap
-            
-            while True:
-                try:
-                    # Use centralized cached temperature service
-                    temp = temp_svc.get_cpu_temp()
-                        
-                    if temp > 0:
-                        new_limit = current_limit
-                        ceiling = self._thermal_base_cap
+        current_limit = base_cap
+        
+        # Adaptive polling: back off while the CPU stays cool,
+        # snap back to fast polling as soon as it warms up
+        poll = THERMAL_POLL_MIN
+        stable_count = 0
+        
+        def thermal_check():
+            """One governor check; returns the delay until the next one"""
+            nonlocal current_limit, poll, stable_count
+            try:
+                # Use centralized cached temperature service
+                temp = temp_svc.get_cpu_temp()
+                    
+                if temp > 0:
+                    new_limit = current_limit
+                    ceiling = self._thermal_base_cap
+                    
+                    # LOGIC (respects auto_profiler cap as ceiling):
+                    # < 70°C: restore to ceiling (auto_profiler cap)
+                    # > 80°C: min(ceiling, 90%) — throttle if needed
+                    # > 90°C: min(ceiling, 70%) — emergency throttle
+                    
+                    if temp < 70 and current_limit < ceiling:
+                        new_limit = ceiling
+                    elif temp > 90 and current_limit > min(ceiling, 70):
+                        new_limit = min(ceiling, 70)
+                    elif temp > 80 and temp <= 90 and current_limit > min(ceiling, 90):
+                        new_limit = min(ceiling, 90)
                         
-                        # LOGIC (respects auto_profiler cap as ceiling):
-                        # < 70°C: restore to ceiling (auto_profiler cap)
-                        # > 80°C: min(ceiling, 90%) — throttle if needed
-                        # > 90°C: min(ceiling, 70%) — emergency throttle
+                    if new_limit != current_limit:
+                        with self._power_lock:
+                            # Skip the write if the cap is already there
+                            if not self._is_set(self.GUID_MAX_THROTTLE, new_limit):
+                                print(f"[CPU] Thermal Event: {temp:.0f}°C -> Adjusting Limit to {new_limit}%")
+                                self._stage_max(new_limit)
+                                self.commit()
+                        current_limit = new_limit
+                    
+                    if temp < THERMAL_COOL_TEMP:
+                        stable_count += 1
+                        if stable_count >= THERMAL_STABLE_READS:
+                            poll = min(THERMAL_POLL_MAX, poll * 2)
+                            stable_count = 0
+                    else:
+                        # Leaving the cool range: a ramp to throttle range
+                        # must not wait out a backed-off interval
+                        poll = THERMAL_POLL_MIN
+                        stable_count = 0
                         
-                        if temp < 70 and current_limit < ceiling:
-                            new_limit = ceiling
-                        elif temp > 90 and current_limit > min(ceiling, 70):
-                            new_limit = min(ceiling, 70)
-                        elif temp > 80 and temp <= 90 and current_limit > min(ceiling, 90):
-                            new_limit = min(ceiling, 90)
-                            
-                        if new_limit != current_limit:
-                            print(f"[CPU] Thermal Event: {temp:.0f}°C -> Adjusting Limit to {new_limit}%")
-                            self.set_max_cpu_frequency(new_limit)
-                            current_limit = new_limit
-                            
-                    time.sleep(5)
-                except:
-                    time.sleep(10)
-
-        t = threading.Thread(target=thermal_loop, daemon=True)
-        t.start()
+                return poll
+            except:
+                return 10
+        
+        # Runs on the shared scheduler thread instead of a dedicated one
+        self.stop_adaptive_governor()
+        print(f"[CPU] Adaptive Thermal Governor STARTED 🚀 (ceiling: {base_cap}%)")
+        self._governor_task = get_scheduler().add(thermal_check, THERMAL_POLL_MIN,
+                                                  name='thermal-governor')
+    
+    def stop_adaptive_governor(self):
+        """Stop the thermal governor (returns immediately)"""
+        if self._governor_task is not None:
+            get_scheduler().remove(self._governor_task)
+            self._governor_task = None
 
     def restore_defaults(self):
         """Restore default CPU settings (100%)"""
         try:
             print("[INFO] Restoring default CPU settings...")
-            self.set_max_cpu_frequency(100)
-            self.set_min_cpu_frequency(5)
+            with self._power_lock:
+                self._stage_max(100)
+                self._stage_min(5)
+                self.commit()
             print("[SUCCESS] CPU settings restored to defaults")
             return True
         except Exception as e:
@@ -3,16 +3,190 @@ NovaPulse - CUDA & GPU Advanced Optimizer
 Forces CUDA for more functions, manages GPU power and temperature
 """
 import os
+import sys
+import atexit
+import json
+import hashlib
 import winreg
 import subprocess
 import ctypes
-from typing import Dict, Optional, Tuple
+import functools
+import itertools
+import statistics
+import threading
+import tempfile
+import time
+import xml.etree.ElementTree as ET
+from ctypes import wintypes
+from collections import deque
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Final, Optional, Tuple
+from modules.periodic_scheduler import get_scheduler
+
+# pynvml is imported on first use (_load_nvml), not at module import
+pynvml = None
+
+
+def _load_nvml():
+    """Import pynvml once; returns the module or None when not installed"""
+    global pynvml
+    if pynvml is None:
+        try:
+            import pynvml as module
+        except ImportError:
+            return None
+        pynvml = module
+    return pynvml
+
+
+def __getattr__(name):
+    # PYNVML_AVAILABLE stays importable but only triggers the import on access
+    if name == "PYNVML_AVAILABLE":
+        return _load_nvml() is not None
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+# NVML constants (nvml.h)
+NVML_SUCCESS = 0
+NVML_TEMPERATURE_GPU = 0
+NVML_ERROR_NOT_SUPPORTED = 3
+NVML_ERROR_FUNCTION_NOT_FOUND = 13
+# nvmlClocksThrottleReason* bits that mean the GPU is slowing down for heat
+NVML_THROTTLE_HW_SLOWDOWN = 0x08
+NVML_THROTTLE_SW_THERMAL = 0x20
+NVML_THROTTLE_HW_THERMAL = 0x40
+NVML_THROTTLE_HW_POWER_BRAKE = 0x80
+# Already held at the power limit: lowering the limit would only stack on it
+NVML_THROTTLE_SW_POWER_CAP = 0x04
+# nvmlClockType_t
+NVML_CLOCK_GRAPHICS = 0
+NVML_CLOCK_MEM = 2
+NVML_FEATURE_ENABLED = 1
+
+# Tweaks applied on a previous run (see CUDAOptimizer._load_state)
+STATE_PATH = Path(os.environ.get("LOCALAPPDATA", Path.home())) / "NovaPulse" / "cuda_state.json"
+
+# .reg file restoring the values the first apply_all run overwrote.
+# Written once: later runs would record drifted values, not the user's own.
+UNDO_PATH = STATE_PATH.parent / "cuda_undo.reg"
+_HIVE_NAMES = {
+    winreg.HKEY_LOCAL_MACHINE: "HKEY_LOCAL_MACHINE",
+    winreg.HKEY_CURRENT_USER: "HKEY_CURRENT_USER",
+}
+
+# Registry change notification (RegNotifyChangeKeyValue) for the tweak watch
+ERROR_SUCCESS = 0
+# A cached handle whose key was deleted (clean driver install) fails with this
+ERROR_KEY_DELETED = 1018
+REG_NOTIFY_CHANGE_LAST_SET = 0x00000004
+WAIT_OBJECT_0 = 0x00000000
+WAIT_FAILED = 0xFFFFFFFF
+INFINITE = 0xFFFFFFFF
+# Wait for the other tool to finish its burst of writes before re-checking
+WATCH_SETTLE_MS = 1000
+# A tweak reset this many times by another program is left to it
+WATCH_MAX_REVERTS = 3
 
 try:
-    import pynvml
-    PYNVML_AVAILABLE = True
-except ImportError:
-    PYNVML_AVAILABLE = False
+    _kernel32 = ctypes.WinDLL('kernel32')
+    _advapi32 = ctypes.WinDLL('advapi32')
+    
+    _CreateEventW = _kernel32.CreateEventW
+    _CreateEventW.argtypes = [ctypes.c_void_p, wintypes.BOOL, wintypes.BOOL, wintypes.LPCWSTR]
+    _CreateEventW.restype = wintypes.HANDLE
+    _SetEvent = _kernel32.SetEvent
+    _SetEvent.argtypes = [wintypes.HANDLE]
+    _CloseHandle = _kernel32.CloseHandle
+    _CloseHandle.argtypes = [wintypes.HANDLE]
+    _WaitForSingleObject = _kernel32.WaitForSingleObject
+    _WaitForSingleObject.argtypes = [wintypes.HANDLE, wintypes.DWORD]
+    _WaitForSingleObject.restype = wintypes.DWORD
+    _WaitForMultipleObjects = _kernel32.WaitForMultipleObjects
+    _WaitForMultipleObjects.argtypes = [wintypes.DWORD, ctypes.POINTER(wintypes.HANDLE),
+                                        wintypes.BOOL, wintypes.DWORD]
+    _WaitForMultipleObjects.restype = wintypes.DWORD
+    _RegNotifyChangeKeyValue = _advapi32.RegNotifyChangeKeyValue
+    _RegNotifyChangeKeyValue.argtypes = [wintypes.HKEY, wintypes.BOOL, wintypes.DWORD,
+                                         wintypes.HANDLE, wintypes.BOOL]
+    _RegNotifyChangeKeyValue.restype = wintypes.LONG
+    _GetDriveTypeW = _kernel32.GetDriveTypeW
+    _GetDriveTypeW.argtypes = [wintypes.LPCWSTR]
+    _GetDriveTypeW.restype = wintypes.UINT
+except (AttributeError, OSError):
+    _kernel32 = None
+
+# Hide console windows for spawned processes
+CREATE_NO_WINDOW = 0x08000000
+
+# nvidia-smi fallback (no NVML): one XML dump serves every metric for this long
+NVSMI_CACHE_TTL = 0.5
+NVSMI_TIMEOUT = 5
+
+# CUDA environment variables as (name, value) pairs
+CUDA_ENV_VARS: Final[Tuple[Tuple[str, str], ...]] = (
+    ('CUDA_CACHE_DISABLE', '0'),
+    ('CUDA_CACHE_MAXSIZE', '4294967296'),  # 4 GB, the driver maximum
+    ('CUDA_AUTO_BOOST', '1'),
+    ('CUDA_FORCE_PTX_JIT', '0'),
+    ('CUDA_DEVICE_ORDER', 'PCI_BUS_ID'),
+)
+
+# JIT kernel cache location (the driver default is in the roaming profile)
+CUDA_CACHE_DIR = Path(os.environ.get("LOCALAPPDATA", tempfile.gettempdir())) / "NVIDIA" / "ComputeCache"
+DRIVE_FIXED = 3
+
+# NOVAPULSE_QUIET=1 silences status output
+QUIET = os.environ.get("NOVAPULSE_QUIET") == "1"
+
+# Thermal check re-poll intervals (ms) by distance to the threshold
+GPU_POLL_COLD_MS = 5000     # temp < threshold - 15
+GPU_POLL_WARM_MS = 1500     # threshold - 15 .. threshold - 5
+GPU_POLL_HOT_MS = 250       # >= threshold - 5
+# Readings in the majority filter (a single spurious read cannot flip state)
+GPU_TEMP_SAMPLES = 3
+# Consecutive polls without a throttle reason before a reason-driven throttle
+# is released (power brake / HW slowdown can fire at any temperature)
+GPU_RELEASE_CLEAR_POLLS = 3
+
+@functools.lru_cache(maxsize=None)
+def is_admin() -> bool:
+    """
+    Elevation of this process. It cannot change during the process
+    lifetime, so shell32 is queried once, on first use, not at import.
+    """
+    try:
+        return bool(ctypes.windll.shell32.IsUserAnAdmin())
+    except (AttributeError, OSError):
+        return False
+
+
+def requires_admin(method):
+    """Return False without running the method when not elevated"""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if not self.is_admin:
+            return False
+        return method(self, *args, **kwargs)
+    return wrapper
+
+
+# Settings change broadcast (tells running apps to reload settings)
+HWND_BROADCAST = 0xFFFF
+WM_SETTINGCHANGE = 0x001A
+SMTO_ABORTIFHUNG = 0x0002
+BROADCAST_TIMEOUT_MS = 100
+
+
+def _broadcast_setting_change(area: Optional[str] = None) -> bool:
+    """Send one WM_SETTINGCHANGE to all top-level windows"""
+    try:
+        result = ctypes.c_size_t()  # DWORD_PTR
+        return bool(ctypes.windll.user32.SendMessageTimeoutW(
+            HWND_BROADCAST, WM_SETTINGCHANGE, 0, area,
+            SMTO_ABORTIFHUNG, BROADCAST_TIMEOUT_MS, ctypes.byref(result)))
+    except:
+        return False
 
 
 class CUDAOptimizer:
@@ -28,329 +202,1161 @@ class CUDAOptimizer:
     """
     
     NVIDIA_KEY = r"SOFTWARE\NVIDIA Corporation\Global"
-    CUDA_ENV_VARS = {
-        'CUDA_CACHE_DISABLE': '0',
-        'CUDA_CACHE_MAXSIZE': '268435456',
-        'CUDA_AUTO_BOOST': '1',
-        'CUDA_FORCE_PTX_JIT': '0',
-        'CUDA_DEVICE_ORDER': 'PCI_BUS_ID',
+    NVTWEAK_KEY = r"SOFTWARE\NVIDIA Corporation\Global\NVTweak"
+    # Display adapter class key of the first GPU
+    NVIDIA_CLASS_KEY = r"SYSTEM\CurrentControlSet\Control\Class\{4d36e968-e325-11ce-bfc1-08002be10318}\0000"
+    PHYSX_KEY = r"SOFTWARE\NVIDIA Corporation\Global\PhysX"
+    DXVA_KEY = r"SOFTWARE\Microsoft\DirectX"
+    MEDIA_FOUNDATION_KEY = r"SOFTWARE\Microsoft\Windows Media Foundation"
+    SYSTEM_ENV_KEY = r"SYSTEM\CurrentControlSet\Control\Session Manager\Environment"
+    USER_ENV_KEY = r"Environment"
+    PCIE_ASPM_KEY = r"SYSTEM\CurrentControlSet\Control\Power\PowerSettings\501a4d13-42af-4429-9fd1-a8218c268e20\ee12f906-d277-404b-b6da-e5fa1a576df5"
+    
+    # apply_all_optimizations admin tweaks, in result order:
+    # result key -> (applied_changes key, applied value, label)
+    _TWEAK_RESULTS = {
+        'physx': ('physx', True, "PhysX configured for dedicated GPU"),
+        'hw_accel': ('hw_accel', True, "Hardware acceleration enabled (DXVA, Media Foundation)"),
+        'power_mgmt': ('power_mgmt', True, "GPU Power Management = Maximum Performance"),
+        'prerendered_frames': ('prerendered_frames', 1, "Max Pre-Rendered Frames = 1 (-10-20ms input lag)"),
+        'shader_cache': ('shader_cache', 'unlimited', "Shader Cache = Unlimited"),
+        'p2_state': ('p2_state', False, "CUDA P2 State disabled (GPU maintains high freq)"),
+        'dpc_per_core': ('dpc_per_core', True, "DPC per Core enabled (less stuttering)"),
+        'aspm': ('aspm', False, "GPU ASPM disabled (PCIe always active)"),
+        'texture_filter': ('texture_filtering', 'high_perf', "Texture Filtering = High Performance"),
+        'triple_buffer': ('triple_buffering', False, "Triple Buffering OFF (less latency)"),
+        'preemption': ('preemption', 'optimized', "GPU Preemption optimized"),
+        'threaded_opt': ('threaded_opt', True, "Threaded Optimization = ON"),
     }
     
+    # Registry writes behind _TWEAK_RESULTS, also used by the individual
+    # methods: (result key, hive, key path, value name, type, data, primary).
+    # A result succeeds if any of its primary writes does; the others are
+    # best effort. Writes are grouped so each key is opened once.
+    _ALL_TWEAKS = (
+        ('physx', winreg.HKEY_LOCAL_MACHINE, PHYSX_KEY, "PhysxGpu", winreg.REG_DWORD, 0, True),
+        ('hw_accel', winreg.HKEY_LOCAL_MACHINE, DXVA_KEY, "DisableDXVA", winreg.REG_DWORD, 0, True),
+        ('hw_accel', winreg.HKEY_LOCAL_MACHINE, MEDIA_FOUNDATION_KEY, "EnableHardwareAcceleration", winreg.REG_DWORD, 1, True),
+        ('power_mgmt', winreg.HKEY_LOCAL_MACHINE, NVIDIA_CLASS_KEY, "PerfLevelSrc", winreg.REG_DWORD, 1, True),
+        ('power_mgmt', winreg.HKEY_LOCAL_MACHINE, NVIDIA_CLASS_KEY, "PowerMizerEnable", winreg.REG_DWORD, 1, False),
+        ('power_mgmt', winreg.HKEY_LOCAL_MACHINE, NVIDIA_CLASS_KEY, "PowerMizerLevel", winreg.REG_DWORD, 1, False),
+        ('power_mgmt', winreg.HKEY_LOCAL_MACHINE, NVIDIA_CLASS_KEY, "PowerMizerLevelAC", winreg.REG_DWORD, 1, False),
+        ('prerendered_frames', winreg.HKEY_LOCAL_MACHINE, NVTWEAK_KEY, "MaxPreRenderedFrames", winreg.REG_DWORD, 1, True),
+        ('prerendered_frames', winreg.HKEY_LOCAL_MACHINE, NVIDIA_CLASS_KEY, "MaxPreRenderedFrames", winreg.REG_DWORD, 1, False),
+        ('shader_cache', winreg.HKEY_LOCAL_MACHINE, NVTWEAK_KEY, "ShaderCacheSize", winreg.REG_DWORD, 0xFFFFFFFF, True),
+        ('p2_state', winreg.HKEY_LOCAL_MACHINE, NVIDIA_CLASS_KEY, "RMDisablePostL2Compression", winreg.REG_DWORD, 1, True),
+        ('p2_state', winreg.HKEY_LOCAL_MACHINE, NVIDIA_CLASS_KEY, "EnableCudaBoost", winreg.REG_DWORD, 1, False),
+        ('dpc_per_core', winreg.HKEY_LOCAL_MACHINE, NVIDIA_CLASS_KEY, "RmGpsPsEnablePerCpuCoreDpc", winreg.REG_DWORD, 1, True),
+        ('aspm', winreg.HKEY_LOCAL_MACHINE, NVIDIA_CLASS_KEY, "RmDisableGpuASPMFlags", winreg.REG_DWORD, 1, True),
+        ('aspm', winreg.HKEY_LOCAL_MACHINE, PCIE_ASPM_KEY, "Attributes", winreg.REG_DWORD, 2, False),
+        ('texture_filter', winreg.HKEY_LOCAL_MACHINE, NVTWEAK_KEY, "TextureFiltering", winreg.REG_DWORD, 3, True),
+        ('texture_filter', winreg.HKEY_LOCAL_MACHINE, NVTWEAK_KEY, "NegativeLODBias", winreg.REG_DWORD, 1, False),
+        ('triple_buffer', winreg.HKEY_LOCAL_MACHINE, NVTWEAK_KEY, "TripleBuffering", winreg.REG_DWORD, 0, True),
+        ('preemption', winreg.HKEY_LOCAL_MACHINE, NVIDIA_CLASS_KEY, "EnableMidGfxPreemption", winreg.REG_DWORD, 0, True),
+        ('preemption', winreg.HKEY_LOCAL_MACHINE, NVIDIA_CLASS_KEY, "EnableMidBufferPreemption", winreg.REG_DWORD, 0, False),
+        ('threaded_opt', winreg.HKEY_LOCAL_MACHINE, NVTWEAK_KEY, "ThreadedOptimization", winreg.REG_DWORD, 1, True),
+    )
+    
+    # Singleton with a fixed attribute set: no per-instance __dict__
+    __slots__ = (
+        'is_admin', 'nvidia_available', 'gpu_handle', 'applied_changes',
+        'thermal_threshold', 'thermal_throttle_active', '_temp_samples', '_log_local',
+        '_throttle_by_reasons', '_clear_polls',
+        '_apply_lock', '_watch_thread', '_watch_stop', '_key_cache', '_key_lock',
+        '_tweaks_applied', '_tweak_reverts',
+        '_nvml_direct', '_nvml_get_temp', '_nvml_get_limit', '_nvml_get_constraints',
+        '_nvml_set_limit', '_nvml_get_reasons', '_t_out', '_t_out_ref', '_cur',
+        '_cur_ref', '_mn', '_mn_ref', '_mx', '_mx_ref', '_reasons', '_reasons_ref',
+        '_pl_constraints', '_reason_mask', '_reasons_supported', '_temp_supported',
+        '_nvsmi_available', '_nvsmi_cache', '_power_limit_supported', '_env_changed',
+        '_thermal_task',
+        '_app_clocks_supported', '_app_clocks_lowered', '_app_clocks_pinned',
+        '_pl_default', '_pl_throttled', '_pynvml_get_reasons', '_power_mgmt_supported',
+    )
+    
     def __init__(self):
-        self.is_admin = self._check_admin()
-        self.nvidia_available = PYNVML_AVAILABLE
+        self.is_admin = is_admin()
+        # Registry peek first: no pynvml import or nvmlInit on AMD/Intel-only systems
+        self.nvidia_available = self._nvidia_driver_present() and _load_nvml() is not None
         self.gpu_handle = None
         self.applied_changes = {}
         self.thermal_threshold = 83
         self.thermal_throttle_active = False
+        self._temp_samples = deque(maxlen=GPU_TEMP_SAMPLES)
+        # Whether the active throttle came from the driver's reasons (released
+        # after GPU_RELEASE_CLEAR_POLLS clear polls) or from temperature
+        self._throttle_by_reasons = False
+        self._clear_polls = 0
+        # Per thread: the monitor and watch threads buffer independently
+        self._log_local = threading.local()
+        self._env_changed = False  # An env var write is waiting for its broadcast
+        # apply_all may also run from the registry watch thread
+        self._apply_lock = threading.Lock()
+        self._watch_thread = None
+        self._watch_stop = None
+        # Result keys the watch keeps in place, and how often each was reset
+        self._tweaks_applied = set()
+        self._tweak_reverts: Dict[str, int] = {}
+        # Thermal monitor task on the shared scheduler
+        self._thermal_task = None
+        # Open key handles, kept for the process lifetime (see close_keys).
+        # Keyed by (hive, path, write); shared by callers, watch and thermal threads.
+        self._key_cache: Dict[Tuple[int, str, bool], winreg.HKEYType] = {}
+        self._key_lock = threading.Lock()
+        self._nvml_direct = False  # NVML bound via ctypes (see _bind_nvml)
+        self._pynvml_get_reasons = None
+        self._pl_constraints = None  # (min, max) W - fixed per boot, read once
+        # Power limit at startup and its throttled value (W), 0 if unknown
+        self._pl_default = 0
+        self._pl_throttled = 0
+        self._reason_mask = (NVML_THROTTLE_HW_SLOWDOWN | NVML_THROTTLE_SW_THERMAL |
+                             NVML_THROTTLE_HW_THERMAL | NVML_THROTTLE_HW_POWER_BRAKE)
+        self._reasons_supported = True  # Cleared on older drivers
+        # Cleared on the first NVML_ERROR_NOT_SUPPORTED, later calls return at once
+        self._temp_supported = True
+        self._nvsmi_available = True  # Cleared if nvidia-smi cannot be run
+        self._nvsmi_cache = None       # (timestamp, <gpu> element or None)
+        self._power_limit_supported = True
+        self._power_mgmt_supported = True  # Power limit readable (probed at init)
+        self._app_clocks_supported = True  # Cleared on GeForce (NOT_SUPPORTED)
+        self._app_clocks_lowered = False
+        self._app_clocks_pinned = None  # (mem, graphics) MHz set by set_persistence_and_pin_clocks
         if self.nvidia_available:
             try:
                 pynvml.nvmlInit()
                 self.gpu_handle = pynvml.nvmlDeviceGetHandleByIndex(0)
-            except:
+                # pynvml fallback: resolve the (renamed) reasons getter once
+                self._pynvml_get_reasons = (
+                    getattr(pynvml, 'nvmlDeviceGetCurrentClocksEventReasons', None) or
+                    getattr(pynvml, 'nvmlDeviceGetCurrentClocksThrottleReasons', None))
+                self._bind_nvml()
+                self._init_power_targets()
+            except pynvml.NVMLError:
                 self.nvidia_available = False
     
-    def _check_admin(self) -> bool:
+    def _nvidia_driver_present(self) -> bool:
+        """True if the NVIDIA driver's global settings key exists"""
         try:
-            return ctypes.windll.shell32.IsUserAnAdmin()
-        except:
+            with winreg.OpenKeyEx(winreg.HKEY_LOCAL_MACHINE, self.NVIDIA_KEY, 0,
+                                  winreg.KEY_QUERY_VALUE | winreg.KEY_WOW64_64KEY):
+                return True
+        except OSError:
             return False
     
-    def _set_env_var(self, name, value, system=True):
-        """Set environment variable"""
+    def _bind_nvml(self):
+        """
+        Resolve the NVML functions used on polling paths once and keep
+        reusable output buffers, so each read is a single FFI call with no
+        pynvml wrapper overhead. Falls back to pynvml if binding fails.
+        """
+        try:
+            # Reuse the library pynvml already loaded
+            lib = getattr(pynvml, 'nvmlLib', None) or ctypes.CDLL('nvml.dll')
+            self._nvml_get_temp = lib.nvmlDeviceGetTemperature
+            self._nvml_get_limit = lib.nvmlDeviceGetPowerManagementLimit
+            self._nvml_get_constraints = lib.nvmlDeviceGetPowerManagementLimitConstraints
+            self._nvml_set_limit = lib.nvmlDeviceSetPowerManagementLimit
+        except (AttributeError, OSError):
+            return
+        # Renamed to ClocksEventReasons in newer drivers (the old name is
+        # deprecated); missing on older ones - the thermal check then uses
+        # temperature only
+        self._nvml_get_reasons = (getattr(lib, 'nvmlDeviceGetCurrentClocksEventReasons', None) or
+                                  getattr(lib, 'nvmlDeviceGetCurrentClocksThrottleReasons', None))
+        if self._nvml_get_reasons is not None:
+            self._nvml_get_reasons.restype = ctypes.c_int
+        
+        for func in (self._nvml_get_temp, self._nvml_get_limit,
+                     self._nvml_get_constraints, self._nvml_set_limit):
+            func.restype = ctypes.c_int
+        
+        self._t_out = ctypes.c_uint()
+        self._cur = ctypes.c_uint()
+        self._mn = ctypes.c_uint()
+        self._mx = ctypes.c_uint()
+        self._t_out_ref = ctypes.byref(self._t_out)
+        self._cur_ref = ctypes.byref(self._cur)
+        self._mn_ref = ctypes.byref(self._mn)
+        self._mx_ref = ctypes.byref(self._mx)
+        self._reasons = ctypes.c_ulonglong()
+        self._reasons_ref = ctypes.byref(self._reasons)
+        self._nvml_direct = True
+    
+    def _set_env_vars(self, variables: Tuple[Tuple[str, str], ...], system=True) -> Dict[str, bool]:
+        """Set (name, value) environment variables with one open of the Environment key"""
+        results = {name: False for name, _ in variables}
         try:
             if system and self.is_admin:
-                key = winreg.OpenKeyEx(winreg.HKEY_LOCAL_MACHINE,
-                    r"SYSTEM\CurrentControlSet\Control\Session Manager\Environment",
-                    0, winreg.KEY_SET_VALUE)
+                key = winreg.OpenKeyEx(winreg.HKEY_LOCAL_MACHINE, self.SYSTEM_ENV_KEY,
+                                       0, self._KEY_ACCESS)
             else:
-                key = winreg.OpenKeyEx(winreg.HKEY_CURRENT_USER,
-                    r"Environment", 0, winreg.KEY_SET_VALUE)
-            winreg.SetValueEx(key, name, 0, winreg.REG_SZ, value)
+                key = winreg.OpenKeyEx(winreg.HKEY_CURRENT_USER, self.USER_ENV_KEY,
+                                       0, self._KEY_ACCESS)
+        except OSError:
+            return results
+        with key:
+            for name, value in variables:
+                try:
+                    if self._set_value_if_changed(key, name, winreg.REG_SZ, value):
+                        self._env_changed = True
+                    os.environ[name] = value
+                    results[name] = True
+                except OSError:
+                    pass
+        return results
+    
+    def _log(self, msg: str):
+        # Buffered during apply_all_optimizations and thermal transitions
+        if QUIET:
+            return
+        buf = getattr(self._log_local, 'buf', None)
+        if buf is not None:
+            buf.append(msg)
+        else:
+            print(msg)
+    
+    def _flush_log(self):
+        buf, self._log_local.buf = getattr(self._log_local, 'buf', None), None
+        if buf:
+            sys.stdout.write("\n".join(buf) + "\n")
+            sys.stdout.flush()
+    
+    @contextmanager
+    def _buffered_log(self):
+        """Collect status lines and write them with a single console write"""
+        self._log_local.buf = []
+        try:
+            yield
+        finally:
+            self._flush_log()
+    
+    # Keys are opened for read too, so unchanged values can be skipped
+    # 64-bit view so a 32-bit interpreter isn't redirected to WOW6432Node
+    _KEY_ACCESS = winreg.KEY_SET_VALUE | winreg.KEY_QUERY_VALUE | winreg.KEY_WOW64_64KEY
+    # Verification reads never create keys; the watch uses the same view as the writes
+    _READ_ACCESS = winreg.KEY_QUERY_VALUE | winreg.KEY_WOW64_64KEY
+    _WATCH_ACCESS = winreg.KEY_NOTIFY | winreg.KEY_WOW64_64KEY
+    
+    @staticmethod
+    def _set_value_if_changed(key, value_name, value_type, value_data,
+                              undo: Optional[list] = None) -> bool:
+        """
+        Write a value only when it differs from what is stored (a query is
+        much cheaper than a write + change notification). Returns True if
+        a write happened; raises OSError if the write fails.
+        
+        undo: receives (value_name, previous (data, type) or None) on write
+        """
+        try:
+            previous = winreg.QueryValueEx(key, value_name)
+            if previous == (value_data, value_type):
+                return False
+        except OSError:
+            previous = None  # Missing value (or not readable): write it
+        winreg.SetValueEx(key, value_name, 0, value_type, value_data)
+        if undo is not None:
+            undo.append((value_name, previous))
+        return True
+    
+    @staticmethod
+    def _reg_file_line(value_name: str, previous) -> str:
+        """One .reg line restoring a value (deleting it if it did not exist)"""
+        name = value_name.replace('\\', '\\\\').replace('"', '\\"')
+        if previous is None:
+            return f'"{name}"=-'
+        data, value_type = previous
+        if value_type == winreg.REG_DWORD:
+            return f'"{name}"=dword:{data & 0xFFFFFFFF:08x}'
+        if value_type == winreg.REG_SZ:
+            text = str(data).replace('\\', '\\\\').replace('"', '\\"')
+            return f'"{name}"="{text}"'
+        return f'; "{name}" had type {value_type}, not restored'
+    
+    def _write_undo_file(self, undo: Dict[Tuple[int, str], list]):
+        """Save UNDO_PATH, restoring what this run overwrote, unless it exists"""
+        lines = ["Windows Registry Editor Version 5.00", ""]
+        for (hive, key_path), entries in undo.items():
+            if not entries:
+                continue
+            lines.append(f"[{_HIVE_NAMES.get(hive, hive)}\\{key_path}]")
+            lines.extend(self._reg_file_line(name, previous) for name, previous in entries)
+            lines.append("")
+        if len(lines) == 2:
+            return  # Nothing changed
+        try:
+            UNDO_PATH.parent.mkdir(parents=True, exist_ok=True)
+            # regedit expects UTF-16 with BOM and CRLF line endings;
+            # 'x' never replaces the originals saved by an earlier run
+            with open(UNDO_PATH, 'x', encoding='utf-16', newline='\r\n') as f:
+                f.write("\n".join(lines) + "\n")
+            self._log(f"[CUDA] ℹ Original values saved to {UNDO_PATH} (import to undo)")
+        except FileExistsError:
+            pass
+        except OSError as e:
+            self._log(f"[CUDA] ⚠ Could not write undo file: {e}")
+    
+    def _open(self, key_path, hive=winreg.HKEY_LOCAL_MACHINE, write=True):
+        """
+        Handle for a subkey, opened on first use and then reused, so the
+        class/NVTweak keys are opened once per process instead of per write.
+        
+        write: created if missing, with set + query access; otherwise opened
+        read-only (OSError if the key does not exist).
+        """
+        with self._key_lock:
+            key = self._key_cache.get((hive, key_path, write))
+            if key is None:
+                if write:
+                    key = winreg.CreateKeyEx(hive, key_path, 0, self._KEY_ACCESS)
+                else:
+                    key = winreg.OpenKeyEx(hive, key_path, 0, self._READ_ACCESS)
+                self._key_cache[(hive, key_path, write)] = key
+            return key
+    
+    def _drop_key(self, key, key_path, hive=winreg.HKEY_LOCAL_MACHINE, write=True):
+        """Forget a stale cached handle, unless another thread already replaced it"""
+        with self._key_lock:
+            if self._key_cache.get((hive, key_path, write)) is key:
+                del self._key_cache[(hive, key_path, write)]
+                winreg.CloseKey(key)
+    
+    def _with_key(self, key_path, func, hive=winreg.HKEY_LOCAL_MACHINE, write=True):
+        """
+        func(handle) on the cached handle. If the key was deleted since it
+        was opened (e.g. by a clean driver install), the handle is dropped
+        and func retried once on a fresh one.
+        """
+        key = self._open(key_path, hive, write)
+        try:
+            return func(key)
+        except OSError as e:
+            if getattr(e, 'winerror', None) != ERROR_KEY_DELETED:
+                raise
+            self._drop_key(key, key_path, hive, write)
+        return func(self._open(key_path, hive, write))
+    
+    def close_keys(self):
+        """Close all cached registry handles"""
+        with self._key_lock:
+            cache, self._key_cache = self._key_cache, {}
+        for key in cache.values():
             winreg.CloseKey(key)
-            os.environ[name] = value
+    
+    def _set_registry_values_bulk(self, key_path, values: Dict[str, Tuple[int, Any]],
+                                  hive=winreg.HKEY_LOCAL_MACHINE) -> bool:
+        """Write {name: (type, data)} under one key with a single handle"""
+        def write(key):
+            for value_name, (value_type, value_data) in values.items():
+                self._set_value_if_changed(key, value_name, value_type, value_data)
+        try:
+            self._with_key(key_path, write, hive)
             return True
-        except:
+        except OSError:
             return False
     
     def _set_registry_value(self, key_path, value_name, value_data,
                            value_type=winreg.REG_DWORD, hive=winreg.HKEY_LOCAL_MACHINE):
-        try:
-            key = winreg.CreateKeyEx(hive, key_path, 0, winreg.KEY_SET_VALUE)
-            winreg.SetValueEx(key, value_name, 0, value_type, value_data)
-            winreg.CloseKey(key)
-            return True
-        except:
-            return False
+        return self._set_registry_values_bulk(key_path, {value_name: (value_type, value_data)}, hive)
     
-    def set_cuda_environment(self) -> Dict[str, bool]:
-        """Set optimized CUDA environment variables"""
-        print("\n[CUDA] Configuring CUDA environment variables...")
-        results = {}
-        for var, value in self.CUDA_ENV_VARS.items():
-            success = self._set_env_var(var, value)
-            results[var] = success
-            if success:
-                print(f"[CUDA] ✓ {var} = {value}")
+    def set_cuda_environment(self, broadcast=True) -> Dict[str, bool]:
+        """
+        Set optimized CUDA environment variables
+        
+        broadcast: announce the change so running apps (Explorer, shells
+        started from it) pick the variables up without a new logon.
+        """
+        self._log("\n[CUDA] Configuring CUDA environment variables...")
+        variables = CUDA_ENV_VARS
+        results = self._set_env_vars(CUDA_ENV_VARS)
+        cache_dir = self._cuda_cache_dir()
+        if cache_dir:
+            # Per-user path: always the user environment, even when elevated
+            user_vars = (('CUDA_CACHE_PATH', cache_dir),)
+            results.update(self._set_env_vars(user_vars, system=False))
+            variables += user_vars
+        for var, value in variables:
+            if results[var]:
+                self._log(f"[CUDA] ✓ {var} = {value}")
+        if broadcast:
+            self._broadcast_env_change()
         self.applied_changes['cuda_env'] = results
         return results
     
+    @staticmethod
+    def _cuda_cache_dir() -> Optional[str]:
+        """CUDA_CACHE_DIR, created if needed, or None if not on a local fixed drive"""
+        if _kernel32 is not None and _GetDriveTypeW(CUDA_CACHE_DIR.anchor) != DRIVE_FIXED:
+            return None
+        try:
+            CUDA_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        except OSError:
+            return None
+        return str(CUDA_CACHE_DIR)
+    
+    def _broadcast_env_change(self):
+        """WM_SETTINGCHANGE("Environment"), only if a variable really changed"""
+        if self._env_changed:
+            self._env_changed = False
+            _broadcast_setting_change("Environment")
+    
+    @requires_admin
     def force_physx_dedicated_gpu(self) -> bool:
         """Force PhysX to dedicated GPU (not CPU)"""
-        if not self.is_admin:
-            return False
-        print("[CUDA] Configuring PhysX for dedicated GPU...")
-        physx_key = r"SOFTWARE\NVIDIA Corporation\Global\PhysX"
-        success = self._set_registry_value(physx_key, "PhysxGpu", 0x00000000)
+        self._log("[CUDA] Configuring PhysX for dedicated GPU...")
+        success = self._write_tweak('physx')
         if success:
-            print("[CUDA] ✓ PhysX configured for dedicated GPU")
+            self._log("[CUDA] ✓ PhysX configured for dedicated GPU")
             self.applied_changes['physx'] = True
         return success
     
+    @requires_admin
     def set_gpu_preference_global(self) -> bool:
-        """Set NVIDIA GPU as global preference for graphics apps"""
-        if not self.is_admin:
-            return False
-        print("[CUDA] Configuring NVIDIA as default GPU...")
-        success = True
-        print("[CUDA] ✓ GPU preference configured (use NVIDIA Control Panel for specific apps)")
-        return success
+        """
+        Set NVIDIA GPU as global preference for graphics apps
+        
+        The UserGpuPreferences writes live in the GPU scheduler module; the
+        optimization engine already runs them there, so apply_all does not.
+        """
+        from modules.gpu_scheduler import get_controller
+        return get_controller().set_preferred_gpu_high_performance()
     
+    @requires_admin
     def enable_hardware_acceleration(self) -> bool:
         """Enable hardware acceleration for video/media"""
-        if not self.is_admin:
-            return False
-        print("[CUDA] Enabling hardware acceleration...")
-        s1 = self._set_registry_value(r"SOFTWARE\Microsoft\DirectX", "DisableDXVA", 0)
-        s2 = self._set_registry_value(r"SOFTWARE\Microsoft\Windows Media Foundation", "EnableHardwareAcceleration", 1)
-        if s1 or s2:
-            print("[CUDA] ✓ Hardware acceleration enabled (DXVA, Media Foundation)")
+        self._log("[CUDA] Enabling hardware acceleration...")
+        success = self._write_tweak('hw_accel')
+        if success:
+            self._log("[CUDA] ✓ Hardware acceleration enabled (DXVA, Media Foundation)")
             self.applied_changes['hw_accel'] = True
-        return s1 or s2
+        return success
     
+    @requires_admin
     def set_gpu_power_management(self, prefer_max_performance=True) -> bool:
         """Configure GPU power management"""
-        if not self.is_admin:
-            return False
-        print("[CUDA] Configuring GPU power management...")
-        nv_key = r"SYSTEM\CurrentControlSet\Control\Class\{4d36e968-e325-11ce-bfc1-08002be10318}\0000"
+        self._log("[CUDA] Configuring GPU power management...")
         if prefer_max_performance:
             value = 1
-            print("[CUDA] ✓ GPU Power Management = Maximum Performance")
+            self._log("[CUDA] ✓ GPU Power Management = Maximum Performance")
         else:
             value = 0
-            print("[CUDA] GPU Power Management = Adaptive")
-        success = self._set_registry_value(nv_key, "PerfLevelSrc", value)
-        try:
-            self._set_registry_value(nv_key, "PowerMizerEnable", 1)
-            self._set_registry_value(nv_key, "PowerMizerLevel", 1)
-            self._set_registry_value(nv_key, "PowerMizerLevelAC", 1)
-        except:
-            pass
+            self._log("[CUDA] GPU Power Management = Adaptive")
+        success = self._write_tweak('power_mgmt', {"PerfLevelSrc": value})
         self.applied_changes['power_mgmt'] = prefer_max_performance
         return success
     
+    def _nvsmi_snapshot(self) -> Optional[ET.Element]:
+        """
+        First <gpu> element of `nvidia-smi -q -x`, cached for NVSMI_CACHE_TTL.
+        Only used when NVML is unavailable: one process launch then serves
+        every metric read in the same window.
+        """
+        if not self._nvsmi_available:
+            return None
+        now = time.monotonic()
+        if self._nvsmi_cache and now - self._nvsmi_cache[0] < NVSMI_CACHE_TTL:
+            return self._nvsmi_cache[1]
+        try:
+            result = subprocess.run(["nvidia-smi", "-q", "-x"], capture_output=True,
+                                    timeout=NVSMI_TIMEOUT, creationflags=CREATE_NO_WINDOW)
+            gpu = ET.fromstring(result.stdout).find('gpu')
+        except OSError:
+            # No NVIDIA driver tools - don't try again
+            self._nvsmi_available = False
+            return None
+        except (subprocess.SubprocessError, ET.ParseError):
+            gpu = None
+        self._nvsmi_cache = (now, gpu)
+        return gpu
+    
+    def _nvsmi_int(self, path: str) -> int:
+        """Integer metric from the snapshot, e.g. 'temperature/gpu_temp' ("45 C" -> 45)"""
+        gpu = self._nvsmi_snapshot()
+        if gpu is None:
+            return 0
+        text = gpu.findtext(path, default="")
+        try:
+            return int(float(text.split()[0]))
+        except (IndexError, ValueError):
+            return 0  # "N/A" or missing
+    
+    def get_gpu_utilization(self) -> int:
+        """GPU core utilization (%)"""
+        if self.nvidia_available and self.gpu_handle:
+            try:
+                return pynvml.nvmlDeviceGetUtilizationRates(self.gpu_handle).gpu
+            except pynvml.NVMLError:
+                return 0
+        return self._nvsmi_int('utilization/gpu_util')
+    
+    def get_fan_speed(self) -> int:
+        """GPU fan speed (% of max), 0 if not reported"""
+        if self.nvidia_available and self.gpu_handle:
+            try:
+                return pynvml.nvmlDeviceGetFanSpeed(self.gpu_handle)
+            except pynvml.NVMLError:
+                return 0
+        return self._nvsmi_int('fan_speed')
+    
     def get_gpu_temp(self) -> int:
         """Get current GPU temperature"""
         if not self.nvidia_available or not self.gpu_handle:
+            return self._nvsmi_int('temperature/gpu_temp')
+        if not self._temp_supported:
             return 0
-        try:
-            return pynvml.nvmlDeviceGetTemperature(self.gpu_handle, pynvml.NVML_TEMPERATURE_GPU)
-        except:
-            return 0
+        if self._nvml_direct:
+            status = self._nvml_get_temp(self.gpu_handle, NVML_TEMPERATURE_GPU, self._t_out_ref)
+            if status == NVML_SUCCESS:
+                return self._t_out.value
+        else:
+            try:
+                return pynvml.nvmlDeviceGetTemperature(self.gpu_handle, pynvml.NVML_TEMPERATURE_GPU)
+            except pynvml.NVMLError as e:
+                status = getattr(e, 'value', None)
+        if status == NVML_ERROR_NOT_SUPPORTED:
+            self._temp_supported = False
+        return 0
     
     def get_gpu_power_limit(self) -> Tuple[int, int, int]:
         """Returns (current, min, max) power limit in watts"""
-        if not self.nvidia_available or not self.gpu_handle:
+        if not self._power_mgmt_supported or not self.nvidia_available or not self.gpu_handle:
             return (0, 0, 0)
-        try:
-            current = pynvml.nvmlDeviceGetPowerManagementLimit(self.gpu_handle) // 1000
-            constraints = pynvml.nvmlDeviceGetPowerManagementLimitConstraints(self.gpu_handle)
-            return (current, constraints[0] // 1000, constraints[1] // 1000)
-        except:
+        min_limit, max_limit = self.get_gpu_power_constraints()
+        if not max_limit:
             return (0, 0, 0)
+        if self._nvml_direct:
+            status = self._nvml_get_limit(self.gpu_handle, self._cur_ref)
+            if status == NVML_SUCCESS:
+                return (self._cur.value // 1000, min_limit, max_limit)
+        else:
+            try:
+                current = pynvml.nvmlDeviceGetPowerManagementLimit(self.gpu_handle) // 1000
+                return (current, min_limit, max_limit)
+            except pynvml.NVMLError as e:
+                status = getattr(e, 'value', None)
+        if status == NVML_ERROR_NOT_SUPPORTED:
+            self._power_mgmt_supported = False
+        return (0, 0, 0)
+    
+    def _init_power_targets(self):
+        """Read the startup limit once; throttle/release then need no reads"""
+        current, min_limit, max_limit = self.get_gpu_power_limit()
+        if current > 0 and max_limit > 0:
+            self._pl_default = current
+            self._pl_throttled = max(int(current * 0.8), min_limit)
+    
+    def get_gpu_power_constraints(self) -> Tuple[int, int]:
+        """Returns (min, max) power limit in watts (cached after the first read)"""
+        if self._pl_constraints is not None:
+            return self._pl_constraints
+        if not self._power_mgmt_supported or not self.nvidia_available or not self.gpu_handle:
+            return (0, 0)
+        if self._nvml_direct:
+            status = self._nvml_get_constraints(self.gpu_handle, self._mn_ref, self._mx_ref)
+            if status == NVML_SUCCESS:
+                self._pl_constraints = (self._mn.value // 1000, self._mx.value // 1000)
+                return self._pl_constraints
+        else:
+            try:
+                min_limit, max_limit = pynvml.nvmlDeviceGetPowerManagementLimitConstraints(self.gpu_handle)
+                self._pl_constraints = (min_limit // 1000, max_limit // 1000)
+                return self._pl_constraints
+            except pynvml.NVMLError as e:
+                status = getattr(e, 'value', None)
+        if status == NVML_ERROR_NOT_SUPPORTED:
+            # Common on mobile GeForce: later calls return at once, no NVML call
+            self._power_mgmt_supported = False
+        return (0, 0)
     
     def set_gpu_power_limit(self, watts) -> bool:
         """Set GPU power limit (requires driver support)"""
-        if not self.nvidia_available or not self.gpu_handle:
+        if not self._power_limit_supported or not self.nvidia_available or not self.gpu_handle:
             return False
-        try:
-            pynvml.nvmlDeviceSetPowerManagementLimit(self.gpu_handle, watts * 1000)
-            print(f"[CUDA] ✓ GPU Power Limit = {watts}W")
+        if self._nvml_direct:
+            status = self._nvml_set_limit(self.gpu_handle, ctypes.c_uint(watts * 1000))
+            error = f"NVML error {status}"
+        else:
+            try:
+                pynvml.nvmlDeviceSetPowerManagementLimit(self.gpu_handle, watts * 1000)
+                status = NVML_SUCCESS
+            except pynvml.NVMLError as e:
+                status = getattr(e, 'value', None)
+                error = e
+        if status == NVML_SUCCESS:
+            self._log(f"[CUDA] ✓ GPU Power Limit = {watts}W")
             return True
-        except Exception as e:
-            print(f"[CUDA] ⚠ Power limit not supported: {e}")
-            return False
+        if status == NVML_ERROR_NOT_SUPPORTED:
+            # Consumer GPUs: stop trying (and warning) on every thermal event
+            self._power_limit_supported = False
+        self._log(f"[CUDA] ⚠ Power limit not supported: {error}")
+        return False
+    
+    def get_throttle_reasons(self) -> Optional[int]:
+        """Current clocks throttle reason bitmask, None if not supported"""
+        if not self._reasons_supported or not self.nvidia_available or not self.gpu_handle:
+            return None
+        if self._nvml_direct:
+            if self._nvml_get_reasons is None:
+                status = NVML_ERROR_FUNCTION_NOT_FOUND
+            else:
+                status = self._nvml_get_reasons(self.gpu_handle, self._reasons_ref)
+            if status == NVML_SUCCESS:
+                return self._reasons.value
+        elif self._pynvml_get_reasons is None:
+            status = NVML_ERROR_FUNCTION_NOT_FOUND
+        else:
+            try:
+                return self._pynvml_get_reasons(self.gpu_handle)
+            except pynvml.NVMLError as e:
+                status = getattr(e, 'value', None)
+        if status in (NVML_ERROR_NOT_SUPPORTED, NVML_ERROR_FUNCTION_NOT_FOUND):
+            self._reasons_supported = False
+        return None
+    
+    def _next_poll_ms(self, gpu_temp: int) -> int:
+        """Poll slowly while far below the threshold, fast when close"""
+        if gpu_temp < self.thermal_threshold - 15:
+            return GPU_POLL_COLD_MS
+        if gpu_temp < self.thermal_threshold - 5:
+            return GPU_POLL_WARM_MS
+        return GPU_POLL_HOT_MS
     
     def check_thermal_throttle(self) -> bool:
-        """Check GPU temperature and apply throttle if needed"""
-        gpu_temp = self.get_gpu_temp()
-        if gpu_temp >= self.thermal_threshold:
+        """
+        Check GPU temperature and apply throttle if needed
+        
+        Returns True if the throttle was activated by this check.
+        """
+        return self._thermal_step()[0]
+    
+    def _thermal_step(self) -> Tuple[bool, int]:
+        """
+        One thermal check: (throttle activated now, ms until the next check)
+        
+        Activation follows the driver's own thermal/power-brake throttle
+        reasons when available, so a hot-but-not-throttling GPU is left
+        alone; it is released after GPU_RELEASE_CLEAR_POLLS consecutive
+        polls without them. Older drivers fall back to the median of the
+        last GPU_TEMP_SAMPLES readings against thermal_threshold, so one
+        spurious hot read does not toggle the throttle, and release 5°C
+        below it.
+        """
+        raw_temp = self.get_gpu_temp()
+        self._temp_samples.append(raw_temp)
+        # Poll on the raw reading so a real rise is picked up quickly
+        next_poll = self._next_poll_ms(raw_temp)
+        gpu_temp = statistics.median_low(self._temp_samples)
+        
+        reasons = self.get_throttle_reasons()
+        if reasons is not None:
+            overheating = (reasons & self._reason_mask) != 0
+        else:
+            overheating = gpu_temp >= self.thermal_threshold
+        
+        if overheating:
+            self._clear_polls = 0
             if not self.thermal_throttle_active:
                 self.thermal_throttle_active = True
-                print(f"\n[GPU THERMAL] ⚠️ GPU {gpu_temp}°C >= {self.thermal_threshold}°C")
-                print("[GPU THERMAL] 🌡️ Activating GPU Thermal Throttle")
-                current, min_limit, max_limit = self.get_gpu_power_limit()
-                if current > 0 and max_limit > 0:
-                    reduced = int(current * 0.8)
-                    if reduced >= min_limit:
-                        self.set_gpu_power_limit(reduced)
-                return True
-        elif self.thermal_throttle_active and gpu_temp < (self.thermal_threshold - 5):
+                self._throttle_by_reasons = reasons is not None
+                with self._buffered_log():
+                    if reasons is not None:
+                        self._log(f"\n[GPU THERMAL] ⚠️ GPU {gpu_temp}°C - driver reports thermal slowdown (0x{reasons:X})")
+                    else:
+                        self._log(f"\n[GPU THERMAL] ⚠️ GPU {gpu_temp}°C >= {self.thermal_threshold}°C")
+                    self._log("[GPU THERMAL] 🌡️ Activating GPU Thermal Throttle")
+                    if reasons is not None and reasons & NVML_THROTTLE_SW_POWER_CAP:
+                        self._log("[GPU THERMAL] ℹ Already power capped - lowering clocks instead of the power limit")
+                        self._lower_application_clocks()
+                    elif self._pl_throttled:
+                        self.set_gpu_power_limit(self._pl_throttled)
+                return True, next_poll
+        elif self.thermal_throttle_active:
+            if self._throttle_by_reasons:
+                self._clear_polls += 1
+                if self._clear_polls < GPU_RELEASE_CLEAR_POLLS:
+                    return False, next_poll
+            elif gpu_temp >= self.thermal_threshold - 5:
+                return False, next_poll
             self.thermal_throttle_active = False
-            print(f"\n[GPU THERMAL] ✓ GPU {gpu_temp}°C - Temperature normalized")
-            _, _, max_limit = self.get_gpu_power_limit()
-            if max_limit > 0:
-                self.set_gpu_power_limit(max_limit)
-        return False
+            self._clear_polls = 0
+            with self._buffered_log():
+                if self._throttle_by_reasons:
+                    self._log(f"\n[GPU THERMAL] ✓ GPU {gpu_temp}°C - Driver throttle reasons cleared")
+                else:
+                    self._log(f"\n[GPU THERMAL] ✓ GPU {gpu_temp}°C - Temperature normalized")
+                if self._pl_default:
+                    self.set_gpu_power_limit(self._pl_default)
+                if self._app_clocks_lowered:
+                    self._restore_application_clocks()
+        return False, next_poll
+    
+    def _lower_application_clocks(self) -> bool:
+        """Step the graphics application clock ~20% down (Tesla/Quadro only)"""
+        if not self._app_clocks_supported:
+            return False
+        try:
+            mem = pynvml.nvmlDeviceGetApplicationsClock(self.gpu_handle, NVML_CLOCK_MEM)
+            graphics = pynvml.nvmlDeviceGetApplicationsClock(self.gpu_handle, NVML_CLOCK_GRAPHICS)
+            lower = [clock for clock in pynvml.nvmlDeviceGetSupportedGraphicsClocks(self.gpu_handle, mem)
+                     if clock <= graphics * 0.8]
+            if not lower:
+                return False
+            pynvml.nvmlDeviceSetApplicationsClocks(self.gpu_handle, mem, max(lower))
+        except pynvml.NVMLError as e:
+            if getattr(e, 'value', None) == NVML_ERROR_NOT_SUPPORTED:
+                self._app_clocks_supported = False
+            self._log(f"[GPU THERMAL] ⚠ Application clocks not supported: {e}")
+            return False
+        self._app_clocks_lowered = True
+        self._log(f"[GPU THERMAL] ✓ Graphics clock capped at {max(lower)} MHz")
+        return True
+    
+    def _restore_application_clocks(self):
+        """Undo _lower_application_clocks (back to the pinned pair, if any)"""
+        try:
+            if self._app_clocks_pinned:
+                pynvml.nvmlDeviceSetApplicationsClocks(self.gpu_handle, *self._app_clocks_pinned)
+            else:
+                pynvml.nvmlDeviceResetApplicationsClocks(self.gpu_handle)
+            self._app_clocks_lowered = False
+        except pynvml.NVMLError as e:
+            self._log(f"[GPU THERMAL] ⚠ Could not restore application clocks: {e}")
+    
+    def start_thermal_monitor(self) -> bool:
+        """
+        Run the thermal check in the background on the shared scheduler,
+        at the interval each check returns itself.
+        """
+        if not self.nvidia_available or not self.gpu_handle or self._thermal_task is not None:
+            return False
+        self._thermal_task = get_scheduler().add(
+            lambda: self._thermal_step()[1] / 1000,
+            GPU_POLL_COLD_MS / 1000, name='gpu-thermal')
+        return True
+    
+    def stop_thermal_monitor(self):
+        """Stop the thermal monitor scheduler task"""
+        if self._thermal_task is not None:
+            get_scheduler().remove(self._thermal_task)
+            self._thermal_task = None
     
     # =========================================================================
     # ADVANCED NVIDIA OPTIMIZATIONS
     # =========================================================================
     
+    @requires_admin
     def set_prerendered_frames(self, frames=1) -> bool:
         """Set Max Pre-Rendered Frames (fewer = less input lag)"""
-        if not self.is_admin:
-            return False
-        print(f"[NVIDIA ADV] Configuring Max Pre-Rendered Frames = {frames}...")
-        nv_key = r"SOFTWARE\NVIDIA Corporation\Global\NVTweak"
-        success = self._set_registry_value(nv_key, "MaxPreRenderedFrames", frames)
-        profile_key = r"SYSTEM\CurrentControlSet\Control\Class\{4d36e968-e325-11ce-bfc1-08002be10318}\0000"
-        self._set_registry_value(profile_key, "MaxPreRenderedFrames", frames)
+        self._log(f"[NVIDIA ADV] Configuring Max Pre-Rendered Frames = {frames}...")
+        success = self._write_tweak('prerendered_frames', {"MaxPreRenderedFrames": frames})
         if success:
-            print(f"[NVIDIA ADV] ✓ Max Pre-Rendered Frames = {frames} (-10-20ms input lag)")
+            self._log(f"[NVIDIA ADV] ✓ Max Pre-Rendered Frames = {frames} (-10-20ms input lag)")
             self.applied_changes['prerendered_frames'] = frames
         return success
     
+    @requires_admin
     def set_shader_cache_unlimited(self) -> bool:
         """Set Shader Cache to Unlimited (less stuttering)"""
-        if not self.is_admin:
-            return False
-        print("[NVIDIA ADV] Configuring Shader Cache Unlimited...")
-        nv_key = r"SOFTWARE\NVIDIA Corporation\Global\NVTweak"
-        success = self._set_registry_value(nv_key, "ShaderCacheSize", 0xFFFFFFFF)
+        self._log("[NVIDIA ADV] Configuring Shader Cache Unlimited...")
+        success = self._write_tweak('shader_cache')
         if success:
-            print("[NVIDIA ADV] ✓ Shader Cache = Unlimited")
+            self._log("[NVIDIA ADV] ✓ Shader Cache = Unlimited")
             self.applied_changes['shader_cache'] = 'unlimited'
         return success
     
+    @requires_admin
     def disable_cuda_p2_state(self) -> bool:
         """Disable CUDA P2 State (keeps GPU at high frequency)"""
-        if not self.is_admin:
-            return False
-        print("[NVIDIA ADV] Disabling CUDA P2 State...")
-        nv_key = r"SYSTEM\CurrentControlSet\Control\Class\{4d36e968-e325-11ce-bfc1-08002be10318}\0000"
-        success = self._set_registry_value(nv_key, "RMDisablePostL2Compression", 1)
-        self._set_registry_value(nv_key, "EnableCudaBoost", 1)
+        self._log("[NVIDIA ADV] Disabling CUDA P2 State...")
+        success = self._write_tweak('p2_state')
         if success:
-            print("[NVIDIA ADV] ✓ CUDA P2 State disabled (GPU maintains high freq)")
+            self._log("[NVIDIA ADV] ✓ CUDA P2 State disabled (GPU maintains high freq)")
             self.applied_changes['p2_state'] = False
         return success
     
+    @requires_admin
     def enable_dpc_per_core(self) -> bool:
         """Enable DPC per core (less micro-stutters)"""
-        if not self.is_admin:
-            return False
-        print("[NVIDIA ADV] Enabling DPC per Core...")
-        nv_key = r"SYSTEM\CurrentControlSet\Control\Class\{4d36e968-e325-11ce-bfc1-08002be10318}\0000"
-        success = self._set_registry_value(nv_key, "RmGpsPsEnablePerCpuCoreDpc", 1)
+        self._log("[NVIDIA ADV] Enabling DPC per Core...")
+        success = self._write_tweak('dpc_per_core')
         if success:
-            print("[NVIDIA ADV] ✓ DPC per Core enabled (less stuttering)")
+            self._log("[NVIDIA ADV] ✓ DPC per Core enabled (less stuttering)")
             self.applied_changes['dpc_per_core'] = True
         return success
     
+    @requires_admin
     def disable_gpu_aspm(self) -> bool:
         """Disable GPU ASPM (PCIe always active, lower latency)"""
-        if not self.is_admin:
-            return False
-        print("[NVIDIA ADV] Disabling GPU ASPM...")
-        nv_key = r"SYSTEM\CurrentControlSet\Control\Class\{4d36e968-e325-11ce-bfc1-08002be10318}\0000"
-        success = self._set_registry_value(nv_key, "RmDisableGpuASPMFlags", 1)
-        pcie_key = r"SYSTEM\CurrentControlSet\Control\Power\PowerSettings\501a4d13-42af-4429-9fd1-a8218c268e20\ee12f906-d277-404b-b6da-e5fa1a576df5"
-        self._set_registry_value(pcie_key, "Attributes", 2)
+        self._log("[NVIDIA ADV] Disabling GPU ASPM...")
+        success = self._write_tweak('aspm')
         if success:
-            print("[NVIDIA ADV] ✓ GPU ASPM disabled (PCIe always active)")
+            self._log("[NVIDIA ADV] ✓ GPU ASPM disabled (PCIe always active)")
             self.applied_changes['aspm'] = False
         return success
     
+    @requires_admin
     def set_texture_filtering_performance(self) -> bool:
         """Configure Texture Filtering for High Performance"""
-        if not self.is_admin:
-            return False
-        print("[NVIDIA ADV] Configuring Texture Filtering...")
-        nv_key = r"SOFTWARE\NVIDIA Corporation\Global\NVTweak"
-        success = self._set_registry_value(nv_key, "TextureFiltering", 3)
-        self._set_registry_value(nv_key, "NegativeLODBias", 1)
+        self._log("[NVIDIA ADV] Configuring Texture Filtering...")
+        success = self._write_tweak('texture_filter')
         if success:
-            print("[NVIDIA ADV] ✓ Texture Filtering = High Performance")
+            self._log("[NVIDIA ADV] ✓ Texture Filtering = High Performance")
             self.applied_changes['texture_filtering'] = 'high_perf'
         return success
     
+    @requires_admin
     def disable_triple_buffering(self) -> bool:
         """Disable Triple Buffering (less latency)"""
-        if not self.is_admin:
-            return False
-        print("[NVIDIA ADV] Disabling Triple Buffering...")
-        nv_key = r"SOFTWARE\NVIDIA Corporation\Global\NVTweak"
-        success = self._set_registry_value(nv_key, "TripleBuffering", 0)
+        self._log("[NVIDIA ADV] Disabling Triple Buffering...")
+        success = self._write_tweak('triple_buffer')
         if success:
-            print("[NVIDIA ADV] ✓ Triple Buffering OFF (less latency)")
+            self._log("[NVIDIA ADV] ✓ Triple Buffering OFF (less latency)")
             self.applied_changes['triple_buffering'] = False
         return success
     
+    @requires_admin
     def disable_gpu_preemption(self) -> bool:
         """Disable GPU Preemption (less overhead)"""
-        if not self.is_admin:
-            return False
-        print("[NVIDIA ADV] Configuring GPU Preemption...")
-        nv_key = r"SYSTEM\CurrentControlSet\Control\Class\{4d36e968-e325-11ce-bfc1-08002be10318}\0000"
-        success = self._set_registry_value(nv_key, "EnableMidGfxPreemption", 0)
-        self._set_registry_value(nv_key, "EnableMidBufferPreemption", 0)
+        self._log("[NVIDIA ADV] Configuring GPU Preemption...")
+        success = self._write_tweak('preemption')
         if success:
-            print("[NVIDIA ADV] ✓ GPU Preemption optimized")
+            self._log("[NVIDIA ADV] ✓ GPU Preemption optimized")
             self.applied_changes['preemption'] = 'optimized'
         return success
     
+    @requires_admin
+    def set_persistence_and_pin_clocks(self) -> bool:
+        """
+        Keep the driver initialized between clients (persistence mode) and
+        pin the application clocks to the highest supported pair, so clocks
+        don't reset and ramp up again around short workloads.
+        
+        Persistence mode is Linux-only in NVML and GeForce parts reject
+        application clocks; either refusal is expected, not an error.
+        """
+        if not self.nvidia_available or not self.gpu_handle:
+            return False
+        self._log("[NVIDIA ADV] Configuring persistence mode and application clocks...")
+        persistence = False
+        try:
+            pynvml.nvmlDeviceSetPersistenceMode(self.gpu_handle, NVML_FEATURE_ENABLED)
+            persistence = True
+            self._log("[NVIDIA ADV] ✓ Persistence mode enabled")
+        except pynvml.NVMLError:
+            pass
+        
+        # Pinned once per process: a re-pin would undo a thermal clock cap
+        if self._app_clocks_supported and not self._app_clocks_pinned:
+            try:
+                mem = max(pynvml.nvmlDeviceGetSupportedMemoryClocks(self.gpu_handle))
+                graphics = max(pynvml.nvmlDeviceGetSupportedGraphicsClocks(self.gpu_handle, mem))
+                pynvml.nvmlDeviceSetApplicationsClocks(self.gpu_handle, mem, graphics)
+                self._app_clocks_pinned = (mem, graphics)
+                self.applied_changes['app_clocks'] = self._app_clocks_pinned
+                self._log(f"[NVIDIA ADV] ✓ Application clocks pinned = {graphics} MHz core / {mem} MHz memory")
+            except pynvml.NVMLError as e:
+                if getattr(e, 'value', None) == NVML_ERROR_NOT_SUPPORTED:
+                    self._app_clocks_supported = False
+        if not persistence and not self._app_clocks_pinned:
+            self._log("[NVIDIA ADV] ℹ Persistence mode / application clocks not supported by this GPU")
+        return persistence or self._app_clocks_pinned is not None
+    
+    @requires_admin
     def set_threaded_optimization(self, enabled=True) -> bool:
         """Enable Threaded Optimization (multiple threads for rendering)"""
-        if not self.is_admin:
-            return False
-        print("[NVIDIA ADV] Configuring Threaded Optimization...")
-        nv_key = r"SOFTWARE\NVIDIA Corporation\Global\NVTweak"
+        self._log("[NVIDIA ADV] Configuring Threaded Optimization...")
         value = 1 if enabled else 0
-        success = self._set_registry_value(nv_key, "ThreadedOptimization", value)
+        success = self._write_tweak('threaded_opt', {"ThreadedOptimization": value})
         if success:
             status = "ON" if enabled else "OFF"
-            print(f"[NVIDIA ADV] ✓ Threaded Optimization = {status}")
+            self._log(f"[NVIDIA ADV] ✓ Threaded Optimization = {status}")
             self.applied_changes['threaded_opt'] = enabled
         return success
     
     def apply_all_optimizations(self) -> Dict[str, bool]:
         """Apply all CUDA/GPU optimizations"""
-        print("\n[CUDA] Applying CUDA and GPU optimizations...")
+        with self._apply_lock, self._buffered_log():
+            self._log("\n[CUDA] Applying CUDA and GPU optimizations...")
+            results = self._apply_all_optimizations()
+            # One broadcast for the whole batch, none if nothing changed
+            self._broadcast_env_change()
+            success_count = sum(results.values())
+            self._log(f"\n[CUDA] Result: {success_count}/{len(results)} optimizations applied")
+            if self.nvidia_available:
+                temp = self.get_gpu_temp()
+                self._log(f"[CUDA] GPU Temp: {temp}°C | Thermal Threshold: {self.thermal_threshold}°C")
+            return results
+    
+    def start_registry_watch(self) -> bool:
+        """
+        Restore the registry tweaks whenever another program (NVIDIA Control
+        Panel, GeForce Experience, a driver update) overwrites them.
+        
+        The thread sleeps in the kernel until Windows signals a change, so
+        there is no polling between changes.
+        """
+        if _kernel32 is None or not self.is_admin or self._watch_thread is not None:
+            return False
+        
+        key_paths, keys = [], []
+        for key_path in (self.NVIDIA_CLASS_KEY, self.NVTWEAK_KEY):
+            try:
+                keys.append(winreg.OpenKeyEx(winreg.HKEY_LOCAL_MACHINE, key_path,
+                                             0, self._WATCH_ACCESS))
+                key_paths.append(key_path)
+            except OSError:
+                pass
+        if not keys:
+            return False
+        
+        self._watch_stop = _CreateEventW(None, True, False, None)
+        events = [_CreateEventW(None, False, False, None) for _ in keys]
+        self._watch_thread = threading.Thread(target=self._registry_watch_loop,
+                                              args=(key_paths, keys, events), daemon=True,
+                                              name='NovaPulse-CUDAWatch')
+        self._watch_thread.start()
+        return True
+    
+    def stop_registry_watch(self):
+        """Stop the registry watch thread"""
+        if self._watch_thread is None:
+            return
+        _SetEvent(self._watch_stop)
+        self._watch_thread.join(timeout=5)
+        self._watch_thread = None
+        _CloseHandle(self._watch_stop)
+        self._watch_stop = None
+    
+    @classmethod
+    def _arm_watch(cls, key_paths, keys, i, event) -> bool:
+        """
+        Request the next change notification for keys[i]. A key deleted and
+        recreated (driver reinstall) is reopened once; False if that fails.
+        """
+        if _RegNotifyChangeKeyValue(keys[i].handle, True, REG_NOTIFY_CHANGE_LAST_SET,
+                                    event, True) == ERROR_SUCCESS:
+            return True
+        winreg.CloseKey(keys[i])
+        try:
+            keys[i] = winreg.OpenKeyEx(winreg.HKEY_LOCAL_MACHINE, key_paths[i],
+                                       0, cls._WATCH_ACCESS)
+        except OSError:
+            keys[i] = None
+            return False
+        return _RegNotifyChangeKeyValue(keys[i].handle, True, REG_NOTIFY_CHANGE_LAST_SET,
+                                        event, True) == ERROR_SUCCESS
+    
+    def _registry_watch_loop(self, key_paths, keys, events):
+        handles = (wintypes.HANDLE * (len(events) + 1))(self._watch_stop, *events)
+        armed = [False] * len(keys)
+        try:
+            while True:
+                # Notifications are one-shot: re-arm the keys that fired
+                for i, event in enumerate(events):
+                    if not armed[i]:
+                        if not self._arm_watch(key_paths, keys, i, event):
+                            self._log(f"\n[CUDA] ⚠ Registry watch stopped: cannot watch {key_paths[i]}")
+                            return
+                        armed[i] = True
+                
+                index = _WaitForMultipleObjects(len(handles), handles, False, INFINITE)
+                if index == WAIT_OBJECT_0 or index == WAIT_FAILED:
+                    break
+                armed[index - 1] = False
+                
+                if _WaitForSingleObject(self._watch_stop, WATCH_SETTLE_MS) == WAIT_OBJECT_0:
+                    break
+                # Drain any other key signalled during the settle period
+                for i, event in enumerate(events):
+                    if _WaitForSingleObject(event, 0) == WAIT_OBJECT_0:
+                        armed[i] = False
+                
+                self._reconcile_tweaks()
+        finally:
+            for key in keys:
+                if key is not None:
+                    winreg.CloseKey(key)
+            for handle in events:
+                _CloseHandle(handle)
+    
+    def _reconcile_tweaks(self):
+        """
+        Re-write only the applied tweaks whose values another program
+        changed; no environment, NVML or undo work. A tweak reset more than
+        WATCH_MAX_REVERTS times is left to that program instead of fighting
+        over it.
+        """
+        with self._apply_lock, self._buffered_log():
+            drifted = self._tweaks_applied - self._still_applied(self._tweaks_applied)
+            if not drifted:
+                return  # Our own writes, or values that are still ours
+            self._log("\n[CUDA] ℹ NVIDIA settings changed externally - restoring optimizations")
+            for result_key in drifted:
+                label = self._TWEAK_RESULTS[result_key][2]
+                reverts = self._tweak_reverts.get(result_key, 0) + 1
+                self._tweak_reverts[result_key] = reverts
+                if reverts > WATCH_MAX_REVERTS:
+                    self._tweaks_applied.discard(result_key)
+                    self._log(f"[CUDA] ⚠ {label}: reset {reverts} times by another program - no longer restored")
+                    continue
+                for row_key, hive, key_path, value_name, value_type, value_data, _ in self._ALL_TWEAKS:
+                    if row_key == result_key:
+                        self._set_registry_value(key_path, value_name, value_data, value_type, hive)
+                self._log(f"[CUDA] ✓ Restored: {label}")
+    
+    def _state_fingerprint(self) -> str:
+        """Tweak table + driver version; any change invalidates saved state"""
+        driver = ""
+        if self.nvidia_available:
+            try:
+                driver = pynvml.nvmlSystemGetDriverVersion()
+                if isinstance(driver, bytes):
+                    driver = driver.decode()
+            except pynvml.NVMLError:
+                pass
+        return hashlib.sha1(f"{self._ALL_TWEAKS!r}|{driver}".encode()).hexdigest()
+    
+    def _load_state(self, fingerprint: str) -> Dict[str, bool]:
+        """Result keys applied on a previous run with the same fingerprint"""
+        try:
+            with open(STATE_PATH, 'r') as f:
+                data = json.load(f)
+            if data.get('fingerprint') != fingerprint:
+                return {}
+            return dict(data.get('applied', {}))
+        except (OSError, ValueError, AttributeError, TypeError):
+            return {}
+    
+    def _save_state(self, fingerprint: str, applied: Dict[str, bool]):
+        """Persist applied tweaks atomically (write-then-rename)"""
+        try:
+            STATE_PATH.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = STATE_PATH.with_suffix('.tmp')
+            with open(tmp_path, 'w') as f:
+                json.dump({'fingerprint': fingerprint, 'applied': applied}, f, indent=2)
+            os.replace(tmp_path, STATE_PATH)
+        except OSError as e:
+            self._log(f"[CUDA] ⚠ Error saving applied state: {e}")
+    
+    def _get_registry_value(self, key_path, value_name,
+                            hive=winreg.HKEY_LOCAL_MACHINE) -> Optional[Tuple[Any, int]]:
+        """(data, type) of a value through a cached read-only handle, None if unreadable"""
+        try:
+            return self._with_key(key_path, lambda key: winreg.QueryValueEx(key, value_name),
+                                  hive, write=False)
+        except OSError:
+            return None
+    
+    def _still_applied(self, result_keys) -> set:
+        """
+        Of the given result keys, those whose registry values are all still
+        in place. An untouched system costs only queries on the already-open
+        handles; tweaks overwritten by other tools (driver updates, GeForce
+        Experience) drop out and are re-applied.
+        """
+        intact = set(result_keys)
+        for result_key, hive, key_path, value_name, value_type, value_data, _ in self._ALL_TWEAKS:
+            if result_key in intact and \
+                    self._get_registry_value(key_path, value_name, hive) != (value_data, value_type):
+                intact.discard(result_key)
+        return intact
+    
+    def _write_rows(self, key, rows, undo: Optional[list]) -> list:
+        """
+        Write _ALL_TWEAKS rows under one open key; returns the rows written.
+        A deleted key is re-raised so _with_key can reopen it.
+        """
+        written = []
+        for row in rows:
+            _, _, _, value_name, value_type, value_data, _ = row
+            try:
+                self._set_value_if_changed(key, value_name, value_type, value_data, undo)
+            except OSError as e:
+                if getattr(e, 'winerror', None) == ERROR_KEY_DELETED:
+                    raise
+                continue
+            written.append(row)
+        return written
+    
+    def _write_tweak(self, result_key, data: Optional[Dict[str, Any]] = None) -> bool:
+        """
+        Write the _ALL_TWEAKS rows of one result key; True if any primary
+        row was written.
+        
+        data: value name -> data replacing the table's, for the methods
+        that take a parameter (frames, on/off)
+        """
+        data = data or {}
+        rows = [row[:5] + (data.get(row[3], row[5]), row[6])
+                for row in self._ALL_TWEAKS if row[0] == result_key]
+        success = False
+        for (hive, key_path), group in itertools.groupby(rows, key=lambda row: (row[1], row[2])):
+            group = list(group)
+            try:
+                written = self._with_key(
+                    key_path, lambda key: self._write_rows(key, group, None), hive)
+            except OSError:
+                continue
+            success = success or any(primary for *_, primary in written)
+        return success
+    
+    def _apply_all_optimizations(self) -> Dict[str, bool]:
         results = {}
         # Basic optimizations
-        results['cuda_env'] = bool(self.set_cuda_environment())
-        results['physx'] = self.force_physx_dedicated_gpu()
-        results['gpu_preference'] = self.set_gpu_preference_global()
-        results['hw_accel'] = self.enable_hardware_acceleration()
-        results['power_mgmt'] = self.set_gpu_power_management(prefer_max_performance=True)
-        # Advanced NVIDIA optimizations
-        print("\n[NVIDIA ADV] Applying advanced optimizations...")
-        results['prerendered_frames'] = self.set_prerendered_frames(1)
-        results['shader_cache'] = self.set_shader_cache_unlimited()
-        results['p2_state'] = self.disable_cuda_p2_state()
-        results['dpc_per_core'] = self.enable_dpc_per_core()
-        results['aspm'] = self.disable_gpu_aspm()
-        results['texture_filter'] = self.set_texture_filtering_performance()
-        results['triple_buffer'] = self.disable_triple_buffering()
-        results['preemption'] = self.disable_gpu_preemption()
-        results['threaded_opt'] = self.set_threaded_optimization(True)
-        success_count = sum(results.values())
-        print(f"\n[CUDA] Result: {success_count}/{len(results)} optimizations applied")
+        results['cuda_env'] = bool(self.set_cuda_environment(broadcast=False))
+        if not self.is_admin:
+            # Everything below writes HKLM - skip it in one step
+            self._log("[CUDA] ✗ Registry optimizations require administrator privileges")
+            results.update(dict.fromkeys(self._TWEAK_RESULTS, False))
+            return results
+        
+        # All registry tweaks, one key open per (hive, key path)
+        self._log("\n[NVIDIA ADV] Applying registry optimizations...")
+        tweak_results = dict.fromkeys(self._TWEAK_RESULTS, False)
+        
+        # Skip tweaks a previous run applied that are still in place
+        fingerprint = self._state_fingerprint()
+        saved = self._load_state(fingerprint)
+        skipped = self._still_applied([k for k, done in saved.items()
+                                       if done and k in self._TWEAK_RESULTS]) if saved else set()
+        for result_key in skipped:
+            tweak_results[result_key] = True
+        
+        rows = sorted((row for row in self._ALL_TWEAKS if row[0] not in skipped),
+                      key=lambda row: (row[1], row[2]))
+        # Originals are only recorded until the undo file exists
+        undo = None if UNDO_PATH.exists() else {}
+        for (hive, key_path), group in itertools.groupby(rows, key=lambda row: (row[1], row[2])):
+            key_undo = None if undo is None else undo.setdefault((hive, key_path), [])
+            group = list(group)
+            try:
+                written = self._with_key(
+                    key_path, lambda key: self._write_rows(key, group, key_undo), hive)
+            except OSError:
+                continue
+            for result_key, *_, primary in written:
+                if primary:
+                    tweak_results[result_key] = True
+        
+        for result_key, success in tweak_results.items():
+            applied_key, applied_value, label = self._TWEAK_RESULTS[result_key]
+            if success:
+                if result_key not in skipped:
+                    self._log(f"[NVIDIA ADV] ✓ {label}")
+                if applied_key:
+                    self.applied_changes[applied_key] = applied_value
+        if skipped:
+            self._log(f"[NVIDIA ADV] ✓ {len(skipped)} optimizations already in effect (skipped)")
+        
+        if undo:
+            self._write_undo_file(undo)
+        self._save_state(fingerprint, tweak_results)
+        # An explicit apply hands every applied tweak back to the watch
+        self._tweaks_applied = {k for k, success in tweak_results.items() if success}
+        self._tweak_reverts.clear()
+        results.update(tweak_results)
+        
         if self.nvidia_available:
-            temp = self.get_gpu_temp()
-            print(f"[CUDA] GPU Temp: {temp}°C | Thermal Threshold: {self.thermal_threshold}°C")
+            results['app_clocks'] = self.set_persistence_and_pin_clocks()
         return results
     
     def get_status(self) -> Dict[str, any]:
@@ -363,19 +1369,59 @@ class CUDAOptimizer:
             status['gpu_temp'] = self.get_gpu_temp()
             status['power_limit'] = self.get_gpu_power_limit()
         return status
+    
+    def close(self):
+        """
+        Stop the background watchers, undo the power limit and application
+        clocks changes this process made, and release NVML and cached
+        registry handles
+        """
+        self.stop_thermal_monitor()
+        self.stop_registry_watch()
+        if self.thermal_throttle_active and self._pl_default:
+            # Don't leave the reduced limit behind (it would become the next default)
+            self.set_gpu_power_limit(self._pl_default)
+        if self._app_clocks_pinned or self._app_clocks_lowered:
+            # Application clocks outlive the process in the driver
+            try:
+                pynvml.nvmlDeviceResetApplicationsClocks(self.gpu_handle)
+                self._app_clocks_pinned = None
+                self._app_clocks_lowered = False
+            except pynvml.NVMLError as e:
+                self._log(f"[CUDA] ⚠ Could not reset application clocks: {e}")
+        self.close_keys()
+        if self.nvidia_available:
+            self.nvidia_available = False
+            self.gpu_handle = None
+            self._nvml_direct = False
+            try:
+                pynvml.nvmlShutdown()
+            except pynvml.NVMLError:
+                pass
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
 
 
 # Singleton
 _instance = None
+_instance_lock = threading.Lock()
 
 def get_optimizer() -> CUDAOptimizer:
     global _instance
     if _instance is None:
-        _instance = CUDAOptimizer()
+        # Locked: two racing first calls would both run nvmlInit
+        with _instance_lock:
+            if _instance is None:
+                _instance = CUDAOptimizer()
+                atexit.register(_instance.close)
     return _instance
 
 
 if __name__ == "__main__":
-    optimizer = CUDAOptimizer()
-    print("Status:", optimizer.get_status())
-    optimizer.apply_all_optimizations()
+    with CUDAOptimizer() as optimizer:
+        print("Status:", optimizer.get_status())
+        optimizer.apply_all_optimizations()
@@ -4,9 +4,14 @@ Real-time visual dashboard with security shield and system monitoring.
 Includes hardware stats, security scanner status, and telemetry blocker info.
 
 Design Decisions:
-  - Rich Live with refresh_per_second=4 for smooth updates
-  - Ping runs in background thread to prevent UI freezing
-  - Process priority scanning cached every 30s (expensive operation)
+  - Rich Live repaints only when a new frame is pushed (no auto-refresh);
+    frames are pushed every second so the clock and resizes stay current
+  - Stats collection interval adapts to CPU load variance (slower when stable)
+  - Ping, process priority scan and stats collection run in background
+    threads to prevent UI freezing
+  - Collection and rendering pause while the console window is minimized
+  - Slow metrics polled in tiers; priority scan every 30s on its own thread
+  - Intel iGPU found via the display class registry key (WMI only as fallback)
   - All panel builders wrapped in try/except for crash resistance
   - Security scanner and telemetry blocker integrated via services dict
 
@@ -14,9 +19,17 @@ Target Hardware: Intel Core i5-11300H (Tiger Lake)
 """
 import os
 import io
+import re
 import sys
+import ctypes
 import psutil
 import time
+import bisect
+import socket
+import statistics
+import winreg
+from collections import Counter, deque
+import functools
 import threading
 import subprocess
 from rich.console import Console
@@ -25,11 +38,173 @@ from rich.panel import Panel
 from rich.table import Table
 from rich.live import Live
 from rich.align import Align
+from dataclasses import dataclass, replace
 from datetime import datetime
+from typing import Optional
 from modules import temperature_service
 
+
+# Display adapter device class (one numbered subkey per adapter)
+DISPLAY_CLASS_KEY = r"SYSTEM\CurrentControlSet\Control\Class\{4d36e968-e325-11ce-bfc1-08002be10318}"
+
+# PCI vendor ID of Intel adapters
+INTEL_VENDOR_ID = "ven_8086"
+
+# Latency probe: TCP handshake to a public DNS resolver (no process spawn)
+PING_HOST = ("8.8.8.8", 53)
+PING_TIMEOUT = 1.0
+PING_INTERVAL = 20
+
+# Round-trip time in ping.exe output ("time=12ms", "tempo=9ms", "time<1ms")
+PING_TIME_RE = re.compile(r'(?:time|tempo)[=<]\s*(\d+)\s*ms', re.IGNORECASE)
+
+
+def _find_intel_adapter():
+    """Intel display adapter name from the registry, or None if absent.
+    
+    Reads DriverDesc/MatchingDeviceId straight from the display class key -
+    microseconds, versus the seconds a WMI/COM query can take at startup.
+    """
+    with winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE, DISPLAY_CLASS_KEY) as class_key:
+        i = 0
+        while True:
+            try:
+                subkey = winreg.EnumKey(class_key, i)
+            except OSError:
+                return None
+            i += 1
+            if not subkey.isdigit():
+                continue  # "Properties" and similar non-adapter subkeys
+            try:
+                with winreg.OpenKey(class_key, subkey) as adapter_key:
+                    device_id, _ = winreg.QueryValueEx(adapter_key, "MatchingDeviceId")
+                    if INTEL_VENDOR_ID in str(device_id).lower():
+                        name, _ = winreg.QueryValueEx(adapter_key, "DriverDesc")
+                        return name
+            except OSError:
+                continue
+
+
+@dataclass(slots=True)
+class DashboardStats:
+    """Values shown by the dashboard (collector writes, render thread reads)"""
+    cpu_percent: float = 0
+    cpu_cores: tuple = ()
+    cpu_temp: float = 0
+    cpu_freq: float = 0
+    cpu_freq_ghz: float = 0
+    cpu_freq_max_ghz: float = 0
+    cpu_limit: int = 80
+    gpu_nvidia_name: str = ''
+    gpu_nvidia_percent: int = 0
+    gpu_nvidia_temp: float = 0
+    gpu_nvidia_mem_used: float = 0
+    gpu_nvidia_mem_total: float = 0
+    gpu_nvidia_clock_mhz: int = 0
+    gpu_nvidia_power_limit: int = 0  # Applied power limit
+    gpu_intel_name: str = ''
+    ram_used: float = 0
+    ram_total: float = 0
+    ram_percent: float = 0
+    ram_cleanups: int = 0
+    priority_high: int = 0
+    priority_low: int = 0
+    ping_ms: int = 0
+    ping_baseline: int = 0
+    auto_mode: str = 'NORMAL'
+    auto_avg_cpu: float = 0
+    shield_status: Optional[tuple] = None  # (emoji, color, label) from the scanner
+    security_threats: int = 0
+    security_processes: int = 0
+    security_connections: int = 0
+    security_status: str = 'idle'
+    security_last_scan: Optional[datetime] = None
+    privacy_score: int = 0
+    blocked_domains: Optional[int] = None  # None until the telemetry blocker reports
+    telemetry_status: str = 'idle'
+
+
+# Progress bar width in characters (each char = 5%)
+BAR_WIDTH = 20
+
+
+def _bar_markup(filled: int, color: str) -> str:
+    """Rich markup for a bar with `filled` of BAR_WIDTH cells"""
+    return f"[{color}]{'█' * filled}{'░' * (BAR_WIDTH - filled)}[/{color}]"
+
+
+# Every bar the panels draw (21 fill levels x bar colors), built at import
+_BARS = {
+    (filled, color): _bar_markup(filled, color)
+    for filled in range(BAR_WIDTH + 1)
+    for color in ('green', 'yellow', 'red', 'cyan')
+}
+
+
 class Dashboard:
-    def __init__(self):
+    # Priority classes counted by the footer, built once
+    HIGH_PRIOS = frozenset({psutil.HIGH_PRIORITY_CLASS, psutil.REALTIME_PRIORITY_CLASS,
+                            psutil.ABOVE_NORMAL_PRIORITY_CLASS})
+    LOW_PRIOS = frozenset({psutil.IDLE_PRIORITY_CLASS, psutil.BELOW_NORMAL_PRIORITY_CLASS})
+    
+    # Color/label ladders, indexed with bisect instead of if/elif chains.
+    # bisect_right on (a, b) gives 0 for x < a, 1 for a <= x < b, 2 for x >= b;
+    # bisect_left is used where the original test was "x > a".
+    _LOAD_THRESHOLDS = (50, 80)               # CPU total and per-core %
+    _LOAD_COLORS = ('green', 'yellow', 'red')
+    _LOAD_DESCS = ('[LIGHT]', '[MODERATE]', '[HEAVY]')
+    _CPU_TEMP_THRESHOLDS = (60, 75, 85)
+    _CPU_TEMP_COLORS = ('cyan', 'green', 'yellow', 'red')
+    _CPU_TEMP_DESCS = ('❄️ COOL', '✅ GOOD', '⚠️ WARM', '🔥 HOT')
+    _TURBO_THRESHOLDS = (70, 90)              # bisect_left
+    _TURBO_COLORS = ('red', 'yellow', 'green')
+    _GPU_LOAD_THRESHOLDS = (60, 90)
+    _GPU_LOAD_DESCS = ('[IDLE]', '[GAME]', '[MAX]')
+    _GPU_CLOCK_THRESHOLDS = (1.0, 1.5)        # GHz, bisect_left
+    _GPU_CLOCK_COLORS = ('cyan', 'yellow', 'green')
+    _VRAM_THRESHOLDS = (60, 85)
+    _RAM_THRESHOLDS = (70, 85)
+    _PING_THRESHOLDS = (50, 100)
+    _PRIVACY_THRESHOLDS = (50, 80)
+    _PRIVACY_COLORS = ('red', 'yellow', 'green')
+    _PRIVACY_ICONS = ('🔴', '🟡', '🟢')
+    
+    # Auto-profiler mode styling (header + memory panel)
+    _MODE_COLORS = {'ACTIVE': 'cyan', 'IDLE': 'green'}
+    _MODE_ICONS = {'ACTIVE': '⚡', 'IDLE': '🌿'}
+    
+    # Per-core grid: cores per row, and load (%) above which a core shows ⚡
+    CORES_PER_ROW = 4
+    TURBO_CORE_LOAD = 20
+    
+    # Seconds between stats collections / dashboard frames (starting value;
+    # backs off while CPU load is stable, speeds up while it swings)
+    REFRESH_INTERVAL = 3
+    MIN_REFRESH_INTERVAL = 1
+    MAX_REFRESH_INTERVAL = 10
+    STABLE_CPU_STDDEV = 2       # CPU % stddev below this -> interval * 1.5
+    BUSY_CPU_STDDEV = 10        # CPU % stddev above this -> interval / 2
+    
+    # Seconds between stats collections while the console is minimized
+    HIDDEN_INTERVAL = 15
+    
+    # Seconds between frames: the header clock, footer uptime and terminal
+    # resizes repaint this often whatever the collection interval
+    FRAME_INTERVAL = 1
+    
+    # Tiered polling: refresh each metric at most every N seconds (monotonic
+    # deadlines, so the adaptive interval does not stretch them further)
+    # CPU load and RAM refresh every collection; GPU name is read once at init
+    GPU_UTIL_PERIOD = 6
+    TEMP_PERIOD = 9
+    GPU_MEM_PERIOD = 15
+    
+    # Seconds between process priority scans (own thread, not a tick tier)
+    PRIORITY_SCAN_INTERVAL = 30
+    
+    def __init__(self, hidden_interval=None):
+        """hidden_interval: seconds between stats collections while the
+        console window is minimized (default HIDDEN_INTERVAL)"""
         self.console = Console()
         self.running = False
         
@@ -38,7 +213,7 @@ class Dashboard:
             'total_ram_cleaned_mb': 0,
             'total_cleanups': 0,
             'uptime_seconds': 0,
-            'start_time': time.time()
+            'start_ns': time.monotonic_ns()  # Monotonic: immune to clock adjustments
         }
         
         # Background ping thread (prevents UI freeze)
@@ -47,10 +222,31 @@ class Dashboard:
         self._ping_thread = None
         self._ping_running = False
         
-        # Cached process priority (updated every 30s, not every frame)
+        # Cached process priority (background thread, every PRIORITY_SCAN_INTERVAL)
         self._cached_priority_high = 0
         self._cached_priority_low = 0
-        self._priority_cache_time = 0
+        self._priority_running = False
+        
+        # Tier name -> time.monotonic() at which it is next due
+        self._tier_deadlines = {}
+        
+        # Background stats collector; render thread only reads under the lock
+        self._stats_lock = threading.Lock()
+        self._collector_thread = None
+        self._collector_stop = threading.Event()
+        self._collector_wake = threading.Event()
+        self._interval = self.REFRESH_INTERVAL
+        self._recent_cpu = deque(maxlen=8)
+        self.hidden_interval = hidden_interval or self.HIDDEN_INTERVAL
+        
+        # Last rendered signature per body panel (skip unchanged rebuilds)
+        self._panel_sigs = {}
+        
+        # Footer shape never changes; built once, live cells updated in place
+        self._footer_table = self._build_footer_table()
+        self._footer_panel = Panel(self._footer_table, border_style="yellow")
+        self._footer_uptime = None  # uptime_seconds shown in the panel title
+        self._footer_args = {}  # (row, col) -> last format arguments
         
         # Layout configuration
         self.layout = Layout()
@@ -68,35 +264,13 @@ class Dashboard:
         )
         
         # Dados para exibir
-        self.stats = {
-            'cpu_percent': 0,
-            'cpu_temp': 0,
-            'cpu_freq': 0,
-            'cpu_limit': 80,
-            'gpu_nvidia_name': '',
-            'gpu_nvidia_percent': 0,
-            'gpu_nvidia_temp': 0,
-            'gpu_nvidia_mem_used': 0,
-            'gpu_nvidia_mem_total': 0,
-            'gpu_nvidia_clock_mhz': 0,
-            'gpu_nvidia_power_limit': 0,  # Applied power limit
-            'gpu_intel_name': '',
-            'ram_used': 0,
-            'ram_total': 0,
-            'ram_percent': 0,
-            'ram_cleanups': 0,
-            'priority_high': 0,
-            'priority_low': 0,
-            'ping_ms': 0,
-            'ping_baseline': 0,
-            'cpu_freq_ghz': 0,
-            'cpu_freq_max_ghz': 0
-        }
+        self.stats = DashboardStats()
         
         # Detect GPUs
         self.has_nvidia = False
         self.has_intel = False
         self.nvidia_handle = None
+        self._nvml_reads = None  # (utilization, clock, temperature, memory) bound to the handle
         
         # Tenta detectar NVIDIA (geralmente é o device 0)
         try:
@@ -113,26 +287,46 @@ class Dashboard:
                 if isinstance(name, bytes):
                     name = name.decode('utf-8')
                 
-                self.stats['gpu_nvidia_name'] = name
+                self.stats.gpu_nvidia_name = name
                 self.has_nvidia = True
                 print(f"[GPU] NVIDIA detected: {name}")
+                
+                # Bind the per-tick reads to the handle once (no per-call
+                # module/attribute lookups in update_stats)
+                handle = self.nvidia_handle
+                self._nvml_reads = (
+                    functools.partial(pynvml.nvmlDeviceGetUtilizationRates, handle),
+                    functools.partial(pynvml.nvmlDeviceGetClockInfo, handle, pynvml.NVML_CLOCK_GRAPHICS),
+                    functools.partial(pynvml.nvmlDeviceGetTemperature, handle, pynvml.NVML_TEMPERATURE_GPU),
+                    functools.partial(pynvml.nvmlDeviceGetMemoryInfo, handle),
+                )
+                
+                # Total VRAM is fixed; later ticks only read usage
+                try:
+                    self.stats.gpu_nvidia_mem_total = self._nvml_reads[3]().total / 1024 / 1024
+                except Exception:
+                    pass
         except Exception as e:
             print(f"[GPU] NVIDIA not detected: {e}")
         
-        # Detect Intel integrated GPU via WMI (CACHED at init - no per-frame calls)
+        # Detect Intel integrated GPU (CACHED at init - no per-frame calls)
+        # Registry first; WMI only if the registry read fails
         self._cached_intel_name = "Intel Integrated Graphics"
         try:
-            import wmi
-            c = wmi.WMI()
-            for gpu in c.Win32_VideoController():
-                if 'intel' in gpu.Name.lower():
-                    self.has_intel = True
-                    self.stats['gpu_intel_name'] = gpu.Name
-                    self._cached_intel_name = gpu.Name
-                    print(f"[GPU] Intel detected: {gpu.Name}")
-                    break
-        except Exception as e:
-            print(f"[GPU] Intel not detected: {e}")
+            name = _find_intel_adapter()
+            if name:
+                self.has_intel = True
+                self.stats.gpu_intel_name = name
+                self._cached_intel_name = name
+                print(f"[GPU] Intel detected: {name}")
+            else:
+                print("[GPU] Intel not detected")
+        except Exception:
+            self._detect_intel_wmi()
+        
+        # Memory panel shape depends only on has_nvidia: build it once
+        self._mem_table = self._build_memory_table()
+        self._mem_panel = Panel(self._mem_table, title="[bold]💾  Memory & Status[/bold]", border_style="green")
         
         # Get temperature service singleton
         self._temp_service = temperature_service.get_service()
@@ -143,6 +337,25 @@ class Dashboard:
             self._cpu_max_ghz = freq.max / 1000 if freq and freq.max else 0
         except:
             self._cpu_max_ghz = 0
+        
+        # Prime psutil's CPU counters so the first non-blocking read has a
+        # baseline; the dashboard refresh sleep provides the delta window
+        psutil.cpu_percent(interval=None, percpu=True)
+    
+    def _detect_intel_wmi(self):
+        """Fallback Intel iGPU detection via WMI (slow COM path)"""
+        try:
+            import wmi
+            c = wmi.WMI()
+            for gpu in c.Win32_VideoController():
+                if 'intel' in gpu.Name.lower():
+                    self.has_intel = True
+                    self.stats.gpu_intel_name = gpu.Name
+                    self._cached_intel_name = gpu.Name
+                    print(f"[GPU] Intel detected: {gpu.Name}")
+                    break
+        except Exception as e:
+            print(f"[GPU] Intel not detected: {e}")
     
     def make_header(self):
         """Creates header with title, mode, and security shield status.
@@ -158,12 +371,11 @@ class Dashboard:
             current_time = datetime.now().strftime("%H:%M:%S")
             
             # Auto-profiler mode
-            mode_text = self.stats.get('auto_mode', 'NORMAL')
-            mode_colors = {'ACTIVE': 'cyan', 'IDLE': 'green'}
-            mode_color = mode_colors.get(mode_text, 'cyan')
+            mode_text = self.stats.auto_mode
+            mode_color = self._MODE_COLORS.get(mode_text, 'cyan')
             
             # Security shield status
-            shield = self.stats.get('shield_status', ('--', 'white', 'IDLE'))
+            shield = self.stats.shield_status or ('--', 'white', 'IDLE')
             shield_emoji, shield_color, shield_label = shield
             
             # Build header as a single non-wrapping Text object
@@ -194,45 +406,30 @@ class Dashboard:
         
         # CPU - Pedagogical Colors
         # Usage
-        cpu_usage = self.stats['cpu_percent']
-        if cpu_usage < 50:
-            cpu_color = "green"
-            cpu_desc = "[LIGHT]"
-        elif cpu_usage < 80:
-            cpu_color = "yellow"
-            cpu_desc = "[MODERATE]"
-        else:
-            cpu_color = "red"
-            cpu_desc = "[HEAVY]"
+        cpu_usage = self.stats.cpu_percent
+        level = bisect.bisect_right(self._LOAD_THRESHOLDS, cpu_usage)
+        cpu_color = self._LOAD_COLORS[level]
+        cpu_desc = self._LOAD_DESCS[level]
         
         cpu_bar = self._make_bar(cpu_usage, 100, cpu_color)
         
         # Temp
-        cpu_temp = self.stats['cpu_temp']
+        cpu_temp = self.stats.cpu_temp
         temp_display = f"{cpu_temp:.0f}°C" if cpu_temp > 0 else "N/A"
         
-        if cpu_temp < 60:
-            cpu_t_color = "cyan"
-            cpu_t_desc = "❄️ COOL"
-        elif cpu_temp < 75:
-            cpu_t_color = "green"
-            cpu_t_desc = "✅ GOOD"
-        elif cpu_temp < 85:
-            cpu_t_color = "yellow"
-            cpu_t_desc = "⚠️ WARM" 
-        else:
-            cpu_t_color = "red"
-            cpu_t_desc = "🔥 HOT"
+        level = bisect.bisect_right(self._CPU_TEMP_THRESHOLDS, cpu_temp)
+        cpu_t_color = self._CPU_TEMP_COLORS[level]
+        cpu_t_desc = self._CPU_TEMP_DESCS[level]
 
         freq_color = "cyan"
         
         # CPU frequency
-        current_ghz = self.stats.get('cpu_freq_ghz', 0)
-        max_ghz = self.stats.get('cpu_freq_max_ghz', 0)
+        current_ghz = self.stats.cpu_freq_ghz
+        max_ghz = self.stats.cpu_freq_max_ghz
         if current_ghz > 0:
             if max_ghz > 0:
                 turbo_pct = (current_ghz / max_ghz) * 100
-                freq_color = 'green' if turbo_pct > 90 else 'yellow' if turbo_pct > 70 else 'red'
+                freq_color = self._TURBO_COLORS[bisect.bisect_left(self._TURBO_THRESHOLDS, turbo_pct)]
                 freq_display = f"[{freq_color}]{current_ghz:.2f} GHz[/{freq_color}] / {max_ghz:.2f} GHz"
             else:
                 freq_display = f"[cyan]{current_ghz:.2f} GHz[/cyan]"
@@ -243,40 +440,24 @@ class Dashboard:
         table.add_row("  Total Load", f"[{cpu_color}]{cpu_usage:.1f}% {cpu_desc}[/{cpu_color}] {cpu_bar}")
         table.add_row("  Frequency", freq_display)
         table.add_row("  Package Temp", f"[{cpu_t_color}]{temp_display} {cpu_t_desc}[/{cpu_t_color}]")
-        table.add_row("  Governor Cap", f"[yellow]{self.stats['cpu_limit']}%[/yellow] (Smart Limit)")
+        table.add_row("  Governor Cap", f"[yellow]{self.stats.cpu_limit}%[/yellow] (Smart Limit)")
         table.add_row("", "")
         
         # === ACTIVE PER-CORE MONITORING (COMPACT) ===
-        cores_usage = psutil.cpu_percent(percpu=True)
-        try:
-            cores_freq = psutil.cpu_freq(percpu=True)
-        except:
-            cores_freq = []
-            
+        cores_usage = self.stats.cpu_cores
+        
         table.add_row("[bold white]Active Cores[/bold white]", "[dim]Real-Time Utilization[/dim]")
         
-        # Grid Display: 4 Cores per row (Compact)
-        row_str = ""
-        for i, u in enumerate(cores_usage):
-            # Color logic
-            c_color = "green" if u < 50 else "yellow" if u < 80 else "red"
-            
-            # Turbo Logic
-            turbo = "⚡" if u > 20 else " "
-            
-            # Format: C0: 12%⚡   (No bars)
-            core_str = f"C{i}:[{c_color}]{u:3.0f}%{turbo}[/{c_color}]  "
-            
-            row_str += core_str
-            
-            # Break line every 4 cores
-            if (i + 1) % 4 == 0:
-                table.add_row("", row_str)
-                row_str = ""
-        
-        # Add remaining cores if any
-        if row_str:
-             table.add_row("", row_str)
+        # Grid Display: CORES_PER_ROW cores per row (Compact)
+        # Format: C0: 12%⚡   (No bars)
+        colors, thresholds = self._LOAD_COLORS, self._LOAD_THRESHOLDS
+        cells = [
+            f"C{i}:[{c}]{u:3.0f}%{'⚡' if u > self.TURBO_CORE_LOAD else ' '}[/{c}]  "
+            for i, u in enumerate(cores_usage)
+            for c in (colors[bisect.bisect_right(thresholds, u)],)
+        ]
+        for start in range(0, len(cells), self.CORES_PER_ROW):
+            table.add_row("", "".join(cells[start:start + self.CORES_PER_ROW]))
 
         table.add_row("", "")
         
@@ -291,42 +472,36 @@ class Dashboard:
         # 1. NVIDIA (Dedicated)
         if self.has_nvidia:
             # Usage
-            usage = self.stats['gpu_nvidia_percent']
-            if usage < 60:
-                gpu_color = "green"
-                usage_desc = "[IDLE]"
-            elif usage < 90:
-                gpu_color = "yellow"
-                usage_desc = "[GAME]"
-            else:
-                gpu_color = "red"
-                usage_desc = "[MAX]"
+            usage = self.stats.gpu_nvidia_percent
+            level = bisect.bisect_right(self._GPU_LOAD_THRESHOLDS, usage)
+            gpu_color = self._LOAD_COLORS[level]
+            usage_desc = self._GPU_LOAD_DESCS[level]
             
             gpu_bar = self._make_bar(usage, 15, gpu_color) # Smaller bar
             
             # Temp
-            temp = self.stats['gpu_nvidia_temp']
+            temp = self.stats.gpu_nvidia_temp
             temp_desc = "NORMAL"
             if temp > 80: temp_desc = "HOT"
             
             # Limpa o nome redundante (remove 'NVIDIA ' se já tiver no inicio)
-            gpu_name = self.stats['gpu_nvidia_name'].replace("NVIDIA ", "")
+            gpu_name = self.stats.gpu_nvidia_name.replace("NVIDIA ", "")
             
             # GPU Clock speed
-            clock_mhz = self.stats.get('gpu_nvidia_clock_mhz', 0)
+            clock_mhz = self.stats.gpu_nvidia_clock_mhz
             clock_str = f"{clock_mhz} MHz" if clock_mhz > 0 else "N/A"
             clock_ghz = clock_mhz / 1000 if clock_mhz > 0 else 0
-            clk_color = "green" if clock_ghz > 1.5 else "yellow" if clock_ghz > 1.0 else "cyan"
+            clk_color = self._GPU_CLOCK_COLORS[bisect.bisect_left(self._GPU_CLOCK_THRESHOLDS, clock_ghz)]
             
             # VRAM usage
-            vram_used = self.stats['gpu_nvidia_mem_used']
-            vram_total = self.stats.get('gpu_nvidia_mem_total', 0)
+            vram_used = self.stats.gpu_nvidia_mem_used
+            vram_total = self.stats.gpu_nvidia_mem_total
             vram_pct = (vram_used / vram_total * 100) if vram_total > 0 else 0
-            vram_color = "green" if vram_pct < 60 else "yellow" if vram_pct < 85 else "red"
+            vram_color = self._LOAD_COLORS[bisect.bisect_right(self._VRAM_THRESHOLDS, vram_pct)]
             
             table.add_row(f"[cyan]NVIDIA[/cyan] {gpu_name[:20]}", "")
-            table.add_row(f"  Load: [{gpu_color}]{usage:3.0f}%{usage_desc}[/{gpu_color}]", f"Temp: [{gpu_color}]{temp:.0f}°C[/]")
-            table.add_row(f"  Clock: [{clk_color}]{clock_str}[/{clk_color}]", f"Limit: {self.stats['gpu_nvidia_power_limit']}%")
+            table.add_row(f"  Load: [{gpu_color}]{usage:3.0f}%{usage_desc}[/{gpu_color}]", f"Temp: [{gpu_color}]{temp:.0f}°C[/]" if temp > 0 else "Temp: [dim]N/A[/dim]")
+            table.add_row(f"  Clock: [{clk_color}]{clock_str}[/{clk_color}]", f"Limit: {self.stats.gpu_nvidia_power_limit}%")
             table.add_row(f"  VRAM: [{vram_color}]{vram_used:.0f}/{vram_total:.0f} MB ({vram_pct:.0f}%)[/{vram_color}]", "")
         
         # 2. Intel (Integrated)
@@ -342,23 +517,23 @@ class Dashboard:
              
         return Panel(table, title="[bold]🖥️  HARDWARE MONITOR[/bold]", border_style="cyan")
     
-    def make_memory_panel(self):
-        """Memory and Status Panel"""
+    def _build_memory_table(self):
+        """Build the memory panel once (its shape only depends on has_nvidia);
+        make_memory_panel rewrites the value cells recorded in _mem_rows"""
         table = Table(show_header=False, box=None, padding=(0, 1))
         table.add_column("Metric", style="cyan", width=18)
         table.add_column("Value", justify="right")
+        rows = {}
         
-        # RAM
-        ram_color = "green" if self.stats['ram_percent'] < 70 else "yellow" if self.stats['ram_percent'] < 85 else "red"
-        ram_bar = self._make_bar(self.stats['ram_percent'], 100, ram_color)
-        
-        ram_free_gb = (self.stats['ram_total'] - self.stats['ram_used']) / 1024
-        ram_total_gb = self.stats['ram_total'] / 1024
+        def live_row(key, label=""):
+            rows[key] = table.row_count
+            table.add_row(label, "")
         
+        # RAM
         table.add_row("[bold white]RAM MEMORY[/bold white]", "")
-        table.add_row("  Usage", f"[{ram_color}]{self.stats['ram_percent']:.1f}%[/{ram_color}] {ram_bar}")
-        table.add_row("  Free", f"[green]{ram_free_gb:.1f} GB[/green] / {ram_total_gb:.1f} GB")
-        table.add_row("  Cleanups", f"[yellow]{self.stats_tracker.get('total_cleanups', 0)}[/yellow] auto")
+        live_row('usage', "  Usage")
+        live_row('free', "  Free")
+        live_row('cleanups', "  Cleanups")
         table.add_row("", "")
         
         # CUDA / GPU Features
@@ -368,13 +543,7 @@ class Dashboard:
             table.add_row("  Pre-Rendered", "[green]●[/green] 1 frame")
             table.add_row("  Shader Cache", "[green]●[/green] Unlimited")
             table.add_row("  ASPM", "[red]●[/red] Disabled")
-            
-            # Thermal throttle status
-            gpu_temp = self.stats.get('gpu_nvidia_temp', 0)
-            if gpu_temp >= 83:
-                table.add_row("  Thermal", f"[red]⚠️ THROTTLE ({gpu_temp:.0f}°C)[/red]")
-            else:
-                table.add_row("  Thermal", f"[green]✓[/green] OK ({gpu_temp:.0f}°C)")
+            live_row('gpu_thermal', "  Thermal")
             table.add_row("", "")
         
         # Optimizations Status
@@ -387,38 +556,78 @@ class Dashboard:
         table.add_row("", "")
         
         # CPU Thermal Status
-        cpu_temp = self.stats.get('cpu_temp', 0)
-        if cpu_temp >= 85:
-            table.add_row("  CPU Thermal", f"[red]⚠️ THROTTLE ({cpu_temp:.0f}°C)[/red]")
-        else:
-            table.add_row("  CPU Thermal", f"[green]✓[/green] OK")
+        live_row('cpu_thermal', "  CPU Thermal")
         
         # NovaPulse Features
         table.add_row("[bold white]NOVAPULSE[/bold white]", "")
-        
-        # Auto-Profiler Mode
-        auto_mode = self.stats.get('auto_mode', 'NORMAL')
-        avg_cpu = self.stats.get('auto_avg_cpu', 0)
-        mode_icons = {'ACTIVE': '⚡', 'IDLE': '🌿'}
-        mode_colors = {'ACTIVE': 'cyan', 'IDLE': 'green'}
-        mode_icon = mode_icons.get(auto_mode, '🔄')
-        mode_color = mode_colors.get(auto_mode, 'cyan')
-        table.add_row(f"  {mode_icon} Auto Mode", f"[{mode_color}]{auto_mode}[/{mode_color}] (CPU: {avg_cpu:.0f}%)")
-        
-
+        live_row('auto_mode')  # label carries the mode icon
         
         # Network QoS
         table.add_row("  📡 Network QoS", "[green]●[/green] Active")
         
-        return Panel(table, title="[bold]💾  Memory & Status[/bold]", border_style="green")
+        self._mem_rows = rows
+        return table
     
-    def make_footer(self):
-        """Footer: Dynamic Infographic — What it did + What it's doing now"""
-        uptime = self.stats_tracker.get('uptime_seconds', 0)
-        h, rem = divmod(uptime, 3600)
-        m, s = divmod(rem, 60)
-        time_str = f"{int(h):02d}:{int(m):02d}:{int(s):02d}"
+    def make_memory_panel(self):
+        """Memory and Status Panel"""
+        table = self._mem_table
+        rows = self._mem_rows
         
+        # RAM
+        ram_color = self._LOAD_COLORS[bisect.bisect_right(self._RAM_THRESHOLDS, self.stats.ram_percent)]
+        ram_bar = self._make_bar(self.stats.ram_percent, 100, ram_color)
+        
+        ram_free_gb = (self.stats.ram_total - self.stats.ram_used) / 1024
+        ram_total_gb = self.stats.ram_total / 1024
+        
+        self._set_cell(table, rows['usage'], 1, f"[{ram_color}]{self.stats.ram_percent:.1f}%[/{ram_color}] {ram_bar}")
+        self._set_cell(table, rows['free'], 1, f"[green]{ram_free_gb:.1f} GB[/green] / {ram_total_gb:.1f} GB")
+        self._set_cell(table, rows['cleanups'], 1, f"[yellow]{self.stats_tracker.get('total_cleanups', 0)}[/yellow] auto")
+        
+        # Thermal throttle status
+        # (no reading yet -> N/A, not a misleading "OK (0°C)")
+        if 'gpu_thermal' in rows:
+            gpu_temp = self.stats.gpu_nvidia_temp
+            if gpu_temp <= 0:
+                gpu_thermal = "[dim]N/A[/dim]"
+            elif gpu_temp >= 83:
+                gpu_thermal = f"[red]⚠️ THROTTLE ({gpu_temp:.0f}°C)[/red]"
+            else:
+                gpu_thermal = f"[green]✓[/green] OK ({gpu_temp:.0f}°C)"
+            self._set_cell(table, rows['gpu_thermal'], 1, gpu_thermal)
+        
+        # CPU Thermal Status
+        cpu_temp = self.stats.cpu_temp
+        if cpu_temp <= 0:
+            cpu_thermal = "[dim]N/A[/dim]"
+        elif cpu_temp >= 85:
+            cpu_thermal = f"[red]⚠️ THROTTLE ({cpu_temp:.0f}°C)[/red]"
+        else:
+            cpu_thermal = "[green]✓[/green] OK"
+        self._set_cell(table, rows['cpu_thermal'], 1, cpu_thermal)
+        
+        # Auto-Profiler Mode
+        auto_mode = self.stats.auto_mode
+        avg_cpu = self.stats.auto_avg_cpu
+        mode_icon = self._MODE_ICONS.get(auto_mode, '🔄')
+        mode_color = self._MODE_COLORS.get(auto_mode, 'cyan')
+        self._set_cell(table, rows['auto_mode'], 0, f"  {mode_icon} Auto Mode")
+        self._set_cell(table, rows['auto_mode'], 1, f"[{mode_color}]{auto_mode}[/{mode_color}] (CPU: {avg_cpu:.0f}%)")
+        
+        return self._mem_panel
+    
+    # Footer cells that change after init: (row, column) -> format template.
+    # Templates are only formatted when their arguments change.
+    _FOOTER_CELLS = {
+        (2, 2): "[green]✓[/green] {} domains blocked",
+        (5, 0): "RAM cleaned: [green]+{:.0f}MB[/green] ({}x)",
+        (5, 1): "Priorities: [green]↑{}[/green] [yellow]↓{}[/yellow]",
+        (5, 2): "Ping: [{}]{}[/]",
+        (5, 3): "Ads blocked: [magenta]{}[/magenta]",
+    }
+    
+    def _build_footer_table(self):
+        """Build the footer table once; make_footer only rewrites its live cells"""
         table = Table(show_header=False, box=None, expand=True, padding=(0, 1))
         table.add_column("Col1", ratio=1)
         table.add_column("Col2", ratio=1)
@@ -439,20 +648,57 @@ class Dashboard:
         table.add_row(
             "[green]✓[/green] HAGS ON · CUDA optimized",
             "[green]✓[/green] C-States OFF · MMCSS Gaming",
-            f"[green]✓[/green] {self.stats.get('blocked_domains', 21)} domains blocked",
+            "",  # domains blocked (live)
             "[green]✓[/green] 37 telemetry entries blocked"
         )
         
         table.add_row("", "", "", "")
         
         # === ROW 2: What it's DOING now (live) ===
+        table.add_row(
+            "[bold yellow]LIVE STATUS[/bold yellow]",
+            "", "", ""
+        )
+        table.add_row("", "", "", "")  # live metrics
+        
+        return table
+    
+    @staticmethod
+    def _set_cell(table, row, col, value):
+        """Replace one cell of an already-built Table in place"""
+        table.columns[col]._cells[row] = value
+    
+    def _update_footer_cell(self, cell, *args):
+        """Format and store a footer cell, skipped if its arguments are unchanged"""
+        if self._footer_args.get(cell) == args:
+            return
+        self._footer_args[cell] = args
+        row, col = cell
+        self._set_cell(self._footer_table, row, col, self._FOOTER_CELLS[cell].format(*args))
+    
+    def make_footer(self):
+        """Footer: Dynamic Infographic — What it did + What it's doing now"""
+        # Read at render time: the collector may run only every 10 s
+        uptime = (time.monotonic_ns() - self.stats_tracker['start_ns']) // 1_000_000_000
+        
+        # Uptime title is only reformatted when the second changes
+        panel = self._footer_panel
+        if uptime != self._footer_uptime:
+            self._footer_uptime = uptime
+            h, rem = divmod(uptime, 3600)
+            m, s = divmod(rem, 60)
+            panel.title = f"[bold]🎯 NovaPulse Infographic • Uptime: {h:02d}:{m:02d}:{s:02d}[/bold]"
+        
+        blocked = self.stats.blocked_domains
+        self._update_footer_cell((2, 2), 21 if blocked is None else blocked)
+        
         # Live metrics
         cleaned_mb = self.stats_tracker.get('total_ram_cleaned_mb', 0)
         cleanups = self.stats_tracker.get('total_cleanups', 0)
-        hi_prio = self.stats.get('priority_high', 0)
-        lo_prio = self.stats.get('priority_low', 0)
-        ping_ms = self.stats.get('ping_ms', 0)
-        ping_baseline = self.stats.get('ping_baseline', 0)
+        hi_prio = self.stats.priority_high
+        lo_prio = self.stats.priority_low
+        ping_ms = self.stats.ping_ms
+        ping_baseline = self.stats.ping_baseline
         
         # Ping delta
         ping_str = f"{ping_ms}ms" if ping_ms > 0 else "..."
@@ -465,81 +711,90 @@ class Dashboard:
         ads_blocked = int((uptime / 60) * 100)
         ads_str = f"{ads_blocked/1000:.1f}K" if ads_blocked >= 1000 else str(ads_blocked)
         
-        table.add_row(
-            "[bold yellow]LIVE STATUS[/bold yellow]",
-            "", "", ""
-        )
-        table.add_row(
-            f"RAM cleaned: [green]+{cleaned_mb:.0f}MB[/green] ({cleanups}x)",
-            f"Priorities: [green]↑{hi_prio}[/green] [yellow]↓{lo_prio}[/yellow]",
-            f"Ping: [{('green' if ping_ms < 50 else 'yellow' if ping_ms < 100 else 'red')}]{ping_str}[/]",
-            f"Ads blocked: [magenta]{ads_str}[/magenta]"
-        )
+        self._update_footer_cell((5, 0), round(cleaned_mb), cleanups)
+        self._update_footer_cell((5, 1), hi_prio, lo_prio)
+        self._update_footer_cell((5, 2), self._LOAD_COLORS[bisect.bisect_right(self._PING_THRESHOLDS, ping_ms)], ping_str)
+        self._update_footer_cell((5, 3), ads_str)
         
-        return Panel(table, title=f"[bold]🎯 NovaPulse Infographic • Uptime: {time_str}[/bold]", border_style="yellow")
+        return panel
     
     def _make_bar(self, value, max_value, color):
-        """Creates a visual progress bar"""
-        pct = min(100, (value / max_value) * 100)
-        filled = int(pct / 5)  # 20 chars max
-        empty = 20 - filled
-        return f"[{color}]{'█' * filled}{'░' * empty}[/{color}]"
+        """Creates a visual progress bar (prebuilt per fill level and color)"""
+        pct = max(0, min(100, (value / max_value) * 100))
+        key = (int(pct / 5), color)  # 20 chars max
+        bar = _BARS.get(key)
+        return bar if bar is not None else _bar_markup(*key)
     
     def _start_ping_thread(self):
         """Start background thread for ping measurement.
-        Prevents UI freezing from subprocess.run blocking calls."""
+        Prevents UI freezing from blocking network calls."""
         if self._ping_running:
             return
         self._ping_running = True
         
         def _ping_loop():
             while self._ping_running:
-                try:
-                    result = subprocess.run(
-                        ['ping', '-n', '1', '-w', '1000', '8.8.8.8'],
-                        capture_output=True, text=True, timeout=3,
-                        encoding='utf-8', errors='ignore'
-                    )
-                    output = result.stdout.lower()
-                    if 'tempo=' in output or 'time=' in output:
-                        if 'tempo=' in output:
-                            ping_str = output.split('tempo=')[1].split('ms')[0]
-                        else:
-                            ping_str = output.split('time=')[1].split('ms')[0]
-                        self._ping_ms = int(ping_str.strip().replace('<', ''))
-                        if self._ping_baseline == 0:
-                            self._ping_baseline = self._ping_ms
-                except Exception:
-                    pass
-                time.sleep(20)  # Ping every 20 seconds
+                ms = self._probe_latency()
+                if ms is None:
+                    ms = self._ping_subprocess()
+                if ms is not None:
+                    self._ping_ms = ms
+                    if self._ping_baseline == 0:
+                        self._ping_baseline = ms
+                time.sleep(PING_INTERVAL)
         
         t = threading.Thread(target=_ping_loop, daemon=True, name='NovaPulse-Ping')
         t.start()
     
-    def _update_priority_cache(self):
-        """Update process priority count (expensive, only every 30s)."""
-        now = time.time()
-        if now - self._priority_cache_time < 30:
-            return  # Use cached values
-        self._priority_cache_time = now
+    @staticmethod
+    def _probe_latency():
+        """Round-trip latency in ms from a timed TCP connect, None on failure"""
+        try:
+            start = time.perf_counter_ns()
+            with socket.create_connection(PING_HOST, timeout=PING_TIMEOUT):
+                elapsed = time.perf_counter_ns() - start
+            return max(1, round(elapsed / 1_000_000))
+        except OSError:
+            return None
+    
+    @staticmethod
+    def _ping_subprocess():
+        """Fallback: ICMP ping.exe (e.g. outbound port 53 blocked), None on failure"""
+        try:
+            result = subprocess.run(
+                ['ping', '-n', '1', '-w', '1000', PING_HOST[0]],
+                capture_output=True, text=True, timeout=3,
+                encoding='utf-8', errors='ignore'
+            )
+            match = PING_TIME_RE.search(result.stdout)
+            return int(match.group(1)) if match else None
+        except Exception:
+            return None
+    
+    def _start_priority_thread(self):
+        """Start background thread for the process priority scan.
+        Walking every process takes hundreds of ms on Windows; keep it off
+        both the render and the stats collector threads."""
+        if self._priority_running:
+            return
+        self._priority_running = True
         
+        def _priority_loop():
+            while self._priority_running:
+                if not self._console_hidden():
+                    self._update_priority_cache()
+                time.sleep(self.PRIORITY_SCAN_INTERVAL)
+        
+        t = threading.Thread(target=_priority_loop, daemon=True, name='NovaPulse-PrioScan')
+        t.start()
+    
+    def _update_priority_cache(self):
+        """Update process priority count (expensive, only every PRIORITY_SCAN_INTERVAL)."""
         try:
-            high_count = 0
-            low_count = 0
-            HIGH_PRIOS = {psutil.HIGH_PRIORITY_CLASS, psutil.REALTIME_PRIORITY_CLASS, psutil.ABOVE_NORMAL_PRIORITY_CLASS}
-            LOW_PRIOS = {psutil.IDLE_PRIORITY_CLASS, psutil.BELOW_NORMAL_PRIORITY_CLASS}
-            
-            for p in psutil.process_iter(['nice']):
-                try:
-                    p_nice = p.info['nice']
-                    if p_nice in HIGH_PRIOS:
-                        high_count += 1
-                    elif p_nice in LOW_PRIOS:
-                        low_count += 1
-                except:
-                    pass
-            self._cached_priority_high = high_count
-            self._cached_priority_low = low_count
+            # process_iter(attrs) reads 'nice' inside oneshot() per process
+            nices = Counter(p.info['nice'] for p in psutil.process_iter(['nice']))
+            self._cached_priority_high = sum(nices[k] for k in self.HIGH_PRIOS)
+            self._cached_priority_low = sum(nices[k] for k in self.LOW_PRIOS)
         except:
             pass
     
@@ -547,115 +802,234 @@ class Dashboard:
         """Update all system statistics for dashboard display.
         
         Performance notes:
-          - CPU percent: non-blocking (interval=0)
+          - CPU percent (total + per-core): non-blocking (interval=None)
           - Ping: runs in background thread (never blocks)
-          - Process priorities: cached (updated every 30s)
+          - Slower-moving metrics are polled in tiers (see *_PERIOD);
+            until a tier is due the last values stay in self.stats
           - GPU: direct pynvml calls (fast, ~0.1ms)
+          - Values are collected into copies and published under
+            _stats_lock, so the render thread never sees a half-updated frame
         """
-        # CPU (non-blocking)
-        self.stats['cpu_percent'] = psutil.cpu_percent(interval=0)
-        
-        # CPU Temperature (centralized service with cache)
-        self.stats['cpu_temp'] = self._temp_service.get_cpu_temp()
-        
-        # CPU Frequency (current + max/turbo)
-        freq = psutil.cpu_freq()
-        if freq:
-            self.stats['cpu_freq'] = freq.current / 1000
-            self.stats['cpu_freq_ghz'] = freq.current / 1000
-            self.stats['cpu_freq_max_ghz'] = self._cpu_max_ghz if self._cpu_max_ghz > 0 else (freq.max / 1000 if freq.max else 0)
+        now = time.monotonic()
+        temps_due = self._tier_due('temp', self.TEMP_PERIOD, now)
+        
+        stats = replace(self.stats)
+        tracker = dict(self.stats_tracker)
+        
+        # CPU (non-blocking, delta since the previous tick). One per-core
+        # sample; the total is its mean, which is what psutil's system-wide
+        # figure computes from the same counters
+        cores = psutil.cpu_percent(interval=None, percpu=True)
+        stats.cpu_cores = cores
+        stats.cpu_percent = round(sum(cores) / len(cores), 1) if cores else 0
+        
+        if temps_due:
+            # CPU Temperature (centralized service with cache)
+            stats.cpu_temp = self._temp_service.get_cpu_temp()
+            
+            # CPU Frequency (current + max/turbo)
+            freq = psutil.cpu_freq()
+            if freq:
+                stats.cpu_freq = freq.current / 1000
+                stats.cpu_freq_ghz = freq.current / 1000
+                stats.cpu_freq_max_ghz = self._cpu_max_ghz if self._cpu_max_ghz > 0 else (freq.max / 1000 if freq.max else 0)
         
         # GPU NVIDIA
-        if self.has_nvidia and self.nvidia_handle:
+        if self.has_nvidia and self._nvml_reads:
+            get_util, get_clock, get_temp, get_mem = self._nvml_reads
             try:
-                import pynvml
-                util = pynvml.nvmlDeviceGetUtilizationRates(self.nvidia_handle)
-                self.stats['gpu_nvidia_percent'] = util.gpu
-                temp = pynvml.nvmlDeviceGetTemperature(self.nvidia_handle, 0)
-                self.stats['gpu_nvidia_temp'] = temp
-                mem_info = pynvml.nvmlDeviceGetMemoryInfo(self.nvidia_handle)
-                self.stats['gpu_nvidia_mem_used'] = mem_info.used / 1024 / 1024
-                self.stats['gpu_nvidia_mem_total'] = mem_info.total / 1024 / 1024
-                # GPU Clock speed (current graphics clock in MHz)
-                try:
-                    clock = pynvml.nvmlDeviceGetClockInfo(self.nvidia_handle, pynvml.NVML_CLOCK_GRAPHICS)
-                    self.stats['gpu_nvidia_clock_mhz'] = clock
-                except:
-                    pass
+                if self._tier_due('gpu_util', self.GPU_UTIL_PERIOD, now):
+                    stats.gpu_nvidia_percent = get_util().gpu
+                    # GPU Clock speed (current graphics clock in MHz)
+                    try:
+                        stats.gpu_nvidia_clock_mhz = get_clock()
+                    except:
+                        pass
+                if temps_due:
+                    stats.gpu_nvidia_temp = get_temp()
+                if self._tier_due('gpu_mem', self.GPU_MEM_PERIOD, now):
+                    stats.gpu_nvidia_mem_used = get_mem().used / 1024 / 1024
             except:
                 pass
         
         # GPU Power Limit
         if 'gpu_ctrl' in services and hasattr(services['gpu_ctrl'], 'applied_percent'):
-            self.stats['gpu_nvidia_power_limit'] = services['gpu_ctrl'].applied_percent
+            stats.gpu_nvidia_power_limit = services['gpu_ctrl'].applied_percent
         
         # RAM
         mem = psutil.virtual_memory()
-        self.stats['ram_used'] = mem.used / 1024 / 1024
-        self.stats['ram_total'] = mem.total / 1024 / 1024
-        self.stats['ram_percent'] = mem.percent
+        stats.ram_used = mem.used / 1024 / 1024
+        stats.ram_total = mem.total / 1024 / 1024
+        stats.ram_percent = mem.percent
         
         # RAM Cleaning Stats
         if 'cleaner' in services:
             if hasattr(services['cleaner'], 'total_cleaned_mb'):
-                self.stats_tracker['total_ram_cleaned_mb'] = services['cleaner'].total_cleaned_mb
-                self.stats_tracker['total_cleanups'] = services['cleaner'].clean_count
+                tracker['total_ram_cleaned_mb'] = services['cleaner'].total_cleaned_mb
+                tracker['total_cleanups'] = services['cleaner'].clean_count
             elif hasattr(services['cleaner'], 'clean_count'):
-                self.stats_tracker['total_cleanups'] = services['cleaner'].clean_count
+                tracker['total_cleanups'] = services['cleaner'].clean_count
         
         # Uptime
-        self.stats_tracker['uptime_seconds'] = int(time.time() - self.stats_tracker['start_time'])
+        tracker['uptime_seconds'] = (time.monotonic_ns() - tracker['start_ns']) // 1_000_000_000
         
-        # Process priorities (cached, updated every 30s)
-        self._update_priority_cache()
-        self.stats['priority_high'] = self._cached_priority_high
-        self.stats['priority_low'] = self._cached_priority_low
+        # Process priorities (published by the priority scan thread)
+        stats.priority_high = self._cached_priority_high
+        stats.priority_low = self._cached_priority_low
         
 
         
         # Auto-Profiler
         if 'auto_profiler' in services:
             profiler = services['auto_profiler']
-            self.stats['auto_mode'] = profiler.get_current_mode().value.upper()
-            self.stats['auto_avg_cpu'] = profiler.get_avg_cpu()
+            stats.auto_mode = profiler.get_current_mode().value.upper()
+            stats.auto_avg_cpu = profiler.get_avg_cpu()
             # Read actual CPU cap from profiler config
-            self.stats['cpu_limit'] = profiler.active_cpu_cap
+            stats.cpu_limit = profiler.active_cpu_cap
         
         # Ping (from background thread, never blocks)
-        self.stats['ping_ms'] = self._ping_ms
-        self.stats['ping_baseline'] = self._ping_baseline
+        stats.ping_ms = self._ping_ms
+        stats.ping_baseline = self._ping_baseline
         
         # Security Scanner status
         if 'security_scanner' in services:
             scanner = services['security_scanner']
-            self.stats['shield_status'] = scanner.get_shield_status()
+            stats.shield_status = scanner.get_shield_status()
             sec_status = scanner.get_status()
-            self.stats['security_threats'] = sec_status.get('threats_found', 0)
-            self.stats['security_processes'] = sec_status.get('process_count', 0)
-            self.stats['security_connections'] = sec_status.get('connection_count', 0)
-            self.stats['security_status'] = sec_status.get('status', 'idle')
-            self.stats['security_last_scan'] = sec_status.get('last_scan', None)
+            stats.security_threats = sec_status.get('threats_found', 0)
+            stats.security_processes = sec_status.get('process_count', 0)
+            stats.security_connections = sec_status.get('connection_count', 0)
+            stats.security_status = sec_status.get('status', 'idle')
+            stats.security_last_scan = sec_status.get('last_scan', None)
         
         # Telemetry Blocker status
         if 'telemetry_blocker' in services:
             blocker = services['telemetry_blocker']
             tel_status = blocker.get_status()
-            self.stats['privacy_score'] = tel_status.get('privacy_score', 0)
-            self.stats['blocked_domains'] = tel_status.get('blocked_domains', 0)
-            self.stats['telemetry_status'] = tel_status.get('status', 'idle')
+            stats.privacy_score = tel_status.get('privacy_score', 0)
+            stats.blocked_domains = tel_status.get('blocked_domains', 0)
+            stats.telemetry_status = tel_status.get('status', 'idle')
+        
+        with self._stats_lock:
+            self.stats = stats
+            self.stats_tracker = tracker
+    
+    def _tier_due(self, name, period, now):
+        """True if tier name is due at now; schedules its next deadline"""
+        if now < self._tier_deadlines.get(name, 0.0):
+            return False
+        self._tier_deadlines[name] = now + period
+        return True
     
-    def render(self, services):
-        """Renders the dashboard"""
-        self.update_stats(services)
+    def _start_collector(self, services):
+        """Start background thread that collects stats for the render loop.
+        Keeps NVML/psutil/service calls off the Rich Live thread."""
+        if self._collector_thread and self._collector_thread.is_alive():
+            return
+        self._collector_stop.clear()
+        
+        def _collect_loop():
+            while not self._collector_stop.is_set():
+                # Nobody is reading a minimized console: collect rarely
+                if self._console_hidden():
+                    interval = self.hidden_interval
+                else:
+                    try:
+                        self.update_stats(services)
+                        self._adapt_interval()
+                    except Exception:
+                        pass
+                    interval = self._interval
+                self._collector_wake.wait(interval)
+                self._collector_wake.clear()
+        
+        self._collector_thread = threading.Thread(target=_collect_loop, daemon=True,
+                                                  name='NovaPulse-DashStats')
+        self._collector_thread.start()
+    
+    def _adapt_interval(self):
+        """Back off the refresh interval while CPU load is steady,
+        tighten it while load is changing (uses the last 8 samples)"""
+        self._recent_cpu.append(self.stats.cpu_percent)
+        if len(self._recent_cpu) < 2:
+            return
+        stddev = statistics.pstdev(self._recent_cpu)
+        if stddev < self.STABLE_CPU_STDDEV:
+            self._interval = min(self.MAX_REFRESH_INTERVAL, self._interval * 1.5)
+        elif stddev > self.BUSY_CPU_STDDEV:
+            self._interval = max(self.MIN_REFRESH_INTERVAL, self._interval / 2)
+    
+    @staticmethod
+    def _console_hidden():
+        """True if this process' console window is minimized.
+        
+        Only a real (visible) conhost window can be minimized; under
+        Windows Terminal the console HWND is an invisible pseudo-window,
+        so this returns False and the dashboard keeps refreshing.
+        """
+        try:
+            hwnd = ctypes.windll.kernel32.GetConsoleWindow()
+            if not hwnd:
+                return False
+            user32 = ctypes.windll.user32
+            return bool(user32.IsWindowVisible(hwnd) and user32.IsIconic(hwnd))
+        except Exception:
+            return False
+    
+    def render(self, services=None):
+        """Renders the dashboard from the latest collected stats.
         
-        self.layout["header"].update(self.make_header())
-        self.layout["cpu_gpu"].update(self.make_cpu_gpu_panel())
-        self.layout["memory"].update(self.make_memory_panel())
-        self.layout["security"].update(self.make_security_panel())
-        self.layout["footer"].update(self.make_footer())
+        If services is given, stats are collected first (synchronous use);
+        the run() loop leaves collection to the background collector.
+        """
+        if services is not None:
+            self.update_stats(services)
+        
+        # Hold the lock only while building panels (no I/O in here)
+        with self._stats_lock:
+            # Header (clock) and footer (uptime) change every frame
+            self.layout["header"].update(self.make_header())
+            self.layout["footer"].update(self.make_footer())
+            
+            # Body panels are rebuilt only when their displayed values change
+            for name, sig_func, make in (
+                ("cpu_gpu", self._cpu_gpu_signature, self.make_cpu_gpu_panel),
+                ("memory", self._memory_signature, self.make_memory_panel),
+                ("security", self._security_signature, self.make_security_panel),
+            ):
+                sig = sig_func()
+                if self._panel_sigs.get(name) != sig:
+                    self.layout[name].update(make())
+                    self._panel_sigs[name] = sig
         
         return self.layout
     
+    def _cpu_gpu_signature(self):
+        """Values shown by make_cpu_gpu_panel, at display precision"""
+        st = self.stats
+        return (round(st.cpu_percent, 1), round(st.cpu_temp),
+                round(st.cpu_freq_ghz, 2), st.cpu_limit,
+                tuple(round(u) for u in st.cpu_cores),
+                st.gpu_nvidia_percent, round(st.gpu_nvidia_temp),
+                st.gpu_nvidia_clock_mhz, round(st.gpu_nvidia_mem_used),
+                st.gpu_nvidia_power_limit)
+    
+    def _memory_signature(self):
+        """Values shown by make_memory_panel, at display precision"""
+        st = self.stats
+        return (round(st.ram_percent, 1), round(st.ram_used),
+                self.stats_tracker.get('total_cleanups', 0),
+                round(st.gpu_nvidia_temp), round(st.cpu_temp),
+                st.auto_mode, round(st.auto_avg_cpu))
+    
+    def _security_signature(self):
+        """Values shown by make_security_panel"""
+        st = self.stats
+        return (st.shield_status, st.security_threats,
+                st.security_processes, st.security_connections,
+                st.security_last_scan, st.privacy_score,
+                st.blocked_domains)
+    
     def make_security_panel(self):
         """Security & Privacy panel showing scanner and telemetry status."""
         try:
@@ -664,20 +1038,20 @@ class Dashboard:
             table.add_column("Value", justify="right")
             
             # Shield Status
-            shield = self.stats.get('shield_status', ('⚪', 'white', 'IDLE'))
+            shield = self.stats.shield_status or ('⚪', 'white', 'IDLE')
             shield_emoji, shield_color, shield_label = shield
             table.add_row("[bold white]SECURITY SHIELD[/bold white]", "")
             table.add_row(f"  Status", f"[{shield_color}]{shield_emoji} {shield_label}[/{shield_color}]")
             
             # Security Scanner Results
-            threats = self.stats.get('security_threats', 0)
+            threats = self.stats.security_threats
             threat_color = 'green' if threats == 0 else 'red'
             table.add_row("  Threats", f"[{threat_color}]{threats} flagged[/{threat_color}]")
-            table.add_row("  Processes", f"{self.stats.get('security_processes', 0)} scanned")
-            table.add_row("  Connections", f"{self.stats.get('security_connections', 0)} monitored")
+            table.add_row("  Processes", f"{self.stats.security_processes} scanned")
+            table.add_row("  Connections", f"{self.stats.security_connections} monitored")
             
             # Last Scan
-            last_scan = self.stats.get('security_last_scan')
+            last_scan = self.stats.security_last_scan
             if last_scan:
                 scan_str = last_scan.strftime('%H:%M:%S')
                 table.add_row("  Last Scan", f"[dim]{scan_str}[/dim]")
@@ -689,20 +1063,14 @@ class Dashboard:
             # Privacy / Telemetry
             table.add_row("[bold white]PRIVACY SHIELD[/bold white]", "")
             
-            privacy_score = self.stats.get('privacy_score', 0)
-            if privacy_score >= 80:
-                p_color = 'green'
-                p_icon = '🟢'
-            elif privacy_score >= 50:
-                p_color = 'yellow'
-                p_icon = '🟡'
-            else:
-                p_color = 'red'
-                p_icon = '🔴'
+            privacy_score = self.stats.privacy_score
+            level = bisect.bisect_right(self._PRIVACY_THRESHOLDS, privacy_score)
+            p_color = self._PRIVACY_COLORS[level]
+            p_icon = self._PRIVACY_ICONS[level]
             
             table.add_row("  Privacy Score", f"[{p_color}]{p_icon} {privacy_score}%[/{p_color}]")
             
-            blocked = self.stats.get('blocked_domains', 0)
+            blocked = self.stats.blocked_domains or 0
             table.add_row("  Domains Blocked", f"[green]{blocked}[/green]")
             table.add_row("  Telemetry", "[green]● BLOCKED[/green]")
             table.add_row("  Defender Data", "[green]● PRIVATE[/green]")
@@ -725,8 +1093,10 @@ class Dashboard:
         """
         self.running = True
         
-        # Start background ping thread
+        # Start background ping, priority scan and stats collector threads
         self._start_ping_thread()
+        self._start_priority_thread()
+        self._start_collector(services)
         
         # Flush any pending output before taking over the screen
         sys.stdout.flush()
@@ -744,25 +1114,27 @@ class Dashboard:
         sys.stderr = io.StringIO()
         
         try:
-            # Rich Live with screen=True for alternate buffer (no flickering)
-            with Live(self.layout, refresh_per_second=2, console=live_console, screen=True) as live:
+            # Rich Live with screen=True for alternate buffer (no flickering).
+            # No auto-refresh thread: the screen is repainted once per pushed frame
+            with Live(self.layout, auto_refresh=False, console=live_console, screen=True) as live:
                 try:
+                    was_hidden = False
                     while self.running:
-                        # Update all stats
-                        self.update_stats(services)
-                        
-                        # Render all panels (each wrapped in try/except)
-                        self.layout["header"].update(self.make_header())
-                        self.layout["cpu_gpu"].update(self.make_cpu_gpu_panel())
-                        self.layout["memory"].update(self.make_memory_panel())
-                        self.layout["security"].update(self.make_security_panel())
-                        self.layout["footer"].update(self.make_footer())
-                        
-                        # Push update to Live renderer
-                        live.update(self.layout)
+                        # Skip rendering while minimized; on restore, wake the
+                        # collector so the first visible frame is fresh
+                        hidden = self._console_hidden()
+                        if hidden:
+                            was_hidden = True
+                        else:
+                            if was_hidden:
+                                was_hidden = False
+                                self._collector_wake.set()
+                            # Render all panels from the collector's latest stats
+                            live.update(self.render(), refresh=True)
                         
-                        # Sleep 3 seconds between data updates
-                        time.sleep(3)
+                        # Sleep between frames (collector runs on its own thread,
+                        # body panels are only rebuilt when its stats changed)
+                        time.sleep(self.FRAME_INTERVAL)
                         
                 except KeyboardInterrupt:
                     self.running = False
@@ -776,6 +1148,9 @@ class Dashboard:
             return
         finally:
             self._ping_running = False
+            self._priority_running = False
+            self._collector_stop.set()
+            self._collector_wake.set()
             # Restore stdout and stderr
             sys.stdout = real_stdout
             sys.stderr = real_stderr
@@ -784,14 +1159,13 @@ class Dashboard:
         """Simple text-mode dashboard fallback if Rich Live fails."""
         try:
             while self.running:
-                self.update_stats(services)
                 os.system('cls' if os.name == 'nt' else 'clear')
                 
-                cpu = self.stats.get('cpu_percent', 0)
-                ram = self.stats.get('ram_percent', 0)
-                gpu_temp = self.stats.get('gpu_temp', 0)
-                mode = self.stats.get('auto_mode', 'NORMAL')
-                ping = self.stats.get('ping_ms', 0)
+                cpu = self.stats.cpu_percent
+                ram = self.stats.ram_percent
+                gpu_temp = self.stats.gpu_nvidia_temp
+                mode = self.stats.auto_mode
+                ping = self.stats.ping_ms
                 
                 print("=" * 50)
                 print(f"  NOVAPULSE 2.2.1 | Mode: {mode}")
@@ -803,7 +1177,7 @@ class Dashboard:
                 print("=" * 50)
                 print("  Press Ctrl+C to exit")
                 
-                time.sleep(3)
+                time.sleep(self._interval)
         except KeyboardInterrupt:
             self.running = False
 
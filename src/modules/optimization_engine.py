@@ -134,6 +134,8 @@ class OptimizationEngine:
                 from modules.cuda_optimizer import get_optimizer as get_cuda
                 cuda = get_cuda()
                 changes = cuda.apply_all_optimizations()
+                # Re-apply if the NVIDIA tools overwrite the tweaks later
+                cuda.start_registry_watch()
                 results['cuda'] = OptimizationResult(
                     module='CUDA Optimizer',
                     success=any(changes.values()),
@@ -0,0 +1,131 @@
+"""
+NovaPulse - Periodic Scheduler
+Runs periodic monitoring tasks on one shared thread
+
+Instead of every monitor owning a thread that wakes on its own schedule,
+tasks are kept in a heap ordered by next fire time. Tasks that fall due
+within COALESCE_SLACK of each other run in the same wakeup, so the CPU is
+woken less often and cores can stay in deep C-states longer.
+"""
+import heapq
+import itertools
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+
+# Tasks due within this many seconds of each other share one wakeup
+COALESCE_SLACK = 0.25
+
+
+class PeriodicScheduler:
+    """
+    Single-thread periodic task scheduler
+
+    A task is a zero-argument callable. If it returns a number, that is
+    used as the delay until its next run (adaptive polling); otherwise the
+    interval given to add() is used.
+    """
+
+    def __init__(self):
+        self._heap: List[Tuple[float, int]] = []   # (next_fire, task_id)
+        self._tasks: Dict[int, list] = {}           # task_id -> [func, interval, name]
+        self._ids = itertools.count()
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def add(self, func: Callable[[], Optional[float]], interval: float,
+            name: str = "task", delay: float = 0.0) -> int:
+        """Register a periodic task; returns an id for remove()"""
+        task_id = next(self._ids)
+        with self._lock:
+            self._tasks[task_id] = [func, interval, name]
+            heapq.heappush(self._heap, (time.monotonic() + delay, task_id))
+            self._ensure_running()
+        self._wakeup.set()
+        return task_id
+
+    def remove(self, task_id: Optional[int]):
+        """Unregister a task (takes effect immediately, even mid-wait)"""
+        with self._lock:
+            self._tasks.pop(task_id, None)
+        self._wakeup.set()
+
+    def set_interval(self, task_id: int, interval: float):
+        """Change the default interval of a registered task"""
+        with self._lock:
+            if task_id in self._tasks:
+                self._tasks[task_id][1] = interval
+
+    def stop(self, timeout: float = 2.0):
+        """Stop the scheduler thread"""
+        self._stop_event.set()
+        self._wakeup.set()
+        if self._thread:
+            self._thread.join(timeout=timeout)
+        self._thread = None
+
+    def _ensure_running(self):
+        # Called with self._lock held
+        if self._thread is None or not self._thread.is_alive():
+            self._stop_event.clear()
+            self._thread = threading.Thread(target=self._run, daemon=True,
+                                            name='NovaPulse-Scheduler')
+            self._thread.start()
+
+    def _pop_due(self) -> Tuple[list, Optional[float]]:
+        """Return (due task ids, seconds until the next task)"""
+        now = time.monotonic()
+        due = []
+        with self._lock:
+            while self._heap:
+                fire_at, task_id = self._heap[0]
+                if task_id not in self._tasks:
+                    heapq.heappop(self._heap)  # Removed task
+                    continue
+                if fire_at > now + COALESCE_SLACK:
+                    return due, fire_at - now
+                heapq.heappop(self._heap)
+                due.append(task_id)
+        return due, None
+
+    def _run(self):
+        while not self._stop_event.is_set():
+            due, timeout = self._pop_due()
+
+            for task_id in due:
+                with self._lock:
+                    entry = self._tasks.get(task_id)
+                if entry is None:
+                    continue
+                func, interval, name = entry
+
+                try:
+                    next_delay = func()
+                except Exception as e:
+                    print(f"[SCHED] Task '{name}' error: {e}")
+                    next_delay = None
+
+                with self._lock:
+                    if task_id in self._tasks:
+                        delay = next_delay if next_delay is not None else self._tasks[task_id][1]
+                        heapq.heappush(self._heap, (time.monotonic() + delay, task_id))
+
+            if not due:
+                self._wakeup.wait(timeout)
+                self._wakeup.clear()
+
+
+# Singleton
+_instance = None
+_instance_lock = threading.Lock()
+
+def get_scheduler() -> PeriodicScheduler:
+    global _instance
+    if _instance is None:
+        with _instance_lock:
+            if _instance is None:
+                _instance = PeriodicScheduler()
+    return _instance
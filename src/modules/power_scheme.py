@@ -0,0 +1,120 @@
+"""
+NovaPulse - Power Scheme API
+Direct powrprof.dll calls for power setting writes (no powercfg.exe process)
+"""
+import ctypes
+import uuid
+from ctypes import wintypes
+from typing import Optional
+
+
+ERROR_SUCCESS = 0
+
+
+class GUID(ctypes.Structure):
+    """Win32 GUID structure"""
+    _fields_ = [
+        ("Data1", ctypes.c_uint32),
+        ("Data2", ctypes.c_uint16),
+        ("Data3", ctypes.c_uint16),
+        ("Data4", ctypes.c_ubyte * 8),
+    ]
+
+    @classmethod
+    def from_string(cls, value: str) -> "GUID":
+        return cls.from_buffer_copy(uuid.UUID(value).bytes_le)
+
+    def __str__(self) -> str:
+        return str(uuid.UUID(bytes_le=bytes(self)))
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, GUID) and bytes(self) == bytes(other)
+
+    def __hash__(self) -> int:
+        return hash(bytes(self))
+
+
+# Processor Power Management subgroup and settings
+SUB_PROCESSOR = GUID.from_string("54533251-82be-4824-96c1-47b60b740d00")
+PROCTHROTTLEMAX = GUID.from_string("bc5038f7-23e0-4960-96da-33abaf5935ec")
+PROCTHROTTLEMIN = GUID.from_string("893dee8e-2bef-41e0-89c6-b55d0929964c")
+
+
+try:
+    _powrprof = ctypes.WinDLL('powrprof')
+    _kernel32 = ctypes.WinDLL('kernel32')
+
+    _PowerGetActiveScheme = _powrprof.PowerGetActiveScheme
+    _PowerGetActiveScheme.argtypes = [wintypes.HKEY, ctypes.POINTER(ctypes.POINTER(GUID))]
+    _PowerGetActiveScheme.restype = wintypes.DWORD
+
+    _PowerSetActiveScheme = _powrprof.PowerSetActiveScheme
+    _PowerSetActiveScheme.argtypes = [wintypes.HKEY, ctypes.POINTER(GUID)]
+    _PowerSetActiveScheme.restype = wintypes.DWORD
+
+    _PowerReadACValueIndex = _powrprof.PowerReadACValueIndex
+    _PowerReadACValueIndex.argtypes = [wintypes.HKEY, ctypes.POINTER(GUID), ctypes.POINTER(GUID),
+                                       ctypes.POINTER(GUID), ctypes.POINTER(wintypes.DWORD)]
+    _PowerReadACValueIndex.restype = wintypes.DWORD
+
+    _PowerWriteACValueIndex = _powrprof.PowerWriteACValueIndex
+    _PowerWriteDCValueIndex = _powrprof.PowerWriteDCValueIndex
+    for _func in (_PowerWriteACValueIndex, _PowerWriteDCValueIndex):
+        _func.argtypes = [wintypes.HKEY, ctypes.POINTER(GUID), ctypes.POINTER(GUID),
+                          ctypes.POINTER(GUID), wintypes.DWORD]
+        _func.restype = wintypes.DWORD
+
+    _LocalFree = _kernel32.LocalFree
+    _LocalFree.argtypes = [ctypes.c_void_p]
+    _LocalFree.restype = ctypes.c_void_p
+except (AttributeError, OSError):
+    _powrprof = None
+
+
+def is_available() -> bool:
+    """True when powrprof.dll could be loaded (Windows only)"""
+    return _powrprof is not None
+
+
+def get_active_scheme() -> Optional[GUID]:
+    """Return the active power scheme GUID, or None on failure"""
+    if _powrprof is None:
+        return None
+
+    scheme_ptr = ctypes.POINTER(GUID)()
+    if _PowerGetActiveScheme(None, ctypes.byref(scheme_ptr)) != ERROR_SUCCESS:
+        return None
+    try:
+        return GUID.from_buffer_copy(scheme_ptr.contents)
+    finally:
+        _LocalFree(scheme_ptr)
+
+
+def read_value_index(scheme: GUID, subgroup: GUID, setting: GUID) -> Optional[int]:
+    """Read a scheme's stored AC value index, or None on failure"""
+    if _powrprof is None:
+        return None
+
+    value = wintypes.DWORD()
+    status = _PowerReadACValueIndex(None, ctypes.byref(scheme), ctypes.byref(subgroup),
+                                    ctypes.byref(setting), ctypes.byref(value))
+    return value.value if status == ERROR_SUCCESS else None
+
+
+def write_value_index(scheme: GUID, subgroup: GUID, setting: GUID,
+                      value: int, ac: bool = True) -> bool:
+    """Write an AC (or DC) value index; call set_active_scheme() to apply it"""
+    if _powrprof is None:
+        return False
+
+    write = _PowerWriteACValueIndex if ac else _PowerWriteDCValueIndex
+    status = write(None, ctypes.byref(scheme), ctypes.byref(subgroup),
+                   ctypes.byref(setting), value)
+    return status == ERROR_SUCCESS
+
+
+def set_active_scheme(scheme: GUID) -> bool:
+    """Activate a scheme (re-activating the current one applies pending writes)"""
+    if _powrprof is None:
+        return False
+    return _PowerSetActiveScheme(None, ctypes.byref(scheme)) == ERROR_SUCCESS
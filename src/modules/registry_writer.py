@@ -0,0 +1,108 @@
+"""
+NovaPulse - Registry Writer
+Shared registry write helpers for the optimizer modules: one-call DWORD
+writes (RegSetKeyValueW), per-batch subkey handle reuse and buffered logging
+"""
+import sys
+import winreg
+import ctypes
+from ctypes import wintypes
+import threading
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Tuple
+
+
+def _bind_reg_set_key_value():
+    """advapi32 RegSetKeyValueW: opens the subkey and writes the value in one call"""
+    try:
+        func = ctypes.WinDLL('advapi32', use_last_error=True).RegSetKeyValueW
+    except (AttributeError, OSError):
+        return None
+    func.argtypes = [wintypes.HKEY, wintypes.LPCWSTR, wintypes.LPCWSTR,
+                     wintypes.DWORD, wintypes.LPCVOID, wintypes.DWORD]
+    func.restype = wintypes.LONG
+    return func
+
+
+_reg_set_key_value = _bind_reg_set_key_value()
+
+
+class RegistryWriter:
+    """
+    Base for optimizers that write HKLM tweaks from apply_all_optimizations
+
+    Provides applied_changes bookkeeping, a log buffer flushed in one
+    console write, and _set_registry_value, which reuses subkey handles
+    inside a _batched_keys() block and uses RegSetKeyValueW outside of one.
+    """
+
+    def __init__(self):
+        self.applied_changes = {}
+        self._lock = threading.Lock()
+        self._log_buf: Optional[List[str]] = None
+        self._key_cache: Optional[Dict[Tuple[int, str], winreg.HKEYType]] = None
+
+    def _log(self, msg: str):
+        # Buffered while apply_all_optimizations runs, printed directly otherwise
+        if self._log_buf is not None:
+            self._log_buf.append(msg)
+        else:
+            print(msg)
+
+    def _flush_log(self):
+        buf, self._log_buf = self._log_buf, None
+        if buf:
+            sys.stdout.write("\n".join(buf) + "\n")
+            sys.stdout.flush()
+
+    def _mark_applied(self, key: str, value):
+        # Optimizations may run on worker threads during apply_all_optimizations
+        with self._lock:
+            self.applied_changes[key] = value
+
+    @contextmanager
+    def _batched_keys(self):
+        """Reuse opened subkey handles across all registry writes of a batch"""
+        self._key_cache = {}
+        try:
+            yield
+        finally:
+            with self._lock:
+                cache, self._key_cache = self._key_cache, None
+            for key in cache.values():
+                winreg.CloseKey(key)
+
+    def _open(self, key_path, hive=winreg.HKEY_LOCAL_MACHINE):
+        with self._lock:
+            key = self._key_cache.get((hive, key_path))
+            if key is None:
+                key = winreg.CreateKeyEx(hive, key_path, 0, winreg.KEY_SET_VALUE)
+                self._key_cache[(hive, key_path)] = key
+            return key
+
+    def _set_registry_value(self, key_path, value_name, value_data,
+                           value_type=winreg.REG_DWORD, hive=winreg.HKEY_LOCAL_MACHINE):
+        if self._key_cache is not None:
+            try:
+                winreg.SetValueEx(self._open(key_path, hive), value_name, 0, value_type, value_data)
+                return True
+            except OSError:
+                return False
+
+        if value_type == winreg.REG_DWORD and _reg_set_key_value is not None:
+            data = ctypes.c_uint32(value_data)
+            status = _reg_set_key_value(
+                hive, key_path, value_name, winreg.REG_DWORD,
+                ctypes.byref(data), ctypes.sizeof(data)
+            )
+            if status == 0:
+                return True
+
+        # Fallback: CreateKeyEx + SetValueEx + CloseKey
+        try:
+            key = winreg.CreateKeyEx(hive, key_path, 0, winreg.KEY_SET_VALUE)
+            winreg.SetValueEx(key, value_name, 0, value_type, value_data)
+            winreg.CloseKey(key)
+            return True
+        except:
+            return False
@@ -6,6 +6,10 @@ import time
 import threading
 import subprocess
 
+# How often the CPU sources are re-tried in priority order (seconds), so a
+# lower-priority source that won after a transient miss doesn't stick
+CPU_REPROBE_INTERVAL = 60.0
+
 class TemperatureService:
     """Thread-safe temperature service with multiple reading methods"""
     
@@ -23,6 +27,10 @@ class TemperatureService:
         # NVIDIA handle
         self._nvidia_handle = None
         self._init_nvidia()
+        
+        # CPU temperature method that last returned a reading
+        self._cpu_method = None
+        self._cpu_reprobe_at = 0.0
     
     def _init_wmi(self):
         """Initialize WMI connections"""
@@ -70,6 +78,65 @@ class TemperatureService:
         with self._lock:
             self._cache[key] = (value, time.time())
     
+    def _get_ohw_temp_sensors(self) -> list:
+        """
+        Temperature sensors from OpenHardwareMonitor / LibreHardwareMonitor
+        One WMI Sensor() query is shared by all getters within cache_ttl
+        Returns list of (name_lower, parent_lower, value)
+        """
+        cached = self._get_cached('ohw_sensors')
+        if cached is not None:
+            return cached
+        
+        sensors = []
+        for sensor in self._wmi_ohw.Sensor():
+            if sensor.SensorType == 'Temperature':
+                parent = sensor.Parent.lower() if hasattr(sensor, 'Parent') else ""
+                sensors.append((sensor.Name.lower(), parent, sensor.Value))
+        
+        self._set_cached('ohw_sensors', sensors)
+        return sensors
+    
+    def _cpu_temp_ohw(self) -> float:
+        """Method 1: OpenHardwareMonitor / LibreHardwareMonitor (most accurate)"""
+        if not self._wmi_ohw:
+            return 0.0
+        for name, parent, value in self._get_ohw_temp_sensors():
+            if 'cpu' in name or 'core' in name or 'package' in name:
+                temp = float(value)
+                if temp > 0:
+                    return temp
+        return 0.0
+    
+    def _cpu_temp_probe(self) -> float:
+        """Method 2: WMI Win32_TemperatureProbe (some systems)"""
+        if not self._wmi_root:
+            return 0.0
+        for probe in self._wmi_root.Win32_TemperatureProbe():
+            if probe.CurrentReading:
+                temp = float(probe.CurrentReading) / 10.0
+                if temp > 0:
+                    return temp
+        return 0.0
+    
+    def _cpu_temp_acpi(self) -> float:
+        """Method 3: ACPI Thermal Zone (MSAcpi_ThermalZoneTemperature)
+        
+        Note: On Intel systems with DPTF, THRM zones often report actual CPU die temp
+        Intel ESIF classes (EsifDeviceInformation) also available but WMI queries are slow
+        """
+        if not self._wmi_thermal:
+            return 0.0
+        # Get max temperature from all zones
+        max_temp = 0
+        for zone in self._wmi_thermal.MSAcpi_ThermalZoneTemperature():
+            zone_temp = (zone.CurrentTemperature / 10.0) - 273.15
+            # Validate: typical CPU temps are 30-100°C
+            if 25 < zone_temp < 110 and zone_temp > max_temp:
+                max_temp = zone_temp
+        # Use directly - DPTF zones typically report die temperature
+        return max_temp
+    
     def get_cpu_temp(self) -> float:
         """Get CPU temperature using multiple methods"""
         cached = self._get_cached('cpu_temp')
@@ -78,49 +145,25 @@ class TemperatureService:
         
         temp = 0.0
         
-        # Method 1: OpenHardwareMonitor / LibreHardwareMonitor (most accurate)
-        if temp == 0 and self._wmi_ohw:
-            try:
-                for sensor in self._wmi_ohw.Sensor():
-                    if sensor.SensorType == 'Temperature':
-                        name = sensor.Name.lower()
-                        if 'cpu' in name or 'core' in name or 'package' in name:
-                            temp = float(sensor.Value)
-                            if temp > 0:
-                                break
-            except:
-                pass
-        
-        # Method 2: WMI Win32_TemperatureProbe (some systems)
-        if temp == 0 and self._wmi_root:
+        # Methods 1-3 in priority order, but the one that last produced a
+        # reading goes first: cache misses then cost one WMI query instead of
+        # re-running the sources this machine doesn't have. Every
+        # CPU_REPROBE_INTERVAL the full priority order runs again.
+        methods = [self._cpu_temp_ohw, self._cpu_temp_probe, self._cpu_temp_acpi]
+        now = time.monotonic()
+        if self._cpu_method in methods and now < self._cpu_reprobe_at:
+            methods.remove(self._cpu_method)
+            methods.insert(0, self._cpu_method)
+        else:
+            self._cpu_reprobe_at = now + CPU_REPROBE_INTERVAL
+        for method in methods:
             try:
-                for probe in self._wmi_root.Win32_TemperatureProbe():
-                    if probe.CurrentReading:
-                        temp = float(probe.CurrentReading) / 10.0
-                        if temp > 0:
-                            break
+                temp = method()
             except:
-                pass
-        
-        # Method 3: ACPI Thermal Zone (MSAcpi_ThermalZoneTemperature)
-        # Note: On Intel systems with DPTF, THRM zones often report actual CPU die temp
-        # Intel ESIF classes (EsifDeviceInformation) also available but WMI queries are slow
-        if temp == 0 and self._wmi_thermal:
-            try:
-                zones = self._wmi_thermal.MSAcpi_ThermalZoneTemperature()
-                if zones:
-                    # Get max temperature from all zones
-                    max_temp = 0
-                    for zone in zones:
-                        zone_temp = (zone.CurrentTemperature / 10.0) - 273.15
-                        # Validate: typical CPU temps are 30-100°C
-                        if 25 < zone_temp < 110 and zone_temp > max_temp:
-                            max_temp = zone_temp
-                    if max_temp > 0:
-                        # Use directly - DPTF zones typically report die temperature
-                        temp = max_temp
-            except:
-                pass
+                temp = 0.0
+            if temp > 0:
+                self._cpu_method = method
+                break
         
         # Method 4: Use NVIDIA GPU as reference (laptops share cooling)
         if temp == 0 or temp < 35:
@@ -163,12 +206,10 @@ class TemperatureService:
         # Fallback: OpenHardwareMonitor
         if temp == 0 and self._wmi_ohw:
             try:
-                for sensor in self._wmi_ohw.Sensor():
-                    if sensor.SensorType == 'Temperature':
-                        name = sensor.Name.lower()
-                        if 'gpu' in name and 'nvidia' in sensor.Parent.lower():
-                            temp = float(sensor.Value)
-                            break
+                for name, parent, value in self._get_ohw_temp_sensors():
+                    if 'gpu' in name and 'nvidia' in parent:
+                        temp = float(value)
+                        break
             except:
                 pass
         
@@ -186,14 +227,11 @@ class TemperatureService:
         # Try OpenHardwareMonitor
         if self._wmi_ohw:
             try:
-                for sensor in self._wmi_ohw.Sensor():
-                    if sensor.SensorType == 'Temperature':
-                        name = sensor.Name.lower()
-                        parent = sensor.Parent.lower() if hasattr(sensor, 'Parent') else ""
-                        if 'intel' in parent or 'iris' in name or 'uhd' in name:
-                            temp = float(sensor.Value)
-                            if temp > 0:
-                                break
+                for name, parent, value in self._get_ohw_temp_sensors():
+                    if 'intel' in parent or 'iris' in name or 'uhd' in name:
+                        temp = float(value)
+                        if temp > 0:
+                            break
             except:
                 pass
         
@@ -211,10 +249,13 @@ class TemperatureService:
 
 # Global singleton
 _instance = None
+_instance_lock = threading.Lock()
 
 def get_service() -> TemperatureService:
-    """Get singleton instance"""
+    """Get singleton instance (one set of WMI connections for all callers)"""
     global _instance
     if _instance is None:
-        _instance = TemperatureService(cache_ttl=2.0)
+        with _instance_lock:
+            if _instance is None:
+                _instance = TemperatureService(cache_ttl=2.0)
     return _instance
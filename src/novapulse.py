@@ -219,6 +219,19 @@ def main():
     # Initialize services
     services = {}
     
+    # === GPU THERMAL MONITOR (opt-in) ===
+    if config.get('gpu_thermal_monitor', {}).get('enabled', False):
+        try:
+            from modules.cuda_optimizer import get_optimizer as get_cuda
+            cuda = get_cuda()
+            if cuda.start_thermal_monitor():
+                services['gpu_thermal'] = cuda
+                print(f"{Fore.GREEN}[OK] GPU Thermal Monitor active (threshold {cuda.thermal_threshold}°C){Style.RESET_ALL}")
+                rlog.log("MODULE", "gpu_thermal_monitor", f"Started (threshold={cuda.thermal_threshold}°C)")
+        except Exception as e:
+            print(f"{Fore.YELLOW}[WARN] GPU Thermal Monitor: {e}{Style.RESET_ALL}")
+            rlog.log_error("gpu_thermal_monitor", str(e))
+    
     # === STANDBY MEMORY CLEANER ===
     if config.get('standby_cleaner', {}).get('enabled', True):
         cleaner_config = config['standby_cleaner']
@@ -430,6 +443,8 @@ def stop_all_services(services):
         services['smart_priority'].stop()
     if 'auto_profiler' in services:
         services['auto_profiler'].stop()
+    if 'gpu_thermal' in services:
+        services['gpu_thermal'].stop_thermal_monitor()
 
     if 'security_scanner' in services:
         services['security_scanner'].stop()